@@ -1,23 +1,36 @@
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from typing import Optional, TypeVar
+
+from fastapi import Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import Settings, get_settings
 from app.core.events import event_bus
+from app.core.principal_cache import Principal, principal_cache
+from app.db.async_session import get_async_db
 from app.db.session import get_db
 from app.models.user import User, UserRole
-from app.services.appointment_service import AppointmentService
+from app.services.appointment_service import AppointmentService, AsyncAppointmentService
 from app.services.auth_service import AuthService
+from app.services.availability_cache import AvailabilityCache, availability_cache
 from app.services.background_task_service import BackgroundTaskService
-from app.services.doctor_service import DoctorService
+from app.services.doctor_service import AsyncDoctorService, DoctorService
 from app.services.event_bus import EventBus
-from app.services.lab_result_service import LabResultService
-from app.services.patient_service import PatientService
+from app.services.lab_result_service import AsyncLabResultService, LabResultService
+from app.services.pagination import InvalidCursorError, KeysetPage, decode_cursor
+from app.services.patient_service import AsyncPatientService, PatientService
 from app.services.user_service import UserService
 
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 def get_settings_dependency() -> Settings:
     return get_settings()
@@ -27,18 +40,36 @@ def get_event_bus() -> EventBus:
     return event_bus
 
 
+def get_availability_cache() -> Optional[AvailabilityCache]:
+    return availability_cache
+
+
 def get_db_session() -> Session:
     yield from get_db()
 
 
+# The session is torn down as soon as the endpoint has produced its response
+# (after serialization) instead of after the response has been sent.
+DbSession = Depends(get_db_session, scope="function")
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_async_db():
+        yield session
+
+
+AsyncDbSession = Depends(get_async_db_session, scope="function")
+
+
 def get_user_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
+    event_bus: EventBus = Depends(get_event_bus),
 ) -> UserService:
-    return UserService(session=session)
+    return UserService(session=session, event_bus=event_bus)
 
 
 def get_appointment_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
     event_bus: EventBus = Depends(get_event_bus),
     settings: Settings = Depends(get_settings_dependency),
 ) -> AppointmentService:
@@ -46,48 +77,102 @@ def get_appointment_service(
 
 
 def get_lab_result_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
     event_bus: EventBus = Depends(get_event_bus),
 ) -> LabResultService:
     return LabResultService(session=session, event_bus=event_bus)
 
 
 def get_background_task_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
 ) -> BackgroundTaskService:
     return BackgroundTaskService(session=session)
 
 
 def get_doctor_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
+    event_bus: EventBus = Depends(get_event_bus),
 ) -> DoctorService:
-    return DoctorService(session=session)
+    return DoctorService(session=session, event_bus=event_bus)
 
 
 def get_patient_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
 ) -> PatientService:
     return PatientService(session=session)
 
 
+def get_async_appointment_service(
+    session: AsyncSession = AsyncDbSession,
+    event_bus: EventBus = Depends(get_event_bus),
+    settings: Settings = Depends(get_settings_dependency),
+) -> AsyncAppointmentService:
+    return AsyncAppointmentService(session=session, event_bus=event_bus, settings=settings)
+
+
+def get_async_lab_result_service(
+    session: AsyncSession = AsyncDbSession,
+    event_bus: EventBus = Depends(get_event_bus),
+) -> AsyncLabResultService:
+    return AsyncLabResultService(session=session, event_bus=event_bus)
+
+
+def get_async_doctor_service(
+    session: AsyncSession = AsyncDbSession,
+    event_bus: EventBus = Depends(get_event_bus),
+) -> AsyncDoctorService:
+    return AsyncDoctorService(session=session, event_bus=event_bus)
+
+
+def get_async_patient_service(
+    session: AsyncSession = AsyncDbSession,
+) -> AsyncPatientService:
+    return AsyncPatientService(session=session)
+
+
 def get_auth_service(
-    session: Session = Depends(get_db_session),
+    session: Session = DbSession,
     settings: Settings = Depends(get_settings_dependency),
 ) -> AuthService:
     return AuthService(session=session, settings=settings)
 
 
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def get_page_params(
+    cursor: Optional[str] = Query(
+        default=None,
+        description=f"Opaque cursor taken from the {NEXT_CURSOR_HEADER} header of the previous page",
+    ),
+    limit: int = Query(default=50, ge=1, le=200, description="Maximum number of items to return"),
+) -> PageParams:
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def page_items(response: Response, page: KeysetPage[T]) -> list[T]:
+    """Expose the page's continuation cursor as a header and return its items."""
+
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{get_settings().api_v1_prefix}/auth/login",
     auto_error=False,
 )
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_db_session),
-    settings: Settings = Depends(get_settings_dependency),
-) -> User:
+def _user_id_from_token(token: Optional[str], settings: Settings) -> int:
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -104,7 +189,7 @@ def get_current_user(
         subject = payload.get("sub")
         if subject is None:
             raise ValueError("Token subject missing")
-        user_id = int(subject)
+        return int(subject)
     except (security.InvalidTokenError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,38 +197,70 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from None
 
-    user = session.get(User, user_id)
-    if not user or not user.is_active:
+
+def _cache_principal(user: Optional[User]) -> Optional[Principal]:
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.set(principal)
+    return principal
+
+
+def _ensure_active(principal: Optional[Principal]) -> Principal:
+    if principal is None or not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive or missing user",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    return principal
 
 
-def require_superadmin(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != UserRole.SUPERADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Superadmin privileges required",
-        )
-    return current_user
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: Session = DbSession,
+    settings: Settings = Depends(get_settings_dependency),
+) -> Principal:
+    user_id = _user_id_from_token(token, settings)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _cache_principal(session.get(User, user_id))
+    return _ensure_active(principal)
 
 
-def require_doctor(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role not in {UserRole.DOCTOR, UserRole.SUPERADMIN}:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Doctor privileges required",
-        )
-    return current_user
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = AsyncDbSession,
+    settings: Settings = Depends(get_settings_dependency),
+) -> Principal:
+    user_id = _user_id_from_token(token, settings)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _cache_principal(await session.get(User, user_id))
+    return _ensure_active(principal)
 
 
-def require_patient(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role not in {UserRole.PATIENT, UserRole.SUPERADMIN}:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Patient privileges required",
-        )
-    return current_user
+def _require_role(principal: Principal, roles: set[UserRole], detail: str) -> Principal:
+    if principal.role not in roles:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return principal
+
+
+def require_superadmin(current_user: Principal = Depends(get_current_user)) -> Principal:
+    return _require_role(current_user, {UserRole.SUPERADMIN}, "Superadmin privileges required")
+
+
+def require_doctor(current_user: Principal = Depends(get_current_user)) -> Principal:
+    return _require_role(current_user, {UserRole.DOCTOR, UserRole.SUPERADMIN}, "Doctor privileges required")
+
+
+def require_patient(current_user: Principal = Depends(get_current_user)) -> Principal:
+    return _require_role(current_user, {UserRole.PATIENT, UserRole.SUPERADMIN}, "Patient privileges required")
+
+
+async def require_doctor_async(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+    return _require_role(current_user, {UserRole.DOCTOR, UserRole.SUPERADMIN}, "Doctor privileges required")
+
+
+async def require_patient_async(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+    return _require_role(current_user, {UserRole.PATIENT, UserRole.SUPERADMIN}, "Patient privileges required")
@@ -1,9 +1,10 @@
-from . import appointments, auth, doctors, lab_results, patients, tasks, users
+from . import appointments, auth, doctors, internal, lab_results, patients, tasks, users
 
 __all__ = [
     "appointments",
     "auth",
     "doctors",
+    "internal",
     "lab_results",
     "patients",
     "tasks",
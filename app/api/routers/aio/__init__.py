@@ -0,0 +1,11 @@
+"""Async handlers for the hot routes, mounted ahead of the sync routers when
+``use_async_stack`` is enabled. Paths and response models match the sync routes."""
+
+from . import appointments, doctors, lab_results, patients
+
+__all__ = [
+    "appointments",
+    "doctors",
+    "lab_results",
+    "patients",
+]
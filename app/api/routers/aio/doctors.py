@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api.dependencies import (
+    PageParams,
+    get_async_appointment_service,
+    get_async_doctor_service,
+    get_page_params,
+    page_items,
+    require_doctor_async,
+)
+from app.core.principal_cache import Principal
+from app.schemas import appointment as appointment_schema
+from app.schemas import doctor as doctor_schema
+from app.services.appointment_service import AsyncAppointmentService
+from app.services.doctor_service import AsyncDoctorService
+
+router = APIRouter(prefix="/doctors", tags=["doctors"])
+
+
+@router.post(
+    "/me/schedules",
+    response_model=doctor_schema.DoctorSchedulePublic,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_schedule(
+    schedule_in: doctor_schema.DoctorScheduleCreate,
+    current_user: Principal = Depends(require_doctor_async),
+    doctor_service: AsyncDoctorService = Depends(get_async_doctor_service),
+) -> doctor_schema.DoctorSchedulePublic:
+    profile = await doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Create your doctor profile before adding availability",
+        )
+
+    try:
+        schedule = await doctor_service.create_schedule(doctor_profile=profile, schedule_in=schedule_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return doctor_schema.DoctorSchedulePublic.model_validate(schedule)
+
+
+@router.get("/me/schedules", response_model=list[doctor_schema.DoctorSchedulePublic])
+async def list_my_schedules(
+    current_user: Principal = Depends(require_doctor_async),
+    doctor_service: AsyncDoctorService = Depends(get_async_doctor_service),
+) -> list[doctor_schema.DoctorSchedulePublic]:
+    profile = await doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        return []
+    schedules = await doctor_service.list_schedules(doctor_profile=profile, active_only=False, upcoming_only=False)
+    return [
+        doctor_schema.DoctorSchedulePublic.model_validate(schedule)
+        for schedule in schedules
+    ]
+
+
+@router.patch(
+    "/me/schedules/{schedule_id}",
+    response_model=doctor_schema.DoctorSchedulePublic,
+)
+async def update_schedule(
+    schedule_id: int,
+    schedule_in: doctor_schema.DoctorScheduleUpdate,
+    current_user: Principal = Depends(require_doctor_async),
+    doctor_service: AsyncDoctorService = Depends(get_async_doctor_service),
+) -> doctor_schema.DoctorSchedulePublic:
+    profile = await doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+    schedule = await doctor_service.get_schedule(schedule_id)
+    if not schedule or schedule.doctor_id != profile.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+
+    try:
+        schedule = await doctor_service.update_schedule(schedule=schedule, schedule_in=schedule_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return doctor_schema.DoctorSchedulePublic.model_validate(schedule)
+
+
+@router.delete("/me/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(
+    schedule_id: int,
+    current_user: Principal = Depends(require_doctor_async),
+    doctor_service: AsyncDoctorService = Depends(get_async_doctor_service),
+) -> None:
+    profile = await doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+    schedule = await doctor_service.get_schedule(schedule_id)
+    if not schedule or schedule.doctor_id != profile.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+    await doctor_service.delete_schedule(schedule)
+
+
+@router.get(
+    "/me/appointments",
+    response_model=list[appointment_schema.AppointmentPublic],
+)
+async def list_my_appointments(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(require_doctor_async),
+    appointment_service: AsyncAppointmentService = Depends(get_async_appointment_service),
+) -> list[appointment_schema.AppointmentPublic]:
+    return page_items(
+        response,
+        await appointment_service.list_for_doctor(current_user.id, cursor=page.cursor, limit=page.limit),
+    )
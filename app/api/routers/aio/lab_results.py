@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.dependencies import PageParams, get_async_lab_result_service, get_page_params, page_items
+from app.schemas import lab_result as lab_schema
+from app.services.lab_result_service import AsyncLabResultService
+
+router = APIRouter(prefix="/lab-results", tags=["lab-results"])
+
+
+@router.post("/", response_model=lab_schema.LabResultPublic, status_code=status.HTTP_201_CREATED)
+async def create_lab_result(
+    lab_in: lab_schema.LabResultCreate,
+    service: AsyncLabResultService = Depends(get_async_lab_result_service),
+) -> lab_schema.LabResultPublic:
+    return await service.create(lab_in)
+
+
+@router.get("/patients/{patient_id}", response_model=list[lab_schema.LabResultPublic])
+async def list_lab_results(
+    patient_id: int,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    service: AsyncLabResultService = Depends(get_async_lab_result_service),
+) -> list[lab_schema.LabResultPublic]:
+    return page_items(
+        response,
+        await service.list_for_patient(patient_id, cursor=page.cursor, limit=page.limit),
+    )
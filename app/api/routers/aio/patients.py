@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.api.dependencies import (
+    PageParams,
+    get_async_appointment_service,
+    get_async_patient_service,
+    get_availability_cache,
+    get_page_params,
+    page_items,
+    require_patient_async,
+)
+from app.core.principal_cache import Principal
+from app.schemas import appointment as appointment_schema
+from app.schemas import doctor as doctor_schema
+from app.services.appointment_service import AsyncAppointmentService
+from app.services.availability_cache import AvailabilityCache
+from app.services.patient_service import AsyncPatientService
+
+router = APIRouter(prefix="/patients", tags=["patients"])
+
+
+@router.get("/doctors", response_model=list[doctor_schema.DoctorAvailability])
+async def list_available_doctors(
+    current_user: Principal = Depends(require_patient_async),
+    patient_service: AsyncPatientService = Depends(get_async_patient_service),
+    availability_cache: Optional[AvailabilityCache] = Depends(get_availability_cache),
+    specialization: Optional[str] = Query(default=None, description="Filter by specialization"),
+    earliest: Optional[datetime] = Query(default=None, description="Earliest schedule start"),
+    latest: Optional[datetime] = Query(default=None, description="Latest schedule end"),
+) -> list[doctor_schema.DoctorAvailability]:
+    async def load(window_start: datetime) -> list[doctor_schema.DoctorAvailability]:
+        availability = await patient_service.list_doctor_availability(
+            specialization=specialization,
+            earliest=window_start,
+            latest=latest,
+        )
+        return [
+            doctor_schema.DoctorAvailability(
+                doctor=doctor_schema.DoctorProfilePublic.model_validate(profile),
+                schedules=[
+                    doctor_schema.DoctorSchedulePublic.model_validate(schedule)
+                    for schedule in schedules
+                ],
+                occurrences=[
+                    doctor_schema.AvailabilityOccurrence.model_validate(occurrence)
+                    for occurrence in occurrences
+                ],
+            )
+            for profile, schedules, occurrences in availability
+        ]
+
+    if availability_cache is None:
+        return await load(earliest or datetime.utcnow())
+    return await availability_cache.get_or_load_async(
+        specialization=specialization, earliest=earliest, latest=latest, load=load
+    )
+
+
+@router.get("/doctors/slots", response_model=list[doctor_schema.DoctorAvailableSlots])
+async def list_available_slots(
+    current_user: Principal = Depends(require_patient_async),
+    patient_service: AsyncPatientService = Depends(get_async_patient_service),
+    specialization: Optional[str] = Query(default=None, description="Filter by specialization"),
+    earliest: Optional[datetime] = Query(default=None, description="Earliest slot start"),
+    latest: Optional[datetime] = Query(default=None, description="Latest slot end"),
+    slot_minutes: int = Query(default=30, ge=5, le=480, description="Slot length in minutes"),
+    per_doctor: int = Query(default=20, ge=1, le=100, description="Maximum slots per doctor"),
+) -> list[doctor_schema.DoctorAvailableSlots]:
+    free_slots = await patient_service.list_free_slots(
+        specialization=specialization,
+        earliest=earliest or datetime.utcnow(),
+        latest=latest,
+        slot_length=timedelta(minutes=slot_minutes),
+        per_doctor=per_doctor,
+    )
+    return [
+        doctor_schema.DoctorAvailableSlots(
+            doctor=doctor_schema.DoctorProfilePublic.model_validate(profile),
+            slots=[doctor_schema.AvailableSlot.model_validate(slot) for slot in slots],
+        )
+        for profile, slots in free_slots
+    ]
+
+
+@router.get("/doctors/earliest", response_model=list[doctor_schema.EarliestAvailableOption])
+async def find_earliest_available(
+    current_user: Principal = Depends(require_patient_async),
+    patient_service: AsyncPatientService = Depends(get_async_patient_service),
+    specialization: Optional[str] = Query(default=None, description="Filter by specialization"),
+    earliest: Optional[datetime] = Query(default=None, description="Earliest availability"),
+    latest: Optional[datetime] = Query(default=None, description="Latest window start"),
+    limit: int = Query(default=10, ge=1, le=50, description="Number of options to return"),
+    per_doctor: int = Query(default=1, ge=1, le=10, description="Maximum options per doctor"),
+) -> list[doctor_schema.EarliestAvailableOption]:
+    options = await patient_service.find_earliest_available(
+        specialization=specialization,
+        earliest=earliest,
+        latest=latest,
+        limit=limit,
+        per_doctor=per_doctor,
+    )
+    return [
+        doctor_schema.EarliestAvailableOption(
+            doctor=doctor_schema.DoctorProfilePublic.model_validate(profile),
+            available_from=option.available_from,
+            start_time=option.start_time,
+            end_time=option.end_time,
+            remaining_capacity=option.remaining_capacity,
+            schedule_id=option.schedule_id,
+            rule_id=option.rule_id,
+        )
+        for profile, option in options
+    ]
+
+
+@router.get(
+    "/doctors/{doctor_user_id}/schedules",
+    response_model=list[doctor_schema.DoctorSchedulePublic],
+)
+async def list_doctor_schedules(
+    doctor_user_id: int,
+    current_user: Principal = Depends(require_patient_async),
+    patient_service: AsyncPatientService = Depends(get_async_patient_service),
+) -> list[doctor_schema.DoctorSchedulePublic]:
+    profile = await patient_service.get_doctor_profile_by_user_id(doctor_user_id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found")
+    schedules = await patient_service.list_active_schedules(
+        doctor_profile_id=profile.id,
+        earliest=datetime.utcnow(),
+    )
+    return [
+        doctor_schema.DoctorSchedulePublic.model_validate(schedule)
+        for schedule in schedules
+    ]
+
+
+@router.get(
+    "/doctors/{doctor_user_id}/occurrences",
+    response_model=list[doctor_schema.AvailabilityOccurrence],
+)
+async def list_doctor_occurrences(
+    doctor_user_id: int,
+    current_user: Principal = Depends(require_patient_async),
+    patient_service: AsyncPatientService = Depends(get_async_patient_service),
+    earliest: Optional[datetime] = Query(default=None, description="Earliest occurrence start"),
+    latest: Optional[datetime] = Query(default=None, description="Latest occurrence start"),
+) -> list[doctor_schema.AvailabilityOccurrence]:
+    profile = await patient_service.get_doctor_profile_by_user_id(doctor_user_id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found")
+    occurrences = await patient_service.list_rule_occurrences(
+        doctor_profile_id=profile.id,
+        earliest=earliest or datetime.utcnow(),
+        latest=latest,
+    )
+    return [
+        doctor_schema.AvailabilityOccurrence.model_validate(occurrence)
+        for occurrence in occurrences
+    ]
+
+
+@router.get(
+    "/me/appointments",
+    response_model=list[appointment_schema.AppointmentPublic],
+)
+async def list_my_appointments(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(require_patient_async),
+    appointment_service: AsyncAppointmentService = Depends(get_async_appointment_service),
+) -> list[appointment_schema.AppointmentPublic]:
+    return page_items(
+        response,
+        await appointment_service.list_for_patient(current_user.id, cursor=page.cursor, limit=page.limit),
+    )
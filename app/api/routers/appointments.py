@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-
-from app.api.dependencies import get_appointment_service, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api.dependencies import (
+    PageParams,
+    get_appointment_service,
+    get_current_user,
+    get_page_params,
+    page_items,
+)
+from app.core.principal_cache import Principal
 from app.schemas import appointment as appointment_schema
 from app.services.appointment_service import AppointmentService
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
@@ -14,7 +21,7 @@ router = APIRouter(prefix="/appointments", tags=["appointments"])
 def create_appointment(
     appointment_in: appointment_schema.AppointmentCreate,
     service: AppointmentService = Depends(get_appointment_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> appointment_schema.AppointmentPublic:
     if current_user.role == UserRole.PATIENT:
         patient_id = current_user.id
@@ -36,6 +43,7 @@ def create_appointment(
             patient_id=patient_id,
             doctor_id=appointment_in.doctor_id,
             schedule_id=appointment_in.schedule_id,
+            rule_id=appointment_in.rule_id,
             scheduled_time=appointment_in.scheduled_time,
             reason=appointment_in.reason,
         )
@@ -51,7 +59,7 @@ def create_appointment(
 def get_appointment(
     appointment_id: int,
     service: AppointmentService = Depends(get_appointment_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> appointment_schema.AppointmentPublic:
     appointment = service.get(appointment_id)
     if not appointment:
@@ -70,22 +78,29 @@ def get_appointment(
 @router.get("/patients/{patient_id}", response_model=list[appointment_schema.AppointmentPublic])
 def list_patient_appointments(
     patient_id: int,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     service: AppointmentService = Depends(get_appointment_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> list[appointment_schema.AppointmentPublic]:
     if current_user.role != UserRole.SUPERADMIN and current_user.id != patient_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    return service.list_for_patient(patient_id)
+    return page_items(
+        response,
+        service.list_for_patient(patient_id, cursor=page.cursor, limit=page.limit),
+    )
 
 
 @router.get("/doctors/{doctor_id}", response_model=list[appointment_schema.AppointmentPublic])
 def list_doctor_appointments(
     doctor_id: int,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     service: AppointmentService = Depends(get_appointment_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> list[appointment_schema.AppointmentPublic]:
     if current_user.role not in {UserRole.SUPERADMIN, UserRole.DOCTOR}:
         raise HTTPException(
@@ -97,7 +112,10 @@ def list_doctor_appointments(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    return service.list_for_doctor(doctor_id)
+    return page_items(
+        response,
+        service.list_for_doctor(doctor_id, cursor=page.cursor, limit=page.limit),
+    )
 
 
 @router.patch("/{appointment_id}", response_model=appointment_schema.AppointmentPublic)
@@ -105,7 +123,7 @@ def update_appointment(
     appointment_id: int,
     appointment_in: appointment_schema.AppointmentUpdate,
     service: AppointmentService = Depends(get_appointment_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> appointment_schema.AppointmentPublic:
     appointment = service.get(appointment_id)
     if not appointment:
@@ -129,7 +147,13 @@ def update_appointment(
         )
 
     if appointment_in.status is not None:
-        appointment = service.update_status(appointment, appointment_in.status)
+        try:
+            appointment = service.update_status(appointment, appointment_in.status)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
 
     if (
         appointment_in.notes is not None
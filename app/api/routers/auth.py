@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.dependencies import get_auth_service
+from app.core.security import PasswordHashingBusyError
 from app.schemas import auth as auth_schema
 from app.services.auth_service import AuthService
 
@@ -12,11 +13,18 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=auth_schema.Token)
-def login(
+async def login(
     credentials: auth_schema.LoginRequest,
     auth_service: AuthService = Depends(get_auth_service),
 ) -> auth_schema.Token:
-    user = auth_service.authenticate(credentials.email, credentials.password)
+    try:
+        user = await auth_service.authenticate_async(credentials.email, credentials.password)
+    except PasswordHashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
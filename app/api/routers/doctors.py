@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from app.api.dependencies import (
+    PageParams,
     get_appointment_service,
     get_doctor_service,
+    get_page_params,
+    page_items,
     require_doctor,
 )
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas import appointment as appointment_schema
 from app.schemas import doctor as doctor_schema
 from app.services.appointment_service import AppointmentService
@@ -18,7 +21,7 @@ router = APIRouter(prefix="/doctors", tags=["doctors"])
 
 @router.get("/me/profile", response_model=doctor_schema.DoctorProfilePublic)
 def get_my_profile(
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> doctor_schema.DoctorProfilePublic:
     profile = doctor_service.get_profile_by_user_id(current_user.id)
@@ -30,7 +33,7 @@ def get_my_profile(
 @router.put("/me/profile", response_model=doctor_schema.DoctorProfilePublic)
 def upsert_my_profile(
     profile_in: doctor_schema.DoctorProfileUpdate,
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> doctor_schema.DoctorProfilePublic:
     existing = doctor_service.get_profile_by_user_id(current_user.id)
@@ -63,7 +66,7 @@ def upsert_my_profile(
 )
 def create_schedule(
     schedule_in: doctor_schema.DoctorScheduleCreate,
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> doctor_schema.DoctorSchedulePublic:
     profile = doctor_service.get_profile_by_user_id(current_user.id)
@@ -81,9 +84,44 @@ def create_schedule(
     return doctor_schema.DoctorSchedulePublic.model_validate(schedule)
 
 
+@router.post("/me/schedules/bulk", response_model=doctor_schema.DoctorScheduleBulkResult)
+def create_schedules_bulk(
+    bulk_in: doctor_schema.DoctorScheduleBulkCreate,
+    current_user: Principal = Depends(require_doctor),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+) -> doctor_schema.DoctorScheduleBulkResult:
+    profile = doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Create your doctor profile before adding availability",
+        )
+
+    try:
+        outcomes = doctor_service.create_schedules_bulk(doctor_profile=profile, items=bulk_in.items)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    results = [
+        doctor_schema.DoctorScheduleBulkItemResult(
+            index=index,
+            status="created" if schedule is not None else "rejected",
+            schedule=doctor_schema.DoctorSchedulePublic.model_validate(schedule) if schedule is not None else None,
+            error=error,
+        )
+        for index, (schedule, error) in enumerate(outcomes)
+    ]
+    created = sum(1 for result in results if result.status == "created")
+    return doctor_schema.DoctorScheduleBulkResult(
+        created=created,
+        rejected=len(results) - created,
+        results=results,
+    )
+
+
 @router.get("/me/schedules", response_model=list[doctor_schema.DoctorSchedulePublic])
 def list_my_schedules(
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> list[doctor_schema.DoctorSchedulePublic]:
     profile = doctor_service.get_profile_by_user_id(current_user.id)
@@ -103,7 +141,7 @@ def list_my_schedules(
 def update_schedule(
     schedule_id: int,
     schedule_in: doctor_schema.DoctorScheduleUpdate,
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> doctor_schema.DoctorSchedulePublic:
     profile = doctor_service.get_profile_by_user_id(current_user.id)
@@ -124,7 +162,7 @@ def update_schedule(
 @router.delete("/me/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_schedule(
     schedule_id: int,
-    current_user: User = Depends(require_doctor),
+    current_user: Principal = Depends(require_doctor),
     doctor_service: DoctorService = Depends(get_doctor_service),
 ) -> None:
     profile = doctor_service.get_profile_by_user_id(current_user.id)
@@ -136,12 +174,87 @@ def delete_schedule(
     doctor_service.delete_schedule(schedule)
 
 
+@router.post(
+    "/me/availability-rules",
+    response_model=doctor_schema.DoctorAvailabilityRulePublic,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_availability_rule(
+    rule_in: doctor_schema.DoctorAvailabilityRuleCreate,
+    current_user: Principal = Depends(require_doctor),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+) -> doctor_schema.DoctorAvailabilityRulePublic:
+    profile = doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Create your doctor profile before adding availability",
+        )
+    rule = doctor_service.create_rule(doctor_profile=profile, rule_in=rule_in)
+    return doctor_schema.DoctorAvailabilityRulePublic.model_validate(rule)
+
+
+@router.get("/me/availability-rules", response_model=list[doctor_schema.DoctorAvailabilityRulePublic])
+def list_my_availability_rules(
+    current_user: Principal = Depends(require_doctor),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+) -> list[doctor_schema.DoctorAvailabilityRulePublic]:
+    profile = doctor_service.get_profile_by_user_id(current_user.id)
+    if not profile:
+        return []
+    return [
+        doctor_schema.DoctorAvailabilityRulePublic.model_validate(rule)
+        for rule in doctor_service.list_rules(doctor_profile=profile)
+    ]
+
+
+@router.patch(
+    "/me/availability-rules/{rule_id}",
+    response_model=doctor_schema.DoctorAvailabilityRulePublic,
+)
+def update_availability_rule(
+    rule_id: int,
+    rule_in: doctor_schema.DoctorAvailabilityRuleUpdate,
+    current_user: Principal = Depends(require_doctor),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+) -> doctor_schema.DoctorAvailabilityRulePublic:
+    profile = doctor_service.get_profile_by_user_id(current_user.id)
+    rule = doctor_service.get_rule(rule_id)
+    if not profile or not rule or rule.doctor_id != profile.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability rule not found")
+
+    try:
+        rule = doctor_service.update_rule(rule=rule, rule_in=rule_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return doctor_schema.DoctorAvailabilityRulePublic.model_validate(rule)
+
+
+@router.delete("/me/availability-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_availability_rule(
+    rule_id: int,
+    current_user: Principal = Depends(require_doctor),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+) -> None:
+    profile = doctor_service.get_profile_by_user_id(current_user.id)
+    rule = doctor_service.get_rule(rule_id)
+    if not profile or not rule or rule.doctor_id != profile.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability rule not found")
+    doctor_service.delete_rule(rule)
+
+
 @router.get(
     "/me/appointments",
     response_model=list[appointment_schema.AppointmentPublic],
 )
 def list_my_appointments(
-    current_user: User = Depends(require_doctor),
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(require_doctor),
     appointment_service: AppointmentService = Depends(get_appointment_service),
 ) -> list[appointment_schema.AppointmentPublic]:
-    return appointment_service.list_for_doctor(current_user.id)
+    return page_items(
+        response,
+        appointment_service.list_for_doctor(current_user.id, cursor=page.cursor, limit=page.limit),
+    )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.api.dependencies import get_settings_dependency, require_superadmin
+from app.core.config import Settings
+from app.core.principal_cache import Principal
+from app.db.pool import pool_status
+from app.db.session import engine, pool_metrics, replica_set, session_metrics
+from app.schemas import internal as internal_schema
+from app.services.availability_cache import availability_cache
+from app.tasks.executors import task_executor
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/db/pool", response_model=internal_schema.DatabasePoolStatus)
+def get_database_pool_status(
+    _: Principal = Depends(require_superadmin),
+    settings: Settings = Depends(get_settings_dependency),
+) -> internal_schema.DatabasePoolStatus:
+    return internal_schema.DatabasePoolStatus(
+        profile=settings.db_pool_profile,
+        pool=pool_status(engine),
+        pool_events=pool_metrics.snapshot(),
+        request_sessions=session_metrics.snapshot(),
+        replicas=replica_set.status(),
+    )
+
+
+@router.get("/tasks/executor", response_model=internal_schema.TaskExecutorStatus)
+def get_task_executor_status(
+    _: Principal = Depends(require_superadmin),
+) -> internal_schema.TaskExecutorStatus:
+    return internal_schema.TaskExecutorStatus(**task_executor.stats())
+
+
+@router.get("/outbox", response_model=internal_schema.OutboxRelayStatus)
+def get_outbox_status(
+    request: Request,
+    _: Principal = Depends(require_superadmin),
+) -> internal_schema.OutboxRelayStatus:
+    return internal_schema.OutboxRelayStatus(**request.app.state.outbox_relay.stats())
+
+
+@router.get("/cache/availability", response_model=internal_schema.AvailabilityCacheStatus)
+def get_availability_cache_status(
+    _: Principal = Depends(require_superadmin),
+) -> internal_schema.AvailabilityCacheStatus:
+    if availability_cache is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability cache is disabled")
+    return internal_schema.AvailabilityCacheStatus(**availability_cache.stats())
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
-from app.api.dependencies import get_lab_result_service
+from app.api.dependencies import PageParams, get_lab_result_service, get_page_params, page_items
 from app.schemas import lab_result as lab_schema
 from app.services.lab_result_service import LabResultService
 
@@ -20,6 +20,11 @@ def create_lab_result(
 @router.get("/patients/{patient_id}", response_model=list[lab_schema.LabResultPublic])
 def list_lab_results(
     patient_id: int,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     service: LabResultService = Depends(get_lab_result_service),
 ) -> list[lab_schema.LabResultPublic]:
-    return service.list_for_patient(patient_id)
+    return page_items(
+        response,
+        service.list_for_patient(patient_id, cursor=page.cursor, limit=page.limit),
+    )
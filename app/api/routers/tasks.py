@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.api.dependencies import get_background_task_service
+from app.api.dependencies import (
+    PageParams,
+    get_background_task_service,
+    get_page_params,
+    page_items,
+)
 from app.schemas import background_task as task_schema
 from app.services.background_task_service import BackgroundTaskService
 
@@ -26,6 +31,11 @@ def get_task(
 )
 def list_tasks_for_appointment(
     appointment_id: int,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     service: BackgroundTaskService = Depends(get_background_task_service),
 ) -> list[task_schema.BackgroundTaskPublic]:
-    return service.list_for_appointment(appointment_id)
+    return page_items(
+        response,
+        service.list_for_appointment(appointment_id, cursor=page.cursor, limit=page.limit),
+    )
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.dependencies import get_current_user, get_user_service, require_superadmin
-from app.models.user import User, UserRole
+from app.core.principal_cache import Principal
+from app.core.security import PasswordHashingBusyError
+from app.models.user import UserRole
 from app.schemas import user as user_schema
 from app.services.user_service import UserService
 
@@ -15,15 +19,22 @@ router = APIRouter(prefix="/users", tags=["users"])
     response_model=user_schema.UserPublic,
     status_code=status.HTTP_201_CREATED,
 )
-def create_user(
+async def create_user(
     user_in: user_schema.UserCreate,
     service: UserService = Depends(get_user_service),
-    _: User = Depends(require_superadmin),
+    _: Principal = Depends(require_superadmin),
 ) -> user_schema.UserPublic:
-    existing = service.get_by_email(user_in.email)
+    existing = await asyncio.to_thread(service.get_by_email, user_in.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = service.create_user(user_in)
+    try:
+        user = await service.create_user_async(user_in)
+    except PasswordHashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     return user  # FastAPI handles to schema
 
 
@@ -31,7 +42,7 @@ def create_user(
 def get_user(
     user_id: int,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> user_schema.UserPublic:
     user = service.get(user_id)
     if not user:
@@ -45,13 +56,13 @@ def get_user(
 
 
 @router.patch("/{user_id}", response_model=user_schema.UserPublic)
-def update_user(
+async def update_user(
     user_id: int,
     user_in: user_schema.UserUpdate,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> user_schema.UserPublic:
-    user = service.get(user_id)
+    user = await asyncio.to_thread(service.get, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     if current_user.role != UserRole.SUPERADMIN and current_user.id != user_id:
@@ -59,5 +70,12 @@ def update_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    updated = service.update(user, user_in)
+    try:
+        updated = await service.update_async(user, user_in)
+    except PasswordHashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     return updated
@@ -1,4 +1,12 @@
-from app.services.event_bus import EventBus
+from app.core.config import get_settings
+from app.services.event_bus import EventBus, OverflowPolicy
 
+_settings = get_settings()
 
-event_bus = EventBus()
+event_bus = EventBus(
+    async_dispatch=_settings.event_bus_async_dispatch,
+    max_queue_size=_settings.event_bus_queue_size,
+    worker_count=_settings.event_bus_workers,
+    batch_size=_settings.event_bus_batch_size,
+    overflow_policy=OverflowPolicy(_settings.event_bus_overflow_policy),
+)
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.config import get_settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +26,85 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing queue is full and the caller should retry later."""
+
+
+class PasswordHasher:
+    """Run bcrypt in a dedicated process pool with bounded admission.
+
+    Hashing no longer occupies the shared request threadpool under the GIL, and at
+    most ``max_pending`` jobs may be queued or running; further calls fail fast with
+    :class:`PasswordHashingBusyError`. Async handlers should use ``hash_async`` and
+    ``verify_async``, which await the pool's future instead of parking a thread on
+    it. With ``max_workers=0`` hashing runs inline (in a worker thread for the
+    async variants).
+    """
+
+    def __init__(self, *, max_workers: Optional[int] = None, max_pending: int = 64) -> None:
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, func: Callable[..., T], *args: Any) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusyError("Too many password hashing requests in flight")
+        try:
+            future: Future[T] = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.max_workers <= 0:
+            return func(*args)
+        return self._submit(func, *args).result()
+
+    async def _run_async(self, func: Callable[..., T], *args: Any) -> T:
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(verify_password, plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(hash_password, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run_async(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_settings = get_settings()
+
+password_hasher = PasswordHasher(
+    max_workers=_settings.password_hash_workers,
+    max_pending=_settings.password_hash_max_pending,
+)
+
+
 class InvalidTokenError(Exception):
     """Custom exception raised when an access token cannot be decoded or validated."""
 
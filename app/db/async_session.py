@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import Settings, get_settings
+from app.db.pool import engine_options
+
+settings = get_settings()
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(settings: Settings) -> str:
+    """Return the async URL, deriving it from ``database_url`` when not configured."""
+
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver known for {url.get_backend_name()!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def build_async_engine(settings: Settings) -> AsyncEngine:
+    return create_async_engine(
+        async_database_url(settings),
+        **engine_options(settings, settings.db_pool_profile),
+    )
+
+
+async_engine: Optional[AsyncEngine] = build_async_engine(settings) if settings.use_async_stack else None
+
+# Objects stay loaded after commit so handlers can serialize them without
+# triggering IO outside the session's greenlet context.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async SQLAlchemy session per request."""
+
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -28,7 +28,7 @@ def _create_default_superadmin() -> None:
             email=settings.superadmin_email,
             full_name=settings.superadmin_full_name,
             role=UserRole.SUPERADMIN,
-            hashed_password=security.hash_password(settings.superadmin_password),
+            hashed_password=security.password_hasher.hash(settings.superadmin_password),
             is_active=True,
         )
         session.add(superadmin)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import Settings
+
+
+class PoolMetrics:
+    """Counters fed by connection pool events."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "overflow_checkouts": 0,
+            "invalidations": 0,
+            "soft_invalidations": 0,
+            "timeouts": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def increment(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self._stats["total_wait_seconds"] += seconds
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], seconds)
+            if timed_out:
+                self._stats["timeouts"] += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that reports how long callers waited for a connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=timed_out)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_options(settings: Settings, profile: str) -> Dict[str, Any]:
+    """Return ``create_engine`` pool arguments for the ``api`` or ``worker`` profile."""
+
+    if profile == "worker":
+        return {
+            "pool_size": settings.worker_db_pool_size,
+            "max_overflow": settings.worker_db_max_overflow,
+            "pool_timeout": settings.worker_db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_use_lifo": settings.db_pool_use_lifo,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+        }
+    if profile != "api":
+        raise ValueError(f"Unknown database pool profile: {profile!r}")
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """Attach ``metrics`` to the engine's pool events."""
+
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        metrics.increment("checkouts")
+        current = engine.pool
+        if isinstance(current, QueuePool) and current.overflow() > 0:
+            metrics.increment("overflow_checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        metrics.increment("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        metrics.increment("soft_invalidations")
+
+
+def pool_status(engine: Engine) -> Dict[str, int]:
+    """Return live gauges for the engine's pool."""
+
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_USE_REPLICA = "use_replica"
+_REPLICA_ENGINE = "replica_engine"
+_WROTE = "wrote_to_primary"
+
+
+class ReplicaSet:
+    """Round-robin selection over read replicas with periodic health checks.
+
+    A replica is probed with ``SELECT 1`` at most once per ``health_check_interval``
+    seconds; unhealthy replicas are skipped until a later probe succeeds.
+    """
+
+    def __init__(self, engines: Sequence[Engine], *, health_check_interval: float = 5.0) -> None:
+        self.engines = list(engines)
+        self.health_check_interval = health_check_interval
+        self._cursor = itertools.cycle(range(len(self.engines))) if self.engines else None
+        self._health: Dict[int, tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def _probe(self, engine: Engine) -> bool:
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            logger.warning("Read replica %s failed its health check", engine.url.render_as_string())
+            return False
+
+    def is_healthy(self, index: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            checked = self._health.get(index)
+        if checked is not None and now - checked[0] < self.health_check_interval:
+            return checked[1]
+        healthy = self._probe(self.engines[index])
+        with self._lock:
+            self._health[index] = (now, healthy)
+        return healthy
+
+    def choose(self) -> Optional[Engine]:
+        """Return the next healthy replica, or ``None`` when none is available."""
+
+        if self._cursor is None:
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cursor)
+            if self.is_healthy(index):
+                return self.engines[index]
+        return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            health = dict(self._health)
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": health.get(index, (0.0, None))[1],
+            }
+            for index, engine in enumerate(self.engines)
+        ]
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside :func:`replica_reads` to a read replica.
+
+    Flushes, and every statement issued outside a ``replica_reads`` block, use the
+    primary bind. A session sticks to the first replica it picked so the reads of
+    one request see a single consistent snapshot source. Once a session has
+    written, its later reads stay on the primary so they see their own writes.
+    """
+
+    def __init__(self, *args: Any, replicas: Optional[ReplicaSet] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[_WROTE] = True
+        elif self.replicas is not None and self.info.get(_USE_REPLICA) and not self.info.get(_WROTE):
+            replica = self.info.get(_REPLICA_ENGINE)
+            if replica is None:
+                replica = self.replicas.choose()
+                if replica is not None:
+                    self.info[_REPLICA_ENGINE] = replica
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@contextmanager
+def replica_reads(session: Session) -> Iterator[Session]:
+    """Route the queries issued inside the block to a read replica, if configured."""
+
+    previous = session.info.get(_USE_REPLICA, False)
+    session.info[_USE_REPLICA] = True
+    try:
+        yield session
+    finally:
+        session.info[_USE_REPLICA] = previous
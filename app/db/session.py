@@ -1,21 +1,141 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
 from collections.abc import Generator
+from typing import Any, Dict, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 
 from app.core.config import get_settings
+from app.db.pool import InstrumentedQueuePool, PoolMetrics, engine_options, instrument_engine
+from app.db.routing import ReplicaSet, RoutingSession
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, class_=Session)
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    future=True,
+    **engine_options(settings, settings.db_pool_profile),
+)
+pool_metrics = PoolMetrics()
+instrument_engine(engine, pool_metrics)
+
+replica_set = ReplicaSet(
+    [
+        create_engine(
+            replica_url,
+            poolclass=InstrumentedQueuePool,
+            future=True,
+            **engine_options(settings, settings.db_pool_profile),
+        )
+        for replica_url in settings.database_replica_urls
+    ],
+    health_check_interval=settings.replica_health_check_interval_seconds,
+)
+
+# Committed objects keep their loaded state: primary keys and column defaults are
+# populated during the flush (via RETURNING where the dialect supports it), so
+# services can return them without a refresh SELECT.
+SessionLocal = sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+    class_=RoutingSession,
+    replicas=replica_set,
+)
+
+_BEGUN_AT = "connection_begun_at"
+_FIRST_CHECKOUT_AT = "first_checkout_at"
+_HOLD_SECONDS = "connection_hold_seconds"
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _record_checkout(session: Session, transaction: SessionTransaction, connection: Any) -> None:
+    now = time.perf_counter()
+    session.info.setdefault(_FIRST_CHECKOUT_AT, now)
+    session.info.setdefault(_BEGUN_AT, now)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _record_release(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is not None:
+        return
+    begun_at = session.info.pop(_BEGUN_AT, None)
+    if begun_at is not None:
+        held = time.perf_counter() - begun_at
+        session.info[_HOLD_SECONDS] = session.info.get(_HOLD_SECONDS, 0.0) + held
+
+
+class SessionMetrics:
+    """Aggregate connection checkout statistics for request sessions."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "requests_without_checkout": 0,
+            "total_time_to_checkout_seconds": 0.0,
+            "max_time_to_checkout_seconds": 0.0,
+            "total_hold_seconds": 0.0,
+            "max_hold_seconds": 0.0,
+        }
+
+    def record(self, *, time_to_checkout: Optional[float], hold_seconds: float) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            if time_to_checkout is None:
+                self._stats["requests_without_checkout"] += 1
+                return
+            self._stats["total_time_to_checkout_seconds"] += time_to_checkout
+            self._stats["max_time_to_checkout_seconds"] = max(
+                self._stats["max_time_to_checkout_seconds"], time_to_checkout
+            )
+            self._stats["total_hold_seconds"] += hold_seconds
+            self._stats["max_hold_seconds"] = max(self._stats["max_hold_seconds"], hold_seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+
+session_metrics = SessionMetrics()
+
+
+def _record_request_session(
+    session: Session, started_at: float, metrics: SessionMetrics = session_metrics
+) -> None:
+    """Record the time until the session's first checkout and its total connection hold time."""
+
+    first_checkout_at = session.info.get(_FIRST_CHECKOUT_AT)
+    time_to_checkout = None if first_checkout_at is None else first_checkout_at - started_at
+    hold_seconds = session.info.get(_HOLD_SECONDS, 0.0)
+    metrics.record(time_to_checkout=time_to_checkout, hold_seconds=hold_seconds)
+    logger.debug(
+        "Request session released (time to checkout: %s, connection held: %.6fs)",
+        "n/a" if time_to_checkout is None else f"{time_to_checkout:.6f}s",
+        hold_seconds,
+    )
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Yield a new SQLAlchemy session per request."""
+    """Yield a SQLAlchemy session per request.
+
+    A session only checks out a connection when it runs its first statement, so
+    handlers that return before touching the database (permission failures,
+    validation errors) never take one from the pool.
+    """
 
+    started_at = time.perf_counter()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        _record_request_session(db, started_at)
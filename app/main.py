@@ -3,15 +3,35 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routers import appointments, auth, doctors, lab_results, patients, tasks, users
+from app.api.routers import aio, appointments, auth, doctors, internal, lab_results, patients, tasks, users
 from app.core.config import get_settings
 from app.core.events import event_bus
+from app.core.security import password_hasher
+from app.db.async_session import async_engine
 from app.db.session import SessionLocal
-from app.subscribers.audit import register_audit_subscriber
+from app.services.availability_cache import availability_cache
+from app.services.outbox_relay import CircuitBreaker, OutboxRelay
+from app.tasks.executors import task_executor
+from app.subscribers.audit import register_audit_subscriber, shutdown_audit_subscriber
 
 settings = get_settings()
 
+outbox_relay = OutboxRelay(
+    SessionLocal,
+    event_bus,
+    batch_size=settings.outbox_relay_batch_size,
+    poll_interval=settings.outbox_relay_interval_seconds,
+    task_batch_size=settings.appointment_confirmation_batch_size,
+    retry_base_delay=settings.outbox_relay_retry_base_seconds,
+    retry_max_delay=settings.outbox_relay_retry_max_seconds,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.outbox_relay_breaker_threshold,
+        reset_timeout=settings.outbox_relay_breaker_cooldown_seconds,
+    ),
+)
+
 app = FastAPI(title=settings.project_name)
+app.state.outbox_relay = outbox_relay
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,8 +39,15 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials,
     allow_methods=settings.cors_allow_methods,
     allow_headers=settings.cors_allow_headers,
+    expose_headers=settings.cors_expose_headers,
 )
 
+if settings.use_async_stack:
+    # Registered first so these handlers win over the sync routes with the same
+    # paths; the sync routes keep documenting the (identical) contract.
+    for async_router in (aio.appointments, aio.doctors, aio.lab_results, aio.patients):
+        app.include_router(async_router.router, prefix=settings.api_v1_prefix, include_in_schema=False)
+
 app.include_router(users.router, prefix=settings.api_v1_prefix)
 app.include_router(auth.router, prefix=settings.api_v1_prefix)
 app.include_router(doctors.router, prefix=settings.api_v1_prefix)
@@ -28,12 +55,43 @@ app.include_router(patients.router, prefix=settings.api_v1_prefix)
 app.include_router(appointments.router, prefix=settings.api_v1_prefix)
 app.include_router(lab_results.router, prefix=settings.api_v1_prefix)
 app.include_router(tasks.router, prefix=settings.api_v1_prefix)
+app.include_router(internal.router, prefix=settings.api_v1_prefix)
 
 
 @app.on_event("startup")
 def startup_event() -> None:
+    if availability_cache is not None:
+        availability_cache.register(event_bus)
     if settings.enable_event_subscribers:
-        register_audit_subscriber(event_bus, SessionLocal)
+        register_audit_subscriber(
+            event_bus,
+            SessionLocal,
+            max_batch_size=settings.audit_buffer_max_size,
+            flush_interval=settings.audit_flush_interval_seconds,
+            max_buffered=settings.audit_buffer_hard_limit,
+            max_retry_delay=settings.audit_flush_max_backoff_seconds,
+        )
+    event_bus.start()
+    if settings.enable_outbox_relay:
+        outbox_relay.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    if settings.enable_outbox_relay:
+        outbox_relay.stop()
+    task_executor.shutdown()
+    event_bus.shutdown()
+    shutdown_audit_subscriber(event_bus)
+    if availability_cache is not None:
+        availability_cache.unregister(event_bus)
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 @app.get("/", tags=["system"])
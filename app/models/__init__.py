@@ -1,9 +1,10 @@
 from app.db.base import Base
 from app.models.appointment import Appointment, AppointmentStatus
-from app.models.doctor import DoctorProfile, DoctorSchedule
+from app.models.doctor import DoctorAvailabilityRule, DoctorProfile, DoctorSchedule
 from app.models.audit import AuditLog
 from app.models.background_task import BackgroundTaskRecord, BackgroundTaskStatus
 from app.models.lab_result import LabResult
+from app.models.outbox import OutboxMessage, OutboxMessageKind
 from app.models.patient import PatientProfile
 from app.models.user import User, UserRole
 
@@ -13,6 +14,7 @@ __all__ = [
     "UserRole",
     "DoctorProfile",
     "DoctorSchedule",
+    "DoctorAvailabilityRule",
     "PatientProfile",
     "Appointment",
     "AppointmentStatus",
@@ -20,4 +22,6 @@ __all__ = [
     "BackgroundTaskRecord",
     "BackgroundTaskStatus",
     "AuditLog",
+    "OutboxMessage",
+    "OutboxMessageKind",
 ]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -18,6 +18,11 @@ class BackgroundTaskStatus(str, enum.Enum):
 
 class BackgroundTaskRecord(Base):
     __tablename__ = "background_task_records"
+    __table_args__ = (
+        # Also serves the legacy lookup of an appointment's latest task by name:
+        # an appointment has a handful of records, read newest first.
+        Index("ix_background_task_records_appointment_created", "appointment_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_name = Column(String(255), nullable=False)
@@ -28,6 +33,8 @@ class BackgroundTaskRecord(Base):
         Integer, ForeignKey("appointments.id", ondelete="SET NULL"), nullable=True
     )
     external_reference = Column(String(255))
+    # Sent with the task message; a delivery only runs if it presents the current key.
+    idempotency_key = Column(String(64), unique=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(
         DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -1,8 +1,29 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import List
 
-from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Boolean,
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    Time,
+    UniqueConstraint,
+    column,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -35,6 +56,68 @@ class DoctorProfile(Base):
         back_populates="doctor_profile",
         cascade="all, delete-orphan",
     )
+    availability_rules = relationship(
+        "DoctorAvailabilityRule",
+        back_populates="doctor_profile",
+        cascade="all, delete-orphan",
+    )
+
+
+class DoctorAvailabilityRule(Base):
+    """A weekly availability pattern, e.g. Mon-Fri 09:00-12:00 for a year.
+
+    Occurrences are never stored up front: they are expanded over the requested
+    window when listing availability and materialized into a ``DoctorSchedule``
+    (linked through ``rule_id``) only when an appointment is booked into one.
+    Times of day are UTC, like every other timestamp in the API.
+    """
+
+    __tablename__ = "doctor_availability_rules"
+    __table_args__ = (
+        CheckConstraint("start_time < end_time", name="ck_doctor_availability_rule_time_order"),
+        CheckConstraint(
+            "weekday_mask > 0 AND weekday_mask < 128",
+            name="ck_doctor_availability_rule_weekday_mask",
+        ),
+        CheckConstraint("max_patients > 0", name="ck_doctor_availability_rule_max_patients_positive"),
+        CheckConstraint(
+            "valid_until IS NULL OR valid_until >= valid_from",
+            name="ck_doctor_availability_rule_validity",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    doctor_id = Column(
+        Integer, ForeignKey("doctor_profiles.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # Bit ``n`` set means the rule applies on ``date.weekday() == n`` (Monday is 0).
+    weekday_mask = Column(Integer, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    valid_from = Column(Date, nullable=False)
+    valid_until = Column(Date)
+    # ISO dates on which the pattern does not apply (holidays, leave).
+    excluded_dates = Column(JSON, nullable=False, default=list)
+    max_patients = Column(Integer, nullable=False, default=1)
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    doctor_profile = relationship("DoctorProfile", back_populates="availability_rules")
+    schedules = relationship("DoctorSchedule", back_populates="rule")
+
+    @property
+    def weekdays(self) -> List[int]:
+        return [day for day in range(7) if self.weekday_mask & (1 << day)]
+
+    @property
+    def excluded(self) -> List[date]:
+        return [date.fromisoformat(value) for value in self.excluded_dates or []]
+
+
+SCHEDULE_OVERLAP_CONSTRAINT = "ex_doctor_schedules_no_overlap"
 
 
 class DoctorSchedule(Base):
@@ -42,6 +125,28 @@ class DoctorSchedule(Base):
     __table_args__ = (
         CheckConstraint("start_time < end_time", name="ck_doctor_schedule_time_order"),
         CheckConstraint("max_patients > 0", name="ck_doctor_schedule_max_patients_positive"),
+        CheckConstraint("booked_count >= 0", name="ck_doctor_schedule_booked_count_non_negative"),
+        # One materialized schedule per rule occurrence, even under concurrent bookings.
+        UniqueConstraint("rule_id", "start_time", name="uq_doctor_schedules_rule_occurrence"),
+        Index("ix_doctor_schedules_doctor_window", "doctor_id", "start_time", "end_time"),
+        # Read by the earliest-availability keyset scan. The predicates are spelled
+        # the way each dialect renders ``.where(DoctorSchedule.is_active)``, which
+        # SQLite needs to match exactly before it can use a partial index.
+        Index(
+            "ix_doctor_schedules_active_start",
+            "start_time",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+        # Postgres rejects overlapping windows for the same doctor in the INSERT or
+        # UPDATE itself (GiST index over doctor_id and a half-open tsrange; needs
+        # the btree_gist extension). Other databases rely on the service check.
+        ExcludeConstraint(
+            (column("doctor_id"), "="),
+            (func.tsrange(column("start_time"), column("end_time")), "&&"),
+            name=SCHEDULE_OVERLAP_CONSTRAINT,
+            using="gist",
+        ).ddl_if(dialect="postgresql"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -49,11 +154,21 @@ class DoctorSchedule(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     max_patients = Column(Integer, nullable=False, default=1)
+    booked_count = Column(Integer, nullable=False, default=0, server_default="0")
     is_active = Column(Boolean, nullable=False, default=True)
+    rule_id = Column(Integer, ForeignKey("doctor_availability_rules.id", ondelete="SET NULL"))
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
     doctor_profile = relationship("DoctorProfile", back_populates="schedules")
+    rule = relationship("DoctorAvailabilityRule", back_populates="schedules")
     appointments = relationship("Appointment", back_populates="schedule")
+
+
+event.listen(
+    DoctorSchedule.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
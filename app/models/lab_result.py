@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -10,6 +10,9 @@ from app.db.base import Base
 
 class LabResult(Base):
     __tablename__ = "lab_results"
+    __table_args__ = (
+        Index("ix_lab_results_patient_recorded", "patient_id", "recorded_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
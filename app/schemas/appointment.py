@@ -25,6 +25,8 @@ class AppointmentCreate(ORMModel):
     patient_id: Optional[int] = None
     doctor_id: Optional[int] = None
     schedule_id: Optional[int] = None
+    # Book into an occurrence of a recurring availability rule instead of a schedule.
+    rule_id: Optional[int] = None
     scheduled_time: datetime
     reason: str = Field(max_length=255)
 
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time
+from typing import Literal, Optional
 
 from pydantic import Field, FieldValidationInfo, field_validator
 
@@ -71,9 +71,134 @@ class DoctorScheduleUpdate(ORMModel):
 class DoctorSchedulePublic(DoctorScheduleBase, MutableTimestampedModel):
     id: int
     doctor_id: int
+    booked_count: int = 0
+    rule_id: Optional[int] = None
+
+
+class DoctorScheduleBulkCreate(ORMModel):
+    items: list[DoctorScheduleCreate] = Field(min_length=1, max_length=1000)
+
+
+class DoctorScheduleBulkItemResult(ORMModel):
+    index: int
+    status: Literal["created", "rejected"]
+    schedule: Optional[DoctorSchedulePublic] = None
+    error: Optional[str] = None
+
+
+class DoctorScheduleBulkResult(ORMModel):
+    created: int
+    rejected: int
+    results: list[DoctorScheduleBulkItemResult]
+
+
+def _validate_weekdays(value: list[int]) -> list[int]:
+    if any(day < 0 or day > 6 for day in value):
+        raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+    return sorted(set(value))
+
+
+class DoctorAvailabilityRuleBase(ORMModel):
+    weekdays: list[int] = Field(min_length=1, max_length=7)
+    start_time: time
+    end_time: time
+    valid_from: date
+    valid_until: Optional[date] = None
+    excluded_dates: list[date] = Field(default_factory=list)
+    max_patients: int = Field(default=1, ge=1)
+    is_active: bool = True
+
+
+class DoctorAvailabilityRuleCreate(DoctorAvailabilityRuleBase):
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, value: list[int]) -> list[int]:
+        return _validate_weekdays(value)
+
+    @field_validator("end_time")
+    @classmethod
+    def validate_time_window(cls, value: time, info: FieldValidationInfo) -> time:
+        start_time = info.data.get("start_time")
+        if start_time and value <= start_time:
+            raise ValueError("end_time must be greater than start_time")
+        return value
+
+    @field_validator("valid_until")
+    @classmethod
+    def validate_validity(cls, value: Optional[date], info: FieldValidationInfo) -> Optional[date]:
+        valid_from = info.data.get("valid_from")
+        if value is not None and valid_from and value < valid_from:
+            raise ValueError("valid_until must not be before valid_from")
+        return value
+
+
+class DoctorAvailabilityRuleUpdate(ORMModel):
+    weekdays: Optional[list[int]] = Field(default=None, min_length=1, max_length=7)
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    valid_from: Optional[date] = None
+    valid_until: Optional[date] = None
+    excluded_dates: Optional[list[date]] = None
+    max_patients: Optional[int] = Field(default=None, ge=1)
+    is_active: Optional[bool] = None
+
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, value: Optional[list[int]]) -> Optional[list[int]]:
+        return None if value is None else _validate_weekdays(value)
+
+
+class DoctorAvailabilityRulePublic(MutableTimestampedModel):
+    id: int
+    doctor_id: int
+    weekdays: list[int]
+    start_time: time
+    end_time: time
+    valid_from: date
+    valid_until: Optional[date] = None
+    excluded_dates: list[date]
+    max_patients: int
+    is_active: bool
+
+
+class AvailabilityOccurrence(ORMModel):
+    """A bookable occurrence of an availability rule; book it with ``rule_id``."""
+
+    rule_id: int
+    doctor_id: int
+    start_time: datetime
+    end_time: datetime
+    max_patients: int
 
 
 class DoctorAvailability(ORMModel):
     doctor: DoctorProfilePublic
     schedules: list[DoctorSchedulePublic]
+    occurrences: list[AvailabilityOccurrence] = Field(default_factory=list)
+
 
+
+class AvailableSlot(ORMModel):
+    """A free fixed-length slot; book it with ``schedule_id`` or, for a rule occurrence, ``rule_id``."""
+
+    start_time: datetime
+    end_time: datetime
+    schedule_id: Optional[int] = None
+    rule_id: Optional[int] = None
+
+
+class DoctorAvailableSlots(ORMModel):
+    doctor: DoctorProfilePublic
+    slots: list[AvailableSlot]
+
+
+class EarliestAvailableOption(ORMModel):
+    """A bookable window; book it with ``schedule_id`` or, for a rule occurrence, ``rule_id``."""
+
+    doctor: DoctorProfilePublic
+    available_from: datetime
+    start_time: datetime
+    end_time: datetime
+    remaining_capacity: int
+    schedule_id: Optional[int] = None
+    rule_id: Optional[int] = None
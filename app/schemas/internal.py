@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class DatabasePoolStatus(BaseModel):
+    profile: str
+    pool: Dict[str, int]
+    pool_events: Dict[str, float]
+    request_sessions: Dict[str, float]
+    replicas: List[Dict[str, Any]] = []
+
+
+class TaskExecutorStatus(BaseModel):
+    backend: str
+    queue_depth: Optional[int]
+
+
+class OutboxRelayStatus(BaseModel):
+    pending: int
+    dispatched: int
+    failed: int
+    deferred_by_breaker: int
+    breaker: Dict[str, Any]
+
+
+class AvailabilityCacheStatus(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    invalidations: int
+    errors: int
+    size: Optional[int] = None
+    filters: Optional[int] = None
+    evictions: Optional[int] = None
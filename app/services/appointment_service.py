@@ -1,17 +1,257 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Select, Update, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.config import Settings
+from app.db.routing import replica_reads
 from app.models import BackgroundTaskRecord, BackgroundTaskStatus
 from app.models.appointment import Appointment, AppointmentStatus
-from app.models.doctor import DoctorSchedule
+from app.models.doctor import DoctorAvailabilityRule, DoctorProfile, DoctorSchedule
+from app.models.outbox import OutboxMessage, OutboxMessageKind
+from app.schemas.appointment import AppointmentPublic
+from app.services.availability_cache import publish_availability_changed
+from app.services.doctor_service import schedule_conflict_check
 from app.services.event_bus import EventBus
-from app.tasks import appointment_tasks
+from app.services.loading import loader_options_for
+from app.services.pagination import KeysetPage, paginate_descending, paginate_descending_async
+from app.services.recurrence import RuleOccurrence, occurrence_at
+
+OCCURRENCE_CONFLICT_MESSAGE = "Selected occurrence overlaps an existing schedule"
+STATUS_CONFLICT_MESSAGE = "Appointment status was changed by another request"
+
+
+def _new_confirmation_task(appointment: Appointment) -> BackgroundTaskRecord:
+    return BackgroundTaskRecord(
+        task_name="schedule_appointment",
+        status=BackgroundTaskStatus.QUEUED,
+        appointment=appointment,
+        idempotency_key=uuid.uuid4().hex,
+    )
+
+
+def _confirmation_message(task: BackgroundTaskRecord) -> OutboxMessage:
+    """Outbox message telling a worker which task record to run (requires a flushed task)."""
+
+    return OutboxMessage(
+        kind=OutboxMessageKind.TASK,
+        name="schedule_appointment",
+        payload={
+            "appointment_id": task.appointment_id,
+            "task_record_id": task.id,
+            "idempotency_key": task.idempotency_key,
+        },
+    )
+
+
+def _created_event_message(appointment: Appointment) -> OutboxMessage:
+    return OutboxMessage(
+        kind=OutboxMessageKind.EVENT,
+        name="appointment.created",
+        payload={
+            "appointment_id": appointment.id,
+            "patient_id": appointment.patient_id,
+            "doctor_id": appointment.doctor_id,
+            "schedule_id": appointment.schedule_id,
+            "scheduled_time": appointment.scheduled_time.isoformat(),
+        },
+    )
+
+
+def _booking_outbox_messages(
+    appointment: Appointment, task: BackgroundTaskRecord, settings: Settings
+) -> List[OutboxMessage]:
+    """Outbox messages committed with a new booking (requires flushed rows).
+
+    The confirmation task is only staged when background workers are enabled.
+    """
+
+    messages = [_created_event_message(appointment)]
+    if settings.enable_background_workers:
+        messages.insert(0, _confirmation_message(task))
+    return messages
+
+
+def _claim_capacity_statement(schedule_id: int) -> Update:
+    return (
+        update(DoctorSchedule)
+        .where(DoctorSchedule.id == schedule_id)
+        .where(DoctorSchedule.booked_count < DoctorSchedule.max_patients)
+        .values(booked_count=DoctorSchedule.booked_count + 1)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def _release_capacity_statement(schedule_id: int) -> Update:
+    return (
+        update(DoctorSchedule)
+        .where(DoctorSchedule.id == schedule_id)
+        .where(DoctorSchedule.booked_count > 0)
+        .values(booked_count=DoctorSchedule.booked_count - 1)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def _status_transition_statement(appointment: Appointment, status: AppointmentStatus) -> Update:
+    """Move ``appointment`` to ``status`` only if it still has the status it was loaded with.
+
+    Of two concurrent changes from the same status only one matches a row, so
+    only one of them takes or gives back the seat.
+    """
+
+    return (
+        update(Appointment)
+        .where(Appointment.id == appointment.id)
+        .where(Appointment.status == appointment.status)
+        .values(status=status, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session="evaluate")
+    )
+
+
+def _schedule_doctor_statement(schedule_id: int) -> Select:
+    return (
+        select(DoctorProfile.id, DoctorProfile.specialization)
+        .join(DoctorSchedule, DoctorSchedule.doctor_id == DoctorProfile.id)
+        .where(DoctorSchedule.id == schedule_id)
+    )
+
+
+def _reload_statement(appointment_id: int) -> Select:
+    """Load an appointment with everything ``AppointmentPublic`` embeds, in one query."""
+
+    return _appointments_statement(Appointment.id == appointment_id).execution_options(populate_existing=True)
+
+
+def _capacity_changes(appointment: Appointment, status: AppointmentStatus) -> bool:
+    """Whether moving ``appointment`` to ``status`` takes or gives back a schedule seat."""
+
+    return (
+        appointment.schedule_id is not None
+        and appointment.status != status
+        and AppointmentStatus.CANCELLED in (appointment.status, status)
+    )
+
+
+# Booking reads the schedule's (or rule's) doctor profile; async sessions cannot
+# lazy load it, and sync ones save a query by joining it.
+_SCHEDULE_WITH_DOCTOR = (joinedload(DoctorSchedule.doctor_profile),)
+_RULE_WITH_DOCTOR = (joinedload(DoctorAvailabilityRule.doctor_profile),)
+
+
+def _patient_conflict_statement(patient_id: int, scheduled_time: datetime) -> Select:
+    return (
+        select(Appointment.id)
+        .where(Appointment.patient_id == patient_id)
+        .where(Appointment.status != AppointmentStatus.CANCELLED)
+        .where(Appointment.scheduled_time == scheduled_time)
+        .limit(1)
+    )
+
+
+def _appointments_statement(*criteria: ColumnElement[bool]) -> Select:
+    return select(Appointment).options(*loader_options_for(Appointment, AppointmentPublic)).where(*criteria)
+
+
+def _publish_updated(event_bus: EventBus, appointment: Appointment) -> None:
+    event_bus.publish(
+        "appointment.updated",
+        {
+            "appointment_id": appointment.id,
+            "status": appointment.status.value,
+        },
+    )
+
+
+def _occurrence_for_booking(
+    rule: Optional[DoctorAvailabilityRule], scheduled_time: datetime
+) -> RuleOccurrence:
+    if rule is None:
+        raise ValueError("Selected availability rule does not exist")
+    occurrence = occurrence_at(rule, scheduled_time)
+    if occurrence is None:
+        raise ValueError("Scheduled time is outside the doctor's availability window")
+    return occurrence
+
+
+def _occurrence_schedule_statement(occurrence: RuleOccurrence) -> Select:
+    return (
+        select(DoctorSchedule.id)
+        .where(DoctorSchedule.rule_id == occurrence.rule_id)
+        .where(DoctorSchedule.start_time == occurrence.start_time)
+    )
+
+
+def _occurrence_conflict_check(bind, occurrence: RuleOccurrence) -> Optional[Select]:
+    return schedule_conflict_check(
+        bind,
+        doctor_profile_id=occurrence.doctor_id,
+        start_time=occurrence.start_time,
+        end_time=occurrence.end_time,
+    )
+
+
+def _materialized_schedule(rule: DoctorAvailabilityRule, occurrence: RuleOccurrence) -> DoctorSchedule:
+    return DoctorSchedule(
+        doctor_id=rule.doctor_id,
+        doctor_profile=rule.doctor_profile,
+        rule_id=rule.id,
+        start_time=occurrence.start_time,
+        end_time=occurrence.end_time,
+        max_patients=occurrence.max_patients,
+        is_active=True,
+    )
+
+
+def _check_booking_window(
+    schedule: Optional[DoctorSchedule], *, doctor_id: Optional[int], scheduled_time: datetime
+) -> int:
+    """Validate ``scheduled_time`` against the schedule and return the doctor's user id."""
+
+    if not schedule or not schedule.is_active:
+        raise ValueError("Selected schedule is unavailable")
+
+    doctor_user_id = schedule.doctor_profile.user_id if schedule.doctor_profile else None
+    if doctor_user_id is None:
+        raise ValueError("Doctor schedule is not linked to an active doctor")
+
+    if doctor_id is not None and doctor_user_id != doctor_id:
+        raise ValueError("Schedule does not belong to the specified doctor")
+
+    if scheduled_time < datetime.utcnow():
+        raise ValueError("Cannot book appointments in the past")
+
+    if scheduled_time < schedule.start_time or scheduled_time > schedule.end_time:
+        raise ValueError("Scheduled time is outside the doctor's availability window")
+
+    if schedule.booked_count >= schedule.max_patients:
+        raise ValueError("Selected schedule is fully booked")
+
+    return doctor_user_id
+
+
+def _apply_details(
+    appointment: Appointment,
+    *,
+    scheduled_time: Optional[datetime],
+    notes: Optional[str],
+    diagnosis: Optional[str],
+    prescription: Optional[str],
+) -> None:
+    if scheduled_time is not None:
+        appointment.scheduled_time = scheduled_time
+    if notes is not None:
+        appointment.notes = notes
+    if diagnosis is not None:
+        appointment.diagnosis = diagnosis
+    if prescription is not None:
+        appointment.prescription = prescription
+    appointment.updated_at = datetime.utcnow()
 
 
 class AppointmentService:
@@ -20,20 +260,55 @@ class AppointmentService:
         self.event_bus = event_bus
         self.settings = settings
 
-    def _enqueue_background_task(self, appointment: Appointment) -> BackgroundTaskRecord:
-        task = BackgroundTaskRecord(
-            task_name="schedule_appointment",
-            status=BackgroundTaskStatus.QUEUED,
-            appointment=appointment,
-        )
-        self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+    def _claim_schedule_capacity(self, schedule_id: int) -> bool:
+        """Reserve one seat on the schedule; returns False when it is already full.
+
+        The check and increment happen in a single conditional UPDATE so concurrent
+        bookings cannot both take the last seat.
+        """
+
+        result = self.session.execute(_claim_capacity_statement(schedule_id))
+        return result.rowcount == 1
+
+    def _release_schedule_capacity(self, schedule_id: int) -> None:
+        self.session.execute(_release_capacity_statement(schedule_id))
+
+    def _reload(self, appointment_id: int) -> Appointment:
+        """Load the committed appointment for the response, instead of lazy loading its relations."""
+
+        return self.session.scalars(_reload_statement(appointment_id)).one()
+
+    def _materialize_occurrence(self, *, rule_id: int, scheduled_time: datetime) -> int:
+        """Return the schedule id backing the rule occurrence at ``scheduled_time``.
 
-        if self.settings.enable_background_workers:
-            appointment_tasks.schedule_appointment_task.delay(appointment.id)
+        The schedule row is created by the first booking into the occurrence. This
+        must run before any other write of the transaction: losing a concurrent
+        race on ``uq_doctor_schedules_rule_occurrence`` rolls the transaction back
+        and reuses the winner's row. An occurrence overlapping another schedule of
+        the doctor is rejected, as ``DoctorService.create_schedule`` would.
+        """
 
-        return task
+        rule = self.session.get(DoctorAvailabilityRule, rule_id, options=_RULE_WITH_DOCTOR)
+        occurrence = _occurrence_for_booking(rule, scheduled_time)
+        statement = _occurrence_schedule_statement(occurrence)
+        schedule_id = self.session.scalar(statement)
+        if schedule_id is not None:
+            return schedule_id
+        conflict = _occurrence_conflict_check(self.session.get_bind(), occurrence)
+        if conflict is not None and self.session.scalar(conflict):
+            raise ValueError(OCCURRENCE_CONFLICT_MESSAGE)
+
+        schedule = _materialized_schedule(rule, occurrence)
+        self.session.add(schedule)
+        try:
+            self.session.flush()
+        except IntegrityError as exc:
+            self.session.rollback()
+            schedule_id = self.session.scalar(statement)
+            if schedule_id is None:
+                raise ValueError(OCCURRENCE_CONFLICT_MESSAGE) from exc
+            return schedule_id
+        return schedule.id
 
     def _validate_schedule_for_booking(
         self,
@@ -44,43 +319,14 @@ class AppointmentService:
         patient_id: int,
     ) -> tuple[int, DoctorSchedule]:
         if schedule_id is None:
-            raise ValueError("A doctor schedule must be supplied")
-
-        schedule = self.session.get(DoctorSchedule, schedule_id)
-        if not schedule or not schedule.is_active:
-            raise ValueError("Selected schedule is unavailable")
-
-        doctor_user_id = schedule.doctor_profile.user_id if schedule.doctor_profile else None
-        if doctor_user_id is None:
-            raise ValueError("Doctor schedule is not linked to an active doctor")
-
-        if doctor_id is not None and doctor_user_id != doctor_id:
-            raise ValueError("Schedule does not belong to the specified doctor")
-
-        if scheduled_time < datetime.utcnow():
-            raise ValueError("Cannot book appointments in the past")
-
-        if scheduled_time < schedule.start_time or scheduled_time > schedule.end_time:
-            raise ValueError("Scheduled time is outside the doctor's availability window")
+            raise ValueError("A doctor schedule or availability rule must be supplied")
 
-        active_bookings = (
-            self.session.query(func.count(Appointment.id))
-            .filter(Appointment.schedule_id == schedule.id)
-            .filter(Appointment.status != AppointmentStatus.CANCELLED)
-            .scalar()
-            or 0
+        schedule = self.session.get(DoctorSchedule, schedule_id, options=_SCHEDULE_WITH_DOCTOR)
+        doctor_user_id = _check_booking_window(
+            schedule, doctor_id=doctor_id, scheduled_time=scheduled_time
         )
-        if active_bookings >= schedule.max_patients:
-            raise ValueError("Selected schedule is fully booked")
 
-        patient_conflict = (
-            self.session.query(Appointment)
-            .filter(Appointment.patient_id == patient_id)
-            .filter(Appointment.status != AppointmentStatus.CANCELLED)
-            .filter(Appointment.scheduled_time == scheduled_time)
-            .one_or_none()
-        )
-        if patient_conflict:
+        if self.session.scalar(_patient_conflict_statement(patient_id, scheduled_time)) is not None:
             raise ValueError("You already have an appointment at this time")
 
         return doctor_user_id, schedule
@@ -93,13 +339,19 @@ class AppointmentService:
         schedule_id: Optional[int],
         scheduled_time: datetime,
         reason: str,
+        rule_id: Optional[int] = None,
     ) -> Appointment:
+        if schedule_id is None and rule_id is not None:
+            schedule_id = self._materialize_occurrence(rule_id=rule_id, scheduled_time=scheduled_time)
         doctor_user_id, schedule = self._validate_schedule_for_booking(
             schedule_id=schedule_id,
             doctor_id=doctor_id,
             scheduled_time=scheduled_time,
             patient_id=patient_id,
         )
+        if not self._claim_schedule_capacity(schedule.id):
+            raise ValueError("Selected schedule is fully booked")
+
         appointment = Appointment(
             patient_id=patient_id,
             doctor_id=doctor_user_id,
@@ -108,38 +360,40 @@ class AppointmentService:
             reason=reason,
             status=AppointmentStatus.PENDING,
         )
-        self.session.add(appointment)
+        task = _new_confirmation_task(appointment)
+        self.session.add_all([appointment, task])
+        self.session.flush()
+
+        self.session.add_all(_booking_outbox_messages(appointment, task, self.settings))
         self.session.commit()
-        self.session.refresh(appointment)
-
-        self._enqueue_background_task(appointment)
-
-        self.event_bus.publish(
-            "appointment.created",
-            {
-                "appointment_id": appointment.id,
-                "patient_id": appointment.patient_id,
-                "doctor_id": appointment.doctor_id,
-                "schedule_id": appointment.schedule_id,
-                "scheduled_time": appointment.scheduled_time.isoformat(),
-            },
+        publish_availability_changed(
+            self.event_bus,
+            doctor_id=schedule.doctor_id,
+            specializations=[schedule.doctor_profile.specialization],
         )
-        return appointment
+        return self._reload(appointment.id)
 
     def update_status(self, appointment: Appointment, status: AppointmentStatus) -> Appointment:
-        appointment.status = status
-        appointment.updated_at = datetime.utcnow()
-        self.session.add(appointment)
+        capacity_changes = _capacity_changes(appointment, status)
+        if self.session.execute(_status_transition_statement(appointment, status)).rowcount != 1:
+            self.session.rollback()
+            raise ValueError(STATUS_CONFLICT_MESSAGE)
+
+        doctor = None
+        if capacity_changes:
+            if status == AppointmentStatus.CANCELLED:
+                self._release_schedule_capacity(appointment.schedule_id)
+            elif not self._claim_schedule_capacity(appointment.schedule_id):
+                self.session.rollback()
+                raise ValueError("Selected schedule is fully booked")
+            doctor = self.session.execute(_schedule_doctor_statement(appointment.schedule_id)).one()
         self.session.commit()
-        self.session.refresh(appointment)
-
-        self.event_bus.publish(
-            "appointment.updated",
-            {
-                "appointment_id": appointment.id,
-                "status": appointment.status.value,
-            },
-        )
+        if doctor is not None:
+            publish_availability_changed(
+                self.event_bus, doctor_id=doctor.id, specializations=[doctor.specialization]
+            )
+
+        _publish_updated(self.event_bus, appointment)
         return appointment
 
     def update_details(
@@ -151,35 +405,242 @@ class AppointmentService:
         diagnosis: Optional[str],
         prescription: Optional[str],
     ) -> Appointment:
-        if scheduled_time is not None:
-            appointment.scheduled_time = scheduled_time
-        if notes is not None:
-            appointment.notes = notes
-        if diagnosis is not None:
-            appointment.diagnosis = diagnosis
-        if prescription is not None:
-            appointment.prescription = prescription
-        appointment.updated_at = datetime.utcnow()
+        _apply_details(
+            appointment,
+            scheduled_time=scheduled_time,
+            notes=notes,
+            diagnosis=diagnosis,
+            prescription=prescription,
+        )
         self.session.add(appointment)
         self.session.commit()
-        self.session.refresh(appointment)
         return appointment
 
     def get(self, appointment_id: int) -> Optional[Appointment]:
-        return self.session.get(Appointment, appointment_id)
-
-    def list_for_patient(self, patient_id: int) -> list[Appointment]:
-        return (
-            self.session.query(Appointment)
-            .filter(Appointment.patient_id == patient_id)
-            .order_by(Appointment.scheduled_time.desc())
-            .all()
+        return self.session.get(
+            Appointment,
+            appointment_id,
+            options=loader_options_for(Appointment, AppointmentPublic),
         )
 
-    def list_for_doctor(self, doctor_id: int) -> list[Appointment]:
-        return (
-            self.session.query(Appointment)
-            .filter(Appointment.doctor_id == doctor_id)
-            .order_by(Appointment.scheduled_time.desc())
-            .all()
+    def list_for_patient(
+        self,
+        patient_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[Appointment]:
+        with replica_reads(self.session):
+            return paginate_descending(
+                self.session,
+                _appointments_statement(Appointment.patient_id == patient_id),
+                sort_column=Appointment.scheduled_time,
+                id_column=Appointment.id,
+                cursor=cursor,
+                limit=limit,
+            )
+
+    def list_for_doctor(
+        self,
+        doctor_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[Appointment]:
+        with replica_reads(self.session):
+            return paginate_descending(
+                self.session,
+                _appointments_statement(Appointment.doctor_id == doctor_id),
+                sort_column=Appointment.scheduled_time,
+                id_column=Appointment.id,
+                cursor=cursor,
+                limit=limit,
+            )
+
+
+class AsyncAppointmentService:
+    """``AppointmentService`` for async handlers running on an ``AsyncSession``."""
+
+    def __init__(self, session: AsyncSession, event_bus: EventBus, settings: Settings) -> None:
+        self.session = session
+        self.event_bus = event_bus
+        self.settings = settings
+
+    async def _claim_schedule_capacity(self, schedule_id: int) -> bool:
+        result = await self.session.execute(_claim_capacity_statement(schedule_id))
+        return result.rowcount == 1
+
+    async def _release_schedule_capacity(self, schedule_id: int) -> None:
+        await self.session.execute(_release_capacity_statement(schedule_id))
+
+    async def _materialize_occurrence(self, *, rule_id: int, scheduled_time: datetime) -> int:
+        """Async variant of :meth:`AppointmentService._materialize_occurrence`."""
+
+        rule = await self.session.get(DoctorAvailabilityRule, rule_id, options=_RULE_WITH_DOCTOR)
+        occurrence = _occurrence_for_booking(rule, scheduled_time)
+        statement = _occurrence_schedule_statement(occurrence)
+        schedule_id = await self.session.scalar(statement)
+        if schedule_id is not None:
+            return schedule_id
+        conflict = _occurrence_conflict_check(self.session.get_bind(), occurrence)
+        if conflict is not None and await self.session.scalar(conflict):
+            raise ValueError(OCCURRENCE_CONFLICT_MESSAGE)
+
+        schedule = _materialized_schedule(rule, occurrence)
+        self.session.add(schedule)
+        try:
+            await self.session.flush()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            schedule_id = await self.session.scalar(statement)
+            if schedule_id is None:
+                raise ValueError(OCCURRENCE_CONFLICT_MESSAGE) from exc
+            return schedule_id
+        return schedule.id
+
+    async def _validate_schedule_for_booking(
+        self,
+        *,
+        schedule_id: Optional[int],
+        doctor_id: Optional[int],
+        scheduled_time: datetime,
+        patient_id: int,
+    ) -> tuple[int, DoctorSchedule]:
+        if schedule_id is None:
+            raise ValueError("A doctor schedule or availability rule must be supplied")
+
+        schedule = await self.session.get(DoctorSchedule, schedule_id, options=_SCHEDULE_WITH_DOCTOR)
+        doctor_user_id = _check_booking_window(
+            schedule, doctor_id=doctor_id, scheduled_time=scheduled_time
+        )
+
+        if await self.session.scalar(_patient_conflict_statement(patient_id, scheduled_time)) is not None:
+            raise ValueError("You already have an appointment at this time")
+
+        return doctor_user_id, schedule
+
+    async def _reload(self, appointment_id: int) -> Appointment:
+        return (await self.session.scalars(_reload_statement(appointment_id))).one()
+
+    async def create_appointment(
+        self,
+        *,
+        patient_id: int,
+        doctor_id: Optional[int],
+        schedule_id: Optional[int],
+        scheduled_time: datetime,
+        reason: str,
+        rule_id: Optional[int] = None,
+    ) -> Appointment:
+        if schedule_id is None and rule_id is not None:
+            schedule_id = await self._materialize_occurrence(rule_id=rule_id, scheduled_time=scheduled_time)
+        doctor_user_id, schedule = await self._validate_schedule_for_booking(
+            schedule_id=schedule_id,
+            doctor_id=doctor_id,
+            scheduled_time=scheduled_time,
+            patient_id=patient_id,
+        )
+        if not await self._claim_schedule_capacity(schedule.id):
+            raise ValueError("Selected schedule is fully booked")
+
+        appointment = Appointment(
+            patient_id=patient_id,
+            doctor_id=doctor_user_id,
+            schedule_id=schedule.id,
+            scheduled_time=scheduled_time,
+            reason=reason,
+            status=AppointmentStatus.PENDING,
+        )
+        task = _new_confirmation_task(appointment)
+        self.session.add_all([appointment, task])
+        await self.session.flush()
+
+        self.session.add_all(_booking_outbox_messages(appointment, task, self.settings))
+        await self.session.commit()
+        publish_availability_changed(
+            self.event_bus,
+            doctor_id=schedule.doctor_id,
+            specializations=[schedule.doctor_profile.specialization],
+        )
+        return await self._reload(appointment.id)
+
+    async def update_status(self, appointment: Appointment, status: AppointmentStatus) -> Appointment:
+        capacity_changes = _capacity_changes(appointment, status)
+        if (await self.session.execute(_status_transition_statement(appointment, status))).rowcount != 1:
+            await self.session.rollback()
+            raise ValueError(STATUS_CONFLICT_MESSAGE)
+
+        doctor = None
+        if capacity_changes:
+            if status == AppointmentStatus.CANCELLED:
+                await self._release_schedule_capacity(appointment.schedule_id)
+            elif not await self._claim_schedule_capacity(appointment.schedule_id):
+                await self.session.rollback()
+                raise ValueError("Selected schedule is fully booked")
+            doctor = (await self.session.execute(_schedule_doctor_statement(appointment.schedule_id))).one()
+        await self.session.commit()
+        if doctor is not None:
+            publish_availability_changed(
+                self.event_bus, doctor_id=doctor.id, specializations=[doctor.specialization]
+            )
+
+        _publish_updated(self.event_bus, appointment)
+        return appointment
+
+    async def update_details(
+        self,
+        appointment: Appointment,
+        *,
+        scheduled_time: Optional[datetime],
+        notes: Optional[str],
+        diagnosis: Optional[str],
+        prescription: Optional[str],
+    ) -> Appointment:
+        _apply_details(
+            appointment,
+            scheduled_time=scheduled_time,
+            notes=notes,
+            diagnosis=diagnosis,
+            prescription=prescription,
+        )
+        await self.session.commit()
+        return appointment
+
+    async def get(self, appointment_id: int) -> Optional[Appointment]:
+        return await self.session.get(
+            Appointment,
+            appointment_id,
+            options=loader_options_for(Appointment, AppointmentPublic),
+        )
+
+    async def list_for_patient(
+        self,
+        patient_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[Appointment]:
+        return await paginate_descending_async(
+            self.session,
+            _appointments_statement(Appointment.patient_id == patient_id),
+            sort_column=Appointment.scheduled_time,
+            id_column=Appointment.id,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    async def list_for_doctor(
+        self,
+        doctor_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[Appointment]:
+        return await paginate_descending_async(
+            self.session,
+            _appointments_statement(Appointment.doctor_id == doctor_id),
+            sort_column=Appointment.scheduled_time,
+            id_column=Appointment.id,
+            cursor=cursor,
+            limit=limit,
         )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 from typing import Optional
 
@@ -15,13 +16,31 @@ class AuthService:
         self.session = session
         self.settings = settings
 
-    def authenticate(self, email: str, password: str) -> Optional[User]:
+    def get_active_user(self, email: str) -> Optional[User]:
         user = self.session.query(User).filter(User.email == email).one_or_none()
+        if not user or not user.is_active:
+            return None
+        return user
+
+    def authenticate(self, email: str, password: str) -> Optional[User]:
+        user = self.get_active_user(email)
         if not user:
             return None
-        if not user.is_active:
+        if not security.password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
+
+    async def authenticate_async(self, email: str, password: str) -> Optional[User]:
+        """:meth:`authenticate` for async handlers.
+
+        The lookup runs in a worker thread and the bcrypt check is awaited, so no
+        thread is held while the hash is computed.
+        """
+
+        user = await asyncio.to_thread(self.get_active_user, email)
+        if not user:
             return None
-        if not security.verify_password(password, user.hashed_password):
+        if not await security.password_hasher.verify_async(password, user.hashed_password):
             return None
         return user
 
@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.core.config import Settings, get_settings
+from app.schemas.doctor import DoctorAvailability
+from app.schemas.events import DomainEvent
+from app.services.event_bus import EventBus
+from app.services.recurrence import as_naive_utc
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_CHANGED = "availability.changed"
+
+# Characters that make an ILIKE pattern match more than the plain substring.
+_PATTERN_CHARACTERS = frozenset("%_\\")
+
+_listing = TypeAdapter(List[DoctorAvailability])
+
+AvailabilityLoader = Callable[[datetime], List[DoctorAvailability]]
+AsyncAvailabilityLoader = Callable[[datetime], Awaitable[List[DoctorAvailability]]]
+
+
+def publish_availability_changed(
+    event_bus: Optional[EventBus], *, doctor_id: int, specializations: Iterable[Optional[str]]
+) -> None:
+    """Announce that a doctor's listed availability changed in a committed transaction."""
+
+    if event_bus is None:
+        return
+    event_bus.publish(
+        AVAILABILITY_CHANGED,
+        {
+            "doctor_id": doctor_id,
+            "specializations": sorted({value for value in specializations if value is not None}),
+        },
+    )
+
+
+def specialization_filter(specialization: Optional[str]) -> str:
+    """The version key of a ``specialization`` query; "" stands for no filter."""
+
+    return (specialization or "").lower()
+
+
+def filter_matches(filter_key: str, specialization: str) -> bool:
+    """Whether a listing filtered by ``filter_key`` can include a doctor of ``specialization``.
+
+    Mirrors the case-insensitive substring match of the listing query; filters
+    containing ILIKE wildcards are treated as matching everything.
+    """
+
+    if _PATTERN_CHARACTERS.intersection(filter_key):
+        return True
+    return filter_key in specialization.lower()
+
+
+def trim_ended(listing: List[DoctorAvailability], now: datetime) -> List[DoctorAvailability]:
+    """Drop the windows of ``listing`` that ended before ``now`` and doctors left with none."""
+
+    trimmed = []
+    for entry in listing:
+        schedules = [schedule for schedule in entry.schedules if as_naive_utc(schedule.end_time) >= now]
+        occurrences = [
+            occurrence for occurrence in entry.occurrences if as_naive_utc(occurrence.end_time) >= now
+        ]
+        if schedules or occurrences:
+            trimmed.append(entry.model_copy(update={"schedules": schedules, "occurrences": occurrences}))
+    return trimmed
+
+
+class LRUAvailabilityBackend:
+    """Per-process storage: an LRU of serialized listings and a version per filter."""
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, *, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def version(self, filter_key: str) -> int:
+        with self._lock:
+            version = self._versions.get(filter_key)
+            if version is None:
+                # Versions come from one counter, so a forgotten filter never gets
+                # back a version its old entries were stored under.
+                if len(self._versions) >= self.max_size:
+                    self._versions.clear()
+                self._clock += 1
+                version = self._versions[filter_key] = self._clock
+            return version
+
+    def bump(self, matches: Callable[[str], bool]) -> int:
+        with self._lock:
+            stale = [filter_key for filter_key in self._versions if matches(filter_key)]
+            for filter_key in stale:
+                self._clock += 1
+                self._versions[filter_key] = self._clock
+            return len(stale)
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._entries), "filters": len(self._versions), "evictions": self._evictions}
+
+
+class RedisAvailabilityBackend:
+    """Storage shared by every API process: listings and filter versions live in Redis.
+
+    Listings expire on their own; versions are kept in one hash and drawn from a
+    shared counter, so bumping a version in one process hides the stale entries
+    from all of them.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client: Any, *, prefix: str = "availability", max_filters: int = 1024) -> None:
+        self.client = client
+        self.max_filters = max_filters
+        self._versions_key = f"{prefix}:versions"
+        self._clock_key = f"{prefix}:clock"
+        self._entry_prefix = f"{prefix}:entry:"
+
+    @classmethod
+    def from_url(cls, url: str, *, socket_timeout: float = 0.5, **kwargs: Any) -> "RedisAvailabilityBackend":
+        import redis
+
+        client = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+        return cls(client, **kwargs)
+
+    def version(self, filter_key: str) -> int:
+        version = self.client.hget(self._versions_key, filter_key)
+        if version is not None:
+            return int(version)
+        return self.client.transaction(
+            lambda pipeline: self._assign_version(pipeline, filter_key),
+            self._versions_key,
+            self._clock_key,
+            value_from_callable=True,
+        )
+
+    def _assign_version(self, pipeline: Any, filter_key: str) -> int:
+        """Give ``filter_key`` the next clock value, resetting a full hash first.
+
+        Runs under WATCH on the hash and the clock: if another process assigns,
+        bumps or resets in between, the transaction is retried from the reads.
+        """
+
+        version = pipeline.hget(self._versions_key, filter_key)
+        if version is not None:
+            return int(version)
+        full = pipeline.hlen(self._versions_key) >= self.max_filters
+        version = int(pipeline.get(self._clock_key) or 0) + 1
+        pipeline.multi()
+        if full:
+            pipeline.delete(self._versions_key)
+        pipeline.set(self._clock_key, version)
+        pipeline.hset(self._versions_key, filter_key, version)
+        return version
+
+    def bump(self, matches: Callable[[str], bool]) -> int:
+        stale = [
+            filter_key.decode() for filter_key in self.client.hkeys(self._versions_key) if matches(filter_key.decode())
+        ]
+        if stale:
+            # Reserve one clock value per filter in a single INCRBY, which also
+            # aborts any version assignment watching the clock.
+            last = self.client.incrby(self._clock_key, len(stale))
+            first = last - len(stale) + 1
+            self.client.hset(
+                self._versions_key,
+                mapping={filter_key: first + offset for offset, filter_key in enumerate(stale)},
+            )
+        return len(stale)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self._entry_prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.client.set(self._entry_prefix + key, value, px=max(int(ttl_seconds * 1000), 1))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"filters": self.client.hlen(self._versions_key)}
+
+
+AvailabilityBackend = LRUAvailabilityBackend | RedisAvailabilityBackend
+
+
+class AvailabilityCache:
+    """Read-through cache of ``/patients/doctors`` listings keyed by filter and window.
+
+    Every key embeds the current version of its specialization filter. An
+    ``availability.changed`` event bumps the version of each filter that can
+    list the affected doctor, so later reads miss and reload. The version is
+    read before loading: a listing loaded concurrently with a booking is stored
+    under the old version and never served once the event has been handled.
+
+    Listings without an explicit ``earliest`` are cached per
+    ``window_bucket_seconds`` and trimmed to the current time when served.
+    Backend failures are logged and the listing is loaded from the database.
+    """
+
+    def __init__(
+        self,
+        backend: AvailabilityBackend,
+        *,
+        ttl_seconds: float = 60.0,
+        window_bucket_seconds: int = 60,
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.window_bucket_seconds = max(window_bucket_seconds, 1)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+    # -- Reads -------------------------------------------------------------------------
+    def _window(self, earliest: Optional[datetime]) -> Tuple[datetime, Optional[datetime]]:
+        """Return ``(window_start, now)``; ``now`` is set when the listing must be trimmed."""
+
+        if earliest is not None:
+            return as_naive_utc(earliest), None
+        now = datetime.utcnow()
+        bucket = timedelta(seconds=self.window_bucket_seconds)
+        return now - (now - datetime.min) % bucket, now
+
+    def _lookup(
+        self, specialization: Optional[str], window_start: datetime, latest: Optional[datetime]
+    ) -> Tuple[Optional[str], Optional[bytes]]:
+        filter_key = specialization_filter(specialization)
+        try:
+            version = self.backend.version(filter_key)
+            key = f"{version}|{window_start.isoformat()}|{latest.isoformat() if latest else ''}|{filter_key}"
+            cached = self.backend.get(key)
+        except Exception:
+            self._increment("errors")
+            logger.warning("Availability cache lookup failed", exc_info=True)
+            return None, None
+        self._increment("hits" if cached is not None else "misses")
+        return key, cached
+
+    def _store(self, key: Optional[str], listing: List[DoctorAvailability]) -> None:
+        if key is None:
+            return
+        try:
+            self.backend.set(key, _listing.dump_json(listing), self.ttl_seconds)
+        except Exception:
+            self._increment("errors")
+            logger.warning("Availability cache store failed", exc_info=True)
+
+    @staticmethod
+    def _serve(listing: List[DoctorAvailability], now: Optional[datetime]) -> List[DoctorAvailability]:
+        return listing if now is None else trim_ended(listing, now)
+
+    def get_or_load(
+        self,
+        *,
+        specialization: Optional[str],
+        earliest: Optional[datetime],
+        latest: Optional[datetime],
+        load: AvailabilityLoader,
+    ) -> List[DoctorAvailability]:
+        """Return the cached listing, or ``load(window_start)`` and cache it."""
+
+        window_start, now = self._window(earliest)
+        latest = as_naive_utc(latest)
+        key, cached = self._lookup(specialization, window_start, latest)
+        if cached is not None:
+            return self._serve(_listing.validate_json(cached), now)
+        listing = load(window_start)
+        self._store(key, listing)
+        return self._serve(listing, now)
+
+    async def get_or_load_async(
+        self,
+        *,
+        specialization: Optional[str],
+        earliest: Optional[datetime],
+        latest: Optional[datetime],
+        load: AsyncAvailabilityLoader,
+    ) -> List[DoctorAvailability]:
+        """Async variant of :meth:`get_or_load`; blocking backends run in a thread."""
+
+        window_start, now = self._window(earliest)
+        latest = as_naive_utc(latest)
+        if self.backend.blocking:
+            key, cached = await asyncio.to_thread(self._lookup, specialization, window_start, latest)
+        else:
+            key, cached = self._lookup(specialization, window_start, latest)
+        if cached is not None:
+            return self._serve(_listing.validate_json(cached), now)
+        listing = await load(window_start)
+        if self.backend.blocking:
+            await asyncio.to_thread(self._store, key, listing)
+        else:
+            self._store(key, listing)
+        return self._serve(listing, now)
+
+    # -- Invalidation ------------------------------------------------------------------
+    def invalidate(self, specializations: Iterable[str]) -> None:
+        """Hide every cached listing whose filter can include one of ``specializations``."""
+
+        specializations = list(specializations)
+        try:
+            bumped = self.backend.bump(
+                lambda filter_key: any(filter_matches(filter_key, value) for value in specializations)
+            )
+        except Exception:
+            self._increment("errors")
+            logger.exception("Availability cache invalidation failed")
+            return
+        self._increment("invalidations", bumped)
+
+    def handle_event(self, event: DomainEvent) -> None:
+        self.invalidate(event.payload.get("specializations", []))
+
+    def register(self, event_bus: EventBus) -> None:
+        event_bus.subscribe(AVAILABILITY_CHANGED, self.handle_event, inline=True)
+
+    def unregister(self, event_bus: EventBus) -> None:
+        event_bus.unsubscribe(AVAILABILITY_CHANGED, self.handle_event)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+        snapshot["backend"] = self.backend.name
+        try:
+            snapshot.update(self.backend.stats())
+        except Exception:
+            logger.warning("Availability cache stats unavailable", exc_info=True)
+        return snapshot
+
+    def _increment(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+
+def build_availability_cache(settings: Settings) -> Optional[AvailabilityCache]:
+    backend_name = settings.availability_cache_backend
+    if backend_name == "none":
+        return None
+    if backend_name == "memory":
+        # Invalidations only reach the process that handled the change, so other
+        # processes would keep serving stale listings until the TTL.
+        if settings.web_concurrency > 1:
+            raise ValueError(
+                "AVAILABILITY_CACHE_BACKEND=memory requires a single API process; "
+                f"use redis with WEB_CONCURRENCY={settings.web_concurrency}"
+            )
+        backend: AvailabilityBackend = LRUAvailabilityBackend(max_size=settings.availability_cache_max_entries)
+    elif backend_name == "redis":
+        backend = RedisAvailabilityBackend.from_url(
+            str(settings.availability_cache_redis_url),
+            max_filters=settings.availability_cache_max_entries,
+        )
+    else:
+        raise ValueError(f"Unknown availability cache backend: {backend_name!r}")
+    return AvailabilityCache(
+        backend,
+        ttl_seconds=settings.availability_cache_ttl_seconds,
+        window_bucket_seconds=settings.availability_cache_window_seconds,
+    )
+
+
+availability_cache = build_availability_cache(get_settings())
@@ -1,22 +1,32 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.background_task import BackgroundTaskRecord
+from app.services.pagination import KeysetPage, paginate_descending
 
 
 class BackgroundTaskService:
     def __init__(self, session: Session) -> None:
         self.session = session
 
-    def list_for_appointment(self, appointment_id: int) -> List[BackgroundTaskRecord]:
-        return (
-            self.session.query(BackgroundTaskRecord)
-            .filter(BackgroundTaskRecord.appointment_id == appointment_id)
-            .order_by(BackgroundTaskRecord.created_at.desc())
-            .all()
+    def list_for_appointment(
+        self,
+        appointment_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[BackgroundTaskRecord]:
+        return paginate_descending(
+            self.session,
+            select(BackgroundTaskRecord).where(BackgroundTaskRecord.appointment_id == appointment_id),
+            sort_column=BackgroundTaskRecord.created_at,
+            id_column=BackgroundTaskRecord.id,
+            cursor=cursor,
+            limit=limit,
         )
 
     def get(self, task_id: int) -> Optional[BackgroundTaskRecord]:
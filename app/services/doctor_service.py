@@ -1,29 +1,181 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import Select, exists, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import Appointment, AppointmentStatus, DoctorProfile, DoctorSchedule, User, UserRole
+from app.core.principal_cache import principal_cache
+from app.models import DoctorAvailabilityRule, DoctorProfile, DoctorSchedule, User, UserRole
+from app.models.doctor import SCHEDULE_OVERLAP_CONSTRAINT
 from app.schemas import doctor as doctor_schema
+from app.services.availability_cache import publish_availability_changed
+from app.services.event_bus import EventBus
+from app.services.loading import loader_options_for
+
+
+SCHEDULE_OVERLAP_MESSAGE = "Schedule overlaps with existing availability"
+BATCH_OVERLAP_MESSAGE = "Schedule overlaps with another schedule in the request"
+
+
+def _enforces_overlap_constraint(bind: Any) -> bool:
+    """Whether the database rejects overlapping schedules itself (see ``DoctorSchedule``)."""
+
+    return bind.dialect.name == "postgresql"
+
+
+def _is_overlap_violation(exc: IntegrityError) -> bool:
+    return SCHEDULE_OVERLAP_CONSTRAINT in str(exc.orig)
+
+
+def _schedule_conflict_statement(
+    *,
+    doctor_profile_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    schedule_id: Optional[int] = None,
+) -> Select:
+    overlapping = (
+        exists()
+        .where(DoctorSchedule.doctor_id == doctor_profile_id)
+        .where(DoctorSchedule.end_time > start_time)
+        .where(DoctorSchedule.start_time < end_time)
+    )
+    if schedule_id is not None:
+        overlapping = overlapping.where(DoctorSchedule.id != schedule_id)
+    return select(overlapping)
+
+
+def schedule_conflict_check(
+    bind: Any,
+    *,
+    doctor_profile_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    schedule_id: Optional[int] = None,
+) -> Optional[Select]:
+    """Range-overlap pre-check for a schedule window, or ``None`` where the exclusion constraint applies.
+
+    Also used before materializing a rule occurrence into a schedule.
+    """
+
+    if _enforces_overlap_constraint(bind):
+        return None
+    return _schedule_conflict_statement(
+        doctor_profile_id=doctor_profile_id,
+        start_time=start_time,
+        end_time=end_time,
+        schedule_id=schedule_id,
+    )
+
+
+def _specialization_statement(doctor_profile_id: int) -> Select:
+    return select(DoctorProfile.specialization).where(DoctorProfile.id == doctor_profile_id)
+
+
+def _profile_by_user_statement(user_id: int) -> Select:
+    return (
+        select(DoctorProfile)
+        .options(*loader_options_for(DoctorProfile, doctor_schema.DoctorProfilePublic))
+        .where(DoctorProfile.user_id == user_id)
+    )
+
+
+def _schedules_statement(doctor_profile_id: int, *, active_only: bool, upcoming_only: bool) -> Select:
+    statement = select(DoctorSchedule).where(DoctorSchedule.doctor_id == doctor_profile_id)
+    if active_only:
+        statement = statement.where(DoctorSchedule.is_active.is_(True))
+    if upcoming_only:
+        statement = statement.where(DoctorSchedule.end_time >= datetime.utcnow())
+    return statement.order_by(DoctorSchedule.start_time.asc())
+
+
+def _new_schedule(doctor_profile: DoctorProfile, schedule_in: doctor_schema.DoctorScheduleCreate) -> DoctorSchedule:
+    return DoctorSchedule(
+        doctor_id=doctor_profile.id,
+        start_time=schedule_in.start_time,
+        end_time=schedule_in.end_time,
+        max_patients=schedule_in.max_patients,
+        is_active=schedule_in.is_active,
+    )
+
+
+def _updated_window(
+    schedule: DoctorSchedule, schedule_in: doctor_schema.DoctorScheduleUpdate
+) -> Tuple[datetime, datetime]:
+    return (
+        schedule_in.start_time if schedule_in.start_time is not None else schedule.start_time,
+        schedule_in.end_time if schedule_in.end_time is not None else schedule.end_time,
+    )
+
+
+def _apply_schedule_update(schedule: DoctorSchedule, schedule_in: doctor_schema.DoctorScheduleUpdate) -> None:
+    if schedule_in.max_patients is not None and schedule_in.max_patients < schedule.booked_count:
+        raise ValueError("max_patients cannot be lower than the number of booked appointments")
+
+    if schedule_in.start_time is not None:
+        schedule.start_time = schedule_in.start_time
+    if schedule_in.end_time is not None:
+        schedule.end_time = schedule_in.end_time
+    if schedule_in.max_patients is not None:
+        schedule.max_patients = schedule_in.max_patients
+    if schedule_in.is_active is not None:
+        schedule.is_active = schedule_in.is_active
+
+
+def _weekday_mask(weekdays: Sequence[int]) -> int:
+    mask = 0
+    for day in weekdays:
+        mask |= 1 << day
+    return mask
+
+
+def _apply_rule_update(
+    rule: DoctorAvailabilityRule, rule_in: doctor_schema.DoctorAvailabilityRuleUpdate
+) -> None:
+    if rule_in.weekdays is not None:
+        rule.weekday_mask = _weekday_mask(rule_in.weekdays)
+    if rule_in.start_time is not None:
+        rule.start_time = rule_in.start_time
+    if rule_in.end_time is not None:
+        rule.end_time = rule_in.end_time
+    if rule_in.valid_from is not None:
+        rule.valid_from = rule_in.valid_from
+    if "valid_until" in rule_in.model_fields_set:
+        rule.valid_until = rule_in.valid_until
+    if rule_in.excluded_dates is not None:
+        rule.excluded_dates = sorted({day.isoformat() for day in rule_in.excluded_dates})
+    if rule_in.max_patients is not None:
+        rule.max_patients = rule_in.max_patients
+    if rule_in.is_active is not None:
+        rule.is_active = rule_in.is_active
+
+    if rule.end_time <= rule.start_time:
+        raise ValueError("end_time must be greater than start_time")
+    if rule.valid_until is not None and rule.valid_until < rule.valid_from:
+        raise ValueError("valid_until must not be before valid_from")
 
 
 class DoctorService:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, event_bus: Optional[EventBus] = None) -> None:
         self.session = session
+        self.event_bus = event_bus
+
+    def _availability_changed(self, doctor_profile_id: int, *specializations: Optional[str]) -> None:
+        publish_availability_changed(
+            self.event_bus, doctor_id=doctor_profile_id, specializations=specializations
+        )
 
     # -- Doctor profile management -------------------------------------------------
     def get_profile(self, doctor_id: int) -> Optional[DoctorProfile]:
         return self.session.get(DoctorProfile, doctor_id)
 
     def get_profile_by_user_id(self, user_id: int) -> Optional[DoctorProfile]:
-        return (
-            self.session.query(DoctorProfile)
-            .filter(DoctorProfile.user_id == user_id)
-            .one_or_none()
-        )
+        return self.session.scalar(_profile_by_user_statement(user_id))
 
     def list_profiles(self, *, include_inactive_users: bool = False) -> List[DoctorProfile]:
         query = self.session.query(DoctorProfile).join(DoctorProfile.user)
@@ -37,11 +189,9 @@ class DoctorService:
             raise ValueError("User does not exist")
         if user.role not in {UserRole.DOCTOR, UserRole.SUPERADMIN, UserRole.ADMIN}:
             raise ValueError("User must have doctor-capable role")
-        existing = self.get_profile_by_user_id(profile_in.user_id)
-        if existing:
-            raise ValueError("Doctor profile already exists for this user")
 
-        if user.role != UserRole.DOCTOR:
+        role_changed = user.role != UserRole.DOCTOR
+        if role_changed:
             user.role = UserRole.DOCTOR
 
         profile = DoctorProfile(
@@ -53,14 +203,23 @@ class DoctorService:
             bio=profile_in.bio,
         )
         self.session.add(profile)
-        self.session.add(user)
-        self.session.commit()
-        self.session.refresh(profile)
+        try:
+            self.session.commit()
+        except IntegrityError as exc:
+            # ``doctor_profiles.user_id`` is unique: the user already has a profile.
+            self.session.rollback()
+            raise ValueError("Doctor profile already exists for this user") from exc
+        # Attach the loaded user without touching its one-to-one backref, so the
+        # response embeds it instead of loading it again.
+        set_committed_value(profile, "user", user)
+        if role_changed:
+            principal_cache.invalidate(user.id)
         return profile
 
     def update_profile(
         self, profile: DoctorProfile, profile_in: doctor_schema.DoctorProfileUpdate
     ) -> DoctorProfile:
+        previous_specialization = profile.specialization
         if profile_in.specialization is not None:
             profile.specialization = profile_in.specialization
         if profile_in.license_number is not None:
@@ -73,7 +232,7 @@ class DoctorService:
             profile.bio = profile_in.bio
         self.session.add(profile)
         self.session.commit()
-        self.session.refresh(profile)
+        self._availability_changed(profile.id, previous_specialization, profile.specialization)
         return profile
 
     # -- Doctor schedule management -------------------------------------------------
@@ -85,15 +244,25 @@ class DoctorService:
         end_time: datetime,
         schedule_id: Optional[int] = None,
     ) -> bool:
-        query = (
-            self.session.query(DoctorSchedule)
-            .filter(DoctorSchedule.doctor_id == doctor_profile_id)
-            .filter(DoctorSchedule.end_time > start_time)
-            .filter(DoctorSchedule.start_time < end_time)
+        """Range-overlap pre-check, skipped where the exclusion constraint applies."""
+
+        statement = schedule_conflict_check(
+            self.session.get_bind(),
+            doctor_profile_id=doctor_profile_id,
+            start_time=start_time,
+            end_time=end_time,
+            schedule_id=schedule_id,
         )
-        if schedule_id is not None:
-            query = query.filter(DoctorSchedule.id != schedule_id)
-        return self.session.query(query.exists()).scalar() or False
+        return statement is not None and (self.session.scalar(statement) or False)
+
+    def _commit_schedule(self) -> None:
+        try:
+            self.session.commit()
+        except IntegrityError as exc:
+            self.session.rollback()
+            if _is_overlap_violation(exc):
+                raise ValueError(SCHEDULE_OVERLAP_MESSAGE) from exc
+            raise
 
     def create_schedule(
         self,
@@ -106,18 +275,12 @@ class DoctorService:
             start_time=schedule_in.start_time,
             end_time=schedule_in.end_time,
         ):
-            raise ValueError("Schedule overlaps with existing availability")
+            raise ValueError(SCHEDULE_OVERLAP_MESSAGE)
 
-        schedule = DoctorSchedule(
-            doctor_id=doctor_profile.id,
-            start_time=schedule_in.start_time,
-            end_time=schedule_in.end_time,
-            max_patients=schedule_in.max_patients,
-            is_active=schedule_in.is_active,
-        )
+        schedule = _new_schedule(doctor_profile, schedule_in)
         self.session.add(schedule)
-        self.session.commit()
-        self.session.refresh(schedule)
+        self._commit_schedule()
+        self._availability_changed(doctor_profile.id, doctor_profile.specialization)
         return schedule
 
     def update_schedule(
@@ -126,33 +289,91 @@ class DoctorService:
         schedule: DoctorSchedule,
         schedule_in: doctor_schema.DoctorScheduleUpdate,
     ) -> DoctorSchedule:
-        new_start = schedule_in.start_time if schedule_in.start_time is not None else schedule.start_time
-        new_end = schedule_in.end_time if schedule_in.end_time is not None else schedule.end_time
+        new_start, new_end = _updated_window(schedule, schedule_in)
         if self._has_schedule_conflict(
             doctor_profile_id=schedule.doctor_id,
             start_time=new_start,
             end_time=new_end,
             schedule_id=schedule.id,
         ):
-            raise ValueError("Schedule overlaps with existing availability")
-
-        if schedule_in.start_time is not None:
-            schedule.start_time = schedule_in.start_time
-        if schedule_in.end_time is not None:
-            schedule.end_time = schedule_in.end_time
-        if schedule_in.max_patients is not None:
-            schedule.max_patients = schedule_in.max_patients
-        if schedule_in.is_active is not None:
-            schedule.is_active = schedule_in.is_active
+            raise ValueError(SCHEDULE_OVERLAP_MESSAGE)
+        specialization = self.session.scalar(_specialization_statement(schedule.doctor_id))
+        _apply_schedule_update(schedule, schedule_in)
 
         self.session.add(schedule)
-        self.session.commit()
-        self.session.refresh(schedule)
+        self._commit_schedule()
+        self._availability_changed(schedule.doctor_id, specialization)
         return schedule
 
+    def create_schedules_bulk(
+        self,
+        *,
+        doctor_profile: DoctorProfile,
+        items: Sequence[doctor_schema.DoctorScheduleCreate],
+    ) -> List[Tuple[Optional[DoctorSchedule], Optional[str]]]:
+        """Create many schedules at once, returning ``(schedule, error)`` per input item.
+
+        Items are sorted by start time and swept once: an item is rejected when it
+        overlaps an item accepted earlier in the sweep, or one of the doctor's
+        existing schedules loaded by a single range query over the whole batch.
+        Accepted items are written with one multi-row INSERT ... RETURNING.
+        """
+
+        results: List[Tuple[Optional[DoctorSchedule], Optional[str]]] = [(None, None)] * len(items)
+        order = sorted(range(len(items)), key=lambda index: items[index].start_time)
+
+        existing = self.session.execute(
+            select(DoctorSchedule.start_time, DoctorSchedule.end_time)
+            .where(DoctorSchedule.doctor_id == doctor_profile.id)
+            .where(DoctorSchedule.end_time > items[order[0]].start_time)
+            .where(DoctorSchedule.start_time < max(item.end_time for item in items))
+            .order_by(DoctorSchedule.start_time.asc())
+        ).all()
+
+        accepted: List[int] = []
+        accepted_until: Optional[datetime] = None
+        cursor = 0
+        for index in order:
+            item = items[index]
+            # A doctor's stored schedules never overlap, so ordered by start they
+            # are ordered by end as well and the pointer only moves forward.
+            while cursor < len(existing) and existing[cursor].end_time <= item.start_time:
+                cursor += 1
+            if cursor < len(existing) and existing[cursor].start_time < item.end_time:
+                results[index] = (None, SCHEDULE_OVERLAP_MESSAGE)
+            elif accepted_until is not None and item.start_time < accepted_until:
+                results[index] = (None, BATCH_OVERLAP_MESSAGE)
+            else:
+                accepted.append(index)
+                accepted_until = item.end_time
+
+        if accepted:
+            schedules = self.session.scalars(
+                insert(DoctorSchedule).returning(DoctorSchedule),
+                [
+                    {
+                        "doctor_id": doctor_profile.id,
+                        "start_time": items[index].start_time,
+                        "end_time": items[index].end_time,
+                        "max_patients": items[index].max_patients,
+                        "is_active": items[index].is_active,
+                    }
+                    for index in accepted
+                ],
+            ).all()
+            self._commit_schedule()
+            self._availability_changed(doctor_profile.id, doctor_profile.specialization)
+            # ``accepted`` is in start order and accepted items never overlap, so
+            # sorting the returned rows pairs them up regardless of RETURNING order.
+            for index, schedule in zip(accepted, sorted(schedules, key=lambda row: row.start_time)):
+                results[index] = (schedule, None)
+        return results
+
     def delete_schedule(self, schedule: DoctorSchedule) -> None:
+        specialization = self.session.scalar(_specialization_statement(schedule.doctor_id))
         self.session.delete(schedule)
         self.session.commit()
+        self._availability_changed(schedule.doctor_id, specialization)
 
     def list_schedules(
         self,
@@ -161,25 +382,178 @@ class DoctorService:
         active_only: bool = False,
         upcoming_only: bool = False,
     ) -> List[DoctorSchedule]:
-        query = self.session.query(DoctorSchedule).filter(DoctorSchedule.doctor_id == doctor_profile.id)
-        if active_only:
-            query = query.filter(DoctorSchedule.is_active.is_(True))
-        if upcoming_only:
-            query = query.filter(DoctorSchedule.end_time >= datetime.utcnow())
-        return query.order_by(DoctorSchedule.start_time.asc()).all()
+        statement = _schedules_statement(
+            doctor_profile.id, active_only=active_only, upcoming_only=upcoming_only
+        )
+        return list(self.session.scalars(statement).all())
 
     def get_schedule(self, schedule_id: int) -> Optional[DoctorSchedule]:
         return self.session.get(DoctorSchedule, schedule_id)
 
     def is_schedule_capacity_available(self, schedule: DoctorSchedule) -> bool:
-        booked_count = (
-            self.session.query(func.count(Appointment.id))
-            .filter(Appointment.schedule_id == schedule.id)
-            .filter(Appointment.status != AppointmentStatus.CANCELLED)
-            .scalar()
-            or 0
+        return schedule.booked_count < schedule.max_patients
+
+    # -- Recurring availability rules -------------------------------------------------
+    def create_rule(
+        self,
+        *,
+        doctor_profile: DoctorProfile,
+        rule_in: doctor_schema.DoctorAvailabilityRuleCreate,
+    ) -> DoctorAvailabilityRule:
+        rule = DoctorAvailabilityRule(
+            doctor_id=doctor_profile.id,
+            weekday_mask=_weekday_mask(rule_in.weekdays),
+            start_time=rule_in.start_time,
+            end_time=rule_in.end_time,
+            valid_from=rule_in.valid_from,
+            valid_until=rule_in.valid_until,
+            excluded_dates=sorted({day.isoformat() for day in rule_in.excluded_dates}),
+            max_patients=rule_in.max_patients,
+            is_active=rule_in.is_active,
         )
-        return booked_count < schedule.max_patients
+        self.session.add(rule)
+        self.session.commit()
+        self._availability_changed(doctor_profile.id, doctor_profile.specialization)
+        return rule
+
+    def update_rule(
+        self,
+        *,
+        rule: DoctorAvailabilityRule,
+        rule_in: doctor_schema.DoctorAvailabilityRuleUpdate,
+    ) -> DoctorAvailabilityRule:
+        specialization = self.session.scalar(_specialization_statement(rule.doctor_id))
+        try:
+            _apply_rule_update(rule, rule_in)
+        except ValueError:
+            self.session.rollback()
+            raise
+        self.session.add(rule)
+        self.session.commit()
+        self._availability_changed(rule.doctor_id, specialization)
+        return rule
+
+    def delete_rule(self, rule: DoctorAvailabilityRule) -> None:
+        """Delete a rule; schedules already materialized from it stay bookable."""
+
+        specialization = self.session.scalar(_specialization_statement(rule.doctor_id))
+        self.session.delete(rule)
+        self.session.commit()
+        self._availability_changed(rule.doctor_id, specialization)
+
+    def list_rules(self, *, doctor_profile: DoctorProfile) -> List[DoctorAvailabilityRule]:
+        return (
+            self.session.query(DoctorAvailabilityRule)
+            .filter(DoctorAvailabilityRule.doctor_id == doctor_profile.id)
+            .order_by(DoctorAvailabilityRule.valid_from.asc(), DoctorAvailabilityRule.id.asc())
+            .all()
+        )
+
+    def get_rule(self, rule_id: int) -> Optional[DoctorAvailabilityRule]:
+        return self.session.get(DoctorAvailabilityRule, rule_id)
+
+
+class AsyncDoctorService:
+    """Doctor profile lookups and schedule management for async handlers."""
+
+    def __init__(self, session: AsyncSession, event_bus: Optional[EventBus] = None) -> None:
+        self.session = session
+        self.event_bus = event_bus
+
+    def _availability_changed(self, doctor_profile_id: int, *specializations: Optional[str]) -> None:
+        publish_availability_changed(
+            self.event_bus, doctor_id=doctor_profile_id, specializations=specializations
+        )
+
+    async def get_profile_by_user_id(self, user_id: int) -> Optional[DoctorProfile]:
+        return await self.session.scalar(_profile_by_user_statement(user_id))
+
+    async def _has_schedule_conflict(
+        self,
+        *,
+        doctor_profile_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        schedule_id: Optional[int] = None,
+    ) -> bool:
+        statement = schedule_conflict_check(
+            self.session.get_bind(),
+            doctor_profile_id=doctor_profile_id,
+            start_time=start_time,
+            end_time=end_time,
+            schedule_id=schedule_id,
+        )
+        return statement is not None and (await self.session.scalar(statement) or False)
+
+    async def _commit_schedule(self) -> None:
+        try:
+            await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            if _is_overlap_violation(exc):
+                raise ValueError(SCHEDULE_OVERLAP_MESSAGE) from exc
+            raise
+
+    async def create_schedule(
+        self,
+        *,
+        doctor_profile: DoctorProfile,
+        schedule_in: doctor_schema.DoctorScheduleCreate,
+    ) -> DoctorSchedule:
+        if await self._has_schedule_conflict(
+            doctor_profile_id=doctor_profile.id,
+            start_time=schedule_in.start_time,
+            end_time=schedule_in.end_time,
+        ):
+            raise ValueError(SCHEDULE_OVERLAP_MESSAGE)
+
+        schedule = _new_schedule(doctor_profile, schedule_in)
+        self.session.add(schedule)
+        await self._commit_schedule()
+        self._availability_changed(doctor_profile.id, doctor_profile.specialization)
+        return schedule
+
+    async def update_schedule(
+        self,
+        *,
+        schedule: DoctorSchedule,
+        schedule_in: doctor_schema.DoctorScheduleUpdate,
+    ) -> DoctorSchedule:
+        new_start, new_end = _updated_window(schedule, schedule_in)
+        if await self._has_schedule_conflict(
+            doctor_profile_id=schedule.doctor_id,
+            start_time=new_start,
+            end_time=new_end,
+            schedule_id=schedule.id,
+        ):
+            raise ValueError(SCHEDULE_OVERLAP_MESSAGE)
+        specialization = await self.session.scalar(_specialization_statement(schedule.doctor_id))
+        _apply_schedule_update(schedule, schedule_in)
+
+        await self._commit_schedule()
+        self._availability_changed(schedule.doctor_id, specialization)
+        return schedule
+
+    async def delete_schedule(self, schedule: DoctorSchedule) -> None:
+        specialization = await self.session.scalar(_specialization_statement(schedule.doctor_id))
+        await self.session.delete(schedule)
+        await self.session.commit()
+        self._availability_changed(schedule.doctor_id, specialization)
+
+    async def list_schedules(
+        self,
+        *,
+        doctor_profile: DoctorProfile,
+        active_only: bool = False,
+        upcoming_only: bool = False,
+    ) -> List[DoctorSchedule]:
+        statement = _schedules_statement(
+            doctor_profile.id, active_only=active_only, upcoming_only=upcoming_only
+        )
+        return list((await self.session.scalars(statement)).all())
+
+    async def get_schedule(self, schedule_id: int) -> Optional[DoctorSchedule]:
+        return await self.session.get(DoctorSchedule, schedule_id)
 
 
 def ensure_doctor_user(user: User) -> None:
@@ -1,33 +1,179 @@
 from __future__ import annotations
 
+import enum
+import logging
+import queue
+import threading
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Callable, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from app.schemas.events import DomainEvent
 
+logger = logging.getLogger(__name__)
+
 EventHandler = Callable[[DomainEvent], None]
 
 
+class OverflowPolicy(str, enum.Enum):
+    """What ``publish`` does when the async dispatch queue is full."""
+
+    BLOCK = "block"
+    DROP = "drop"
+    INLINE = "inline"
+
+
 class EventBus:
-    """Simple in-memory event bus for pub/sub style notifications."""
+    """Simple in-memory event bus for pub/sub style notifications.
+
+    By default handlers run inline on the publishing thread. With
+    ``async_dispatch`` enabled and the bus started, events are put on a bounded
+    queue and delivered by worker threads in batches; a failing handler is logged
+    without affecting the publisher or the other handlers. Handlers subscribed
+    with ``inline=True`` always run on the publishing thread before ``publish``
+    returns, for subscribers that must observe an event before the publisher
+    moves on (e.g. cache invalidation).
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        async_dispatch: bool = False,
+        max_queue_size: int = 10_000,
+        worker_count: int = 1,
+        batch_size: int = 100,
+        overflow_policy: OverflowPolicy = OverflowPolicy.INLINE,
+        block_timeout: float = 1.0,
+    ) -> None:
         self._subscribers: Dict[str, List[EventHandler]] = defaultdict(list)
+        self._inline_subscribers: Dict[str, List[EventHandler]] = defaultdict(list)
+        self.async_dispatch = async_dispatch
+        self.worker_count = worker_count
+        self.batch_size = batch_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+        self._queue: "queue.Queue[Optional[DomainEvent]]" = queue.Queue(maxsize=max_queue_size)
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._lock = threading.Lock()
+        self._stats = {"published": 0, "dispatched": 0, "dropped": 0, "handler_errors": 0}
 
-    def subscribe(self, event_name: str, handler: EventHandler) -> None:
-        if handler not in self._subscribers[event_name]:
-            self._subscribers[event_name].append(handler)
+    def subscribe(self, event_name: str, handler: EventHandler, *, inline: bool = False) -> None:
+        subscribers = self._inline_subscribers if inline else self._subscribers
+        if handler not in subscribers[event_name]:
+            subscribers[event_name].append(handler)
 
     def unsubscribe(self, event_name: str, handler: EventHandler) -> None:
-        if handler in self._subscribers.get(event_name, []):
-            self._subscribers[event_name].remove(handler)
+        for subscribers in (self._subscribers, self._inline_subscribers):
+            if handler in subscribers.get(event_name, []):
+                subscribers[event_name].remove(handler)
 
     def publish(self, event_name: str, payload: Dict[str, Any]) -> DomainEvent:
         event = DomainEvent(name=event_name, payload=payload, occurred_at=datetime.utcnow())
-        for handler in list(self._subscribers.get(event_name, [])):
+        self._increment("published")
+        for handler in list(self._inline_subscribers.get(event_name, [])):
             handler(event)
+        if not self._running:
+            for handler in list(self._subscribers.get(event_name, [])):
+                handler(event)
+            return event
+
+        if self.overflow_policy == OverflowPolicy.BLOCK:
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+                return event
+            except queue.Full:
+                pass
+        else:
+            try:
+                self._queue.put_nowait(event)
+                return event
+            except queue.Full:
+                pass
+
+        if self.overflow_policy == OverflowPolicy.INLINE:
+            self._deliver(event)
+        else:
+            self._increment("dropped")
+            logger.warning("Event queue full, dropping %s event", event_name)
         return event
 
     def subscribers(self, event_name: str) -> Iterable[EventHandler]:
-        return tuple(self._subscribers.get(event_name, []))
+        return tuple(self._inline_subscribers.get(event_name, [])) + tuple(self._subscribers.get(event_name, []))
+
+    # -- Async dispatch ----------------------------------------------------------------
+    def start(self) -> None:
+        """Start the dispatch workers when async dispatch is enabled."""
+
+        if not self.async_dispatch or self._running:
+            return
+        self._running = True
+        self._workers = [
+            threading.Thread(target=self._work, name=f"event-bus-{index}", daemon=True)
+            for index in range(self.worker_count)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def flush(self) -> None:
+        """Block until every queued event has been delivered."""
+
+        self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Deliver the queued events, stop the workers and fall back to inline dispatch."""
+
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        # Events enqueued while the workers were stopping are delivered inline.
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not None:
+                self._deliver(event)
+            self._queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["queued"] = self._queue.qsize()
+        return snapshot
+
+    def _increment(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _deliver(self, event: DomainEvent) -> None:
+        for handler in list(self._subscribers.get(event.name, [])):
+            try:
+                handler(event)
+            except Exception:
+                self._increment("handler_errors")
+                logger.exception("Event handler %r failed for %s", handler, event.name)
+        self._increment("dispatched")
+
+    def _work(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for event in batch:
+                if event is None:
+                    stop = True
+                else:
+                    self._deliver(event)
+                self._queue.task_done()
+            if stop:
+                return
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Optional
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.routing import replica_reads
 from app.models.lab_result import LabResult
 from app.schemas import lab_result as lab_result_schema
 from app.services.event_bus import EventBus
+from app.services.pagination import KeysetPage, paginate_descending, paginate_descending_async
+
+
+def _new_lab_result(lab_in: lab_result_schema.LabResultCreate) -> LabResult:
+    return LabResult(
+        patient_id=lab_in.patient_id,
+        test_name=lab_in.test_name,
+        result_data=lab_in.result_data,
+        recorded_at=lab_in.recorded_at,
+    )
+
+
+def _publish_created(event_bus: EventBus, lab_result: LabResult) -> None:
+    event_bus.publish(
+        "lab_result.created",
+        {
+            "lab_result_id": lab_result.id,
+            "patient_id": lab_result.patient_id,
+            "test_name": lab_result.test_name,
+        },
+    )
+
+
+def _patient_results_statement(patient_id: int) -> Select:
+    return select(LabResult).where(LabResult.patient_id == patient_id)
 
 
 class LabResultService:
@@ -15,30 +43,56 @@ class LabResultService:
         self.event_bus = event_bus
 
     def create(self, lab_in: lab_result_schema.LabResultCreate) -> LabResult:
-        lab_result = LabResult(
-            patient_id=lab_in.patient_id,
-            test_name=lab_in.test_name,
-            result_data=lab_in.result_data,
-            recorded_at=lab_in.recorded_at,
-        )
+        lab_result = _new_lab_result(lab_in)
         self.session.add(lab_result)
         self.session.commit()
-        self.session.refresh(lab_result)
-
-        self.event_bus.publish(
-            "lab_result.created",
-            {
-                "lab_result_id": lab_result.id,
-                "patient_id": lab_result.patient_id,
-                "test_name": lab_result.test_name,
-            },
-        )
+        _publish_created(self.event_bus, lab_result)
+        return lab_result
+
+    def list_for_patient(
+        self,
+        patient_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[LabResult]:
+        with replica_reads(self.session):
+            return paginate_descending(
+                self.session,
+                _patient_results_statement(patient_id),
+                sort_column=LabResult.recorded_at,
+                id_column=LabResult.id,
+                cursor=cursor,
+                limit=limit,
+            )
+
+
+class AsyncLabResultService:
+    """``LabResultService`` for async handlers running on an ``AsyncSession``."""
+
+    def __init__(self, session: AsyncSession, event_bus: EventBus) -> None:
+        self.session = session
+        self.event_bus = event_bus
+
+    async def create(self, lab_in: lab_result_schema.LabResultCreate) -> LabResult:
+        lab_result = _new_lab_result(lab_in)
+        self.session.add(lab_result)
+        await self.session.commit()
+        _publish_created(self.event_bus, lab_result)
         return lab_result
 
-    def list_for_patient(self, patient_id: int) -> List[LabResult]:
-        return (
-            self.session.query(LabResult)
-            .filter(LabResult.patient_id == patient_id)
-            .order_by(LabResult.recorded_at.desc())
-            .all()
+    async def list_for_patient(
+        self,
+        patient_id: int,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> KeysetPage[LabResult]:
+        return await paginate_descending_async(
+            self.session,
+            _patient_results_statement(patient_id),
+            sort_column=LabResult.recorded_at,
+            id_column=LabResult.id,
+            cursor=cursor,
+            limit=limit,
         )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import typing
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Return the Pydantic model wrapped by ``annotation`` (``Optional[X]``, ``list[X]``...)."""
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for argument in typing.get_args(annotation):
+        nested = _nested_schema(argument)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _build_options(
+    model: type, schema: Type[BaseModel], path: Tuple[Tuple[type, type], ...]
+) -> Tuple[LoaderOption, ...]:
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.model_fields.items():
+        relationship = relationships.get(name)
+        if relationship is None:
+            continue
+        nested_schema = _nested_schema(field.annotation)
+        if nested_schema is None:
+            continue
+        target = relationship.mapper.class_
+        if (target, nested_schema) in path:
+            continue
+
+        attribute = getattr(model, name)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        nested = _build_options(target, nested_schema, path + ((target, nested_schema),))
+        if nested:
+            loader = loader.options(*nested)
+        options.append(loader)
+    return tuple(options)
+
+
+@lru_cache(maxsize=None)
+def loader_options_for(model: type, schema: Type[BaseModel]) -> Tuple[LoaderOption, ...]:
+    """Derive eager-loading options for ``model`` from the response ``schema``.
+
+    Every schema field that is backed by a relationship and serialized as a nested
+    model is loaded up front: scalar relationships with ``joinedload`` and
+    collections with ``selectinload``, recursively. Serializing the result then
+    issues no lazy loads.
+    """
+
+    return _build_options(model, schema, ((model, schema),))
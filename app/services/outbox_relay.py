@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxMessage, OutboxMessageKind
+from app.services.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+TaskDispatcher = Callable[[Dict[str, Any]], None]
+BatchTaskDispatcher = Callable[[List[Dict[str, Any]]], None]
+
+
+def _dispatch_schedule_appointment(payload: Dict[str, Any]) -> None:
+    from app.tasks import appointment_tasks
+    from app.tasks.executors import task_executor
+
+    task_executor.submit(
+        appointment_tasks.schedule_appointment_task,
+        payload["appointment_id"],
+        payload.get("task_record_id"),
+        payload.get("idempotency_key"),
+    )
+
+
+def _dispatch_schedule_appointments(payloads: List[Dict[str, Any]]) -> None:
+    from app.tasks import appointment_tasks
+    from app.tasks.executors import task_executor
+
+    batch = [payload for payload in payloads if "task_record_id" in payload]
+    if batch:
+        task_executor.submit(appointment_tasks.confirm_appointments_batch_task, batch)
+    # Messages staged before task record ids were included go out one by one.
+    for payload in payloads:
+        if "task_record_id" not in payload:
+            _dispatch_schedule_appointment(payload)
+
+
+DEFAULT_TASK_DISPATCHERS: Dict[str, TaskDispatcher] = {
+    "schedule_appointment": _dispatch_schedule_appointment,
+}
+
+DEFAULT_BATCH_TASK_DISPATCHERS: Dict[str, BatchTaskDispatcher] = {
+    "schedule_appointment": _dispatch_schedule_appointments,
+}
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for ``reset_timeout`` seconds.
+
+    The circuit opens after ``failure_threshold`` consecutive failures. Once the
+    timeout has elapsed a single trial call is let through; its outcome closes
+    the circuit or opens it again.
+    """
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures}
+
+
+class OutboxRelay:
+    """Forward committed outbox messages to the task executor and to the event bus.
+
+    Messages are claimed in id order with ``SKIP LOCKED`` so several API processes
+    can relay concurrently. Delivery is at-least-once: a message is only marked as
+    dispatched once its handler returned. A failed message is retried after an
+    exponential backoff (``retry_base_delay`` doubling up to ``retry_max_delay``).
+
+    Task dispatch goes through a :class:`CircuitBreaker`: while the broker keeps
+    failing, task messages stay in the outbox and only events are relayed, so a
+    slow broker never blocks booking requests or event delivery.
+
+    With ``task_batch_size`` above one, task messages that have a batch dispatcher
+    are grouped into chunks of up to that many and sent as a single task.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        event_bus: EventBus,
+        *,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        task_dispatchers: Optional[Mapping[str, TaskDispatcher]] = None,
+        batch_task_dispatchers: Optional[Mapping[str, BatchTaskDispatcher]] = None,
+        task_batch_size: int = 1,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 300.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.event_bus = event_bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.task_dispatchers = dict(
+            DEFAULT_TASK_DISPATCHERS if task_dispatchers is None else task_dispatchers
+        )
+        self.batch_task_dispatchers = dict(
+            DEFAULT_BATCH_TASK_DISPATCHERS if batch_task_dispatchers is None else batch_task_dispatchers
+        )
+        self.task_batch_size = task_batch_size
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"dispatched": 0, "failed": 0, "deferred_by_breaker": 0}
+
+    def _increment(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _record_failure(self, message: OutboxMessage, exc: Exception) -> None:
+        message.attempts += 1
+        message.last_error = str(exc)[:255]
+        delay = min(self.retry_base_delay * 2 ** (message.attempts - 1), self.retry_max_delay)
+        message.available_at = datetime.utcnow() + timedelta(seconds=delay)
+        self._increment("failed")
+
+    def _dispatch_task(self, dispatch: Callable[[], None]) -> bool:
+        """Run a task dispatch through the breaker; ``False`` means it was deferred."""
+
+        if not self.breaker.allow():
+            return False
+        try:
+            dispatch()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return True
+
+    def _dispatch(self, message: OutboxMessage) -> bool:
+        if message.kind == OutboxMessageKind.EVENT:
+            self.event_bus.publish(message.name, message.payload)
+            return True
+        dispatcher = self.task_dispatchers.get(message.name)
+        if dispatcher is None:
+            raise LookupError(f"No dispatcher registered for task {message.name!r}")
+        return self._dispatch_task(lambda: dispatcher(message.payload))
+
+    def _is_batched(self, message: OutboxMessage) -> bool:
+        return (
+            self.task_batch_size > 1
+            and message.kind == OutboxMessageKind.TASK
+            and message.name in self.batch_task_dispatchers
+        )
+
+    def _dispatch_batches(self, messages: List[OutboxMessage]) -> List[OutboxMessage]:
+        """Send batched task messages in chunks and return the ones that were sent."""
+
+        by_name: Dict[str, List[OutboxMessage]] = {}
+        for message in messages:
+            by_name.setdefault(message.name, []).append(message)
+
+        sent: List[OutboxMessage] = []
+        for name, grouped in by_name.items():
+            dispatcher = self.batch_task_dispatchers[name]
+            for start in range(0, len(grouped), self.task_batch_size):
+                chunk = grouped[start : start + self.task_batch_size]
+                payloads = [message.payload for message in chunk]
+                try:
+                    if not self._dispatch_task(lambda: dispatcher(payloads)):
+                        self._increment("deferred_by_breaker", len(chunk))
+                        continue
+                except Exception as exc:
+                    for message in chunk:
+                        self._record_failure(message, exc)
+                    logger.exception("Failed to relay %s batched %s messages", len(chunk), name)
+                    continue
+                sent.extend(chunk)
+        return sent
+
+    def relay_pending(self) -> int:
+        """Dispatch one batch of due messages and return how many were sent."""
+
+        session = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            query = (
+                session.query(OutboxMessage)
+                .filter(OutboxMessage.dispatched_at.is_(None))
+                .filter(or_(OutboxMessage.available_at.is_(None), OutboxMessage.available_at <= now))
+            )
+            if self.breaker.state == "open":
+                # Leave task messages where they are while the broker is failing.
+                query = query.filter(OutboxMessage.kind == OutboxMessageKind.EVENT)
+            messages = (
+                query.order_by(OutboxMessage.id.asc())
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            dispatched = 0
+            batched = [message for message in messages if self._is_batched(message)]
+            for message in self._dispatch_batches(batched):
+                message.dispatched_at = datetime.utcnow()
+                dispatched += 1
+            for message in messages:
+                if message in batched:
+                    continue
+                try:
+                    if not self._dispatch(message):
+                        self._increment("deferred_by_breaker")
+                        continue
+                except Exception as exc:
+                    self._record_failure(message, exc)
+                    logger.exception("Failed to relay outbox message %s", message.id)
+                    continue
+                message.dispatched_at = datetime.utcnow()
+                dispatched += 1
+            session.commit()
+            self._increment("dispatched", dispatched)
+            return dispatched
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def pending_count(self) -> int:
+        """Number of messages not yet dispatched, including ones waiting for a retry."""
+
+        session = self.session_factory()
+        try:
+            return session.scalar(
+                select(func.count()).select_from(OutboxMessage).where(OutboxMessage.dispatched_at.is_(None))
+            ) or 0
+        finally:
+            session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+        snapshot["pending"] = self.pending_count()
+        snapshot["breaker"] = self.breaker.stats()
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                dispatched = self.relay_pending()
+            except Exception:  # pragma: no cover - keep relaying after transient failures
+                logger.exception("Outbox relay iteration failed")
+                dispatched = 0
+            if dispatched < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the relay thread and drain whatever is still pending."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            while self.relay_pending() >= self.batch_size:
+                pass
+        except Exception:  # pragma: no cover - best effort during shutdown
+            logger.exception("Failed to drain outbox during shutdown")
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+
+def _page_statement(
+    statement: Select,
+    *,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> Select:
+    """Order ``statement`` for the page, resume after ``cursor`` and fetch one extra row."""
+
+    statement = statement.order_by(sort_column.desc(), id_column.desc())
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def _page_from_rows(
+    rows: List[T], *, sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, limit: Optional[int]
+) -> KeysetPage[T]:
+    if limit is None or len(rows) <= limit:
+        return KeysetPage(items=rows)
+    items = rows[:limit]
+    last = items[-1]
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key)),
+    )
+
+
+def paginate_descending(
+    session: Session,
+    statement: Select,
+    *,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> KeysetPage:
+    """Return one page of ``statement`` ordered by ``(sort_column, id_column)`` descending.
+
+    The cursor encodes the last row of the previous page, so every page is a
+    bounded index range scan instead of an ``OFFSET``. Without a ``limit`` every
+    remaining row is returned.
+    """
+
+    page_statement = _page_statement(
+        statement, sort_column=sort_column, id_column=id_column, cursor=cursor, limit=limit
+    )
+    rows = list(session.scalars(page_statement).all())
+    return _page_from_rows(rows, sort_column=sort_column, id_column=id_column, limit=limit)
+
+
+async def paginate_descending_async(
+    session: AsyncSession,
+    statement: Select,
+    *,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> KeysetPage:
+    """Async counterpart of :func:`paginate_descending`."""
+
+    page_statement = _page_statement(
+        statement, sort_column=sort_column, id_column=id_column, cursor=cursor, limit=limit
+    )
+    rows = list((await session.scalars(page_statement)).all())
+    return _page_from_rows(rows, sort_column=sort_column, id_column=id_column, limit=limit)
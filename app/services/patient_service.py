@@ -1,12 +1,235 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional
+import heapq
+from contextlib import nullcontext
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import DoctorProfile, DoctorSchedule, PatientProfile, User, UserRole
+from app.core.principal_cache import principal_cache
+from app.db.routing import replica_reads
+from app.models import (
+    Appointment,
+    AppointmentStatus,
+    DoctorAvailabilityRule,
+    DoctorProfile,
+    DoctorSchedule,
+    PatientProfile,
+    User,
+    UserRole,
+)
 from app.schemas import patient as patient_schema
+from app.services.loading import loader_options_for
+from app.services.recurrence import (
+    RuleOccurrence,
+    ScheduleWindows,
+    as_naive_utc,
+    blocking_windows_start,
+    expand_rules,
+    expansion_end,
+)
+from app.services.slot_engine import FreeSlot, compute_free_slots
+
+DoctorAvailabilityEntry = Tuple[DoctorProfile, List[DoctorSchedule], List[RuleOccurrence]]
+
+# Earliest-available search also returns windows already in progress, as long as
+# they started within this look-back; it bounds the ordered scan on start_time.
+IN_PROGRESS_LOOKBACK = timedelta(hours=24)
+
+
+@dataclass(frozen=True)
+class BookableOption:
+    """One bookable window: a schedule with spare capacity or a rule occurrence."""
+
+    doctor_id: int
+    available_from: datetime
+    start_time: datetime
+    end_time: datetime
+    remaining_capacity: int
+    schedule_id: Optional[int] = None
+    rule_id: Optional[int] = None
+
+    @classmethod
+    def from_schedule(cls, schedule: DoctorSchedule, *, earliest: datetime) -> "BookableOption":
+        return cls(
+            doctor_id=schedule.doctor_id,
+            available_from=max(schedule.start_time, earliest),
+            start_time=schedule.start_time,
+            end_time=schedule.end_time,
+            remaining_capacity=schedule.max_patients - schedule.booked_count,
+            schedule_id=schedule.id,
+        )
+
+    @classmethod
+    def from_occurrence(cls, occurrence: RuleOccurrence, *, earliest: datetime) -> "BookableOption":
+        return cls(
+            doctor_id=occurrence.doctor_id,
+            available_from=max(occurrence.start_time, earliest),
+            start_time=occurrence.start_time,
+            end_time=occurrence.end_time,
+            remaining_capacity=occurrence.max_patients,
+            rule_id=occurrence.rule_id,
+        )
+
+
+def _rules_statement(profile_ids, *, earliest: datetime, latest: datetime) -> Select:
+    return (
+        select(DoctorAvailabilityRule)
+        .where(DoctorAvailabilityRule.doctor_id.in_(profile_ids))
+        .where(DoctorAvailabilityRule.is_active.is_(True))
+        .where(DoctorAvailabilityRule.valid_from <= latest.date())
+        .where(
+            or_(
+                DoctorAvailabilityRule.valid_until.is_(None),
+                DoctorAvailabilityRule.valid_until >= earliest.date(),
+            )
+        )
+        .order_by(DoctorAvailabilityRule.id.asc())
+    )
+
+
+def _blocking_windows_statement(profile_ids, *, earliest: datetime, latest: datetime) -> Select:
+    """Windows of every schedule, active or not, that can overlap occurrences expanded over the range."""
+
+    return (
+        select(DoctorSchedule.doctor_id, DoctorSchedule.start_time, DoctorSchedule.end_time)
+        .where(DoctorSchedule.doctor_id.in_(profile_ids))
+        .where(DoctorSchedule.end_time > blocking_windows_start(earliest))
+        .where(DoctorSchedule.start_time < latest)
+    )
+
+
+def _available_profiles_statement(specialization: Optional[str]) -> Select:
+    statement = (
+        select(DoctorProfile)
+        .join(DoctorProfile.user)
+        .options(contains_eager(DoctorProfile.user))
+        .where(User.is_active.is_(True))
+    )
+    if specialization:
+        statement = statement.where(DoctorProfile.specialization.ilike(f"%{specialization}%"))
+    return statement
+
+
+def _doctor_profile_by_user_statement(user_id: int) -> Select:
+    return select(DoctorProfile).where(DoctorProfile.user_id == user_id)
+
+
+def _availability_schedules_statement(
+    profile_ids, *, earliest: Optional[datetime], latest: Optional[datetime]
+) -> Select:
+    """Every schedule of the doctors in the window, inactive ones included (see ``_group_availability``)."""
+
+    statement = select(DoctorSchedule).where(DoctorSchedule.doctor_id.in_(profile_ids))
+    if earliest is not None:
+        statement = statement.where(DoctorSchedule.end_time >= earliest)
+    if latest is not None:
+        statement = statement.where(DoctorSchedule.start_time <= latest)
+    return statement.order_by(DoctorSchedule.start_time.asc())
+
+
+def _active_schedules_statement(
+    doctor_profile_id: Optional[int], *, earliest: Optional[datetime], latest: Optional[datetime]
+) -> Select:
+    statement = (
+        select(DoctorSchedule)
+        .join(DoctorSchedule.doctor_profile)
+        .join(DoctorProfile.user)
+        .where(DoctorSchedule.is_active.is_(True))
+        .where(User.is_active.is_(True))
+    )
+    if doctor_profile_id is not None:
+        statement = statement.where(DoctorSchedule.doctor_id == doctor_profile_id)
+    if earliest is not None:
+        statement = statement.where(DoctorSchedule.end_time >= earliest)
+    if latest is not None:
+        statement = statement.where(DoctorSchedule.start_time <= latest)
+    return statement.order_by(DoctorSchedule.start_time.asc())
+
+
+def _slot_windows_statement(profile_ids, *, earliest: datetime, latest: Optional[datetime]) -> Select:
+    """Schedule columns the slot engine needs, without building ORM objects."""
+
+    statement = (
+        select(
+            DoctorSchedule.id,
+            DoctorSchedule.doctor_id,
+            DoctorSchedule.start_time,
+            DoctorSchedule.end_time,
+            DoctorSchedule.max_patients,
+            DoctorSchedule.booked_count,
+            DoctorSchedule.is_active,
+            DoctorSchedule.rule_id,
+        )
+        .where(DoctorSchedule.doctor_id.in_(profile_ids))
+        .where(DoctorSchedule.end_time >= earliest)
+    )
+    if latest is not None:
+        statement = statement.where(DoctorSchedule.start_time <= latest)
+    return statement.order_by(DoctorSchedule.start_time.asc())
+
+
+def _slot_bookings_statement(profile_ids, *, earliest: datetime, latest: Optional[datetime]) -> Select:
+    statement = (
+        select(Appointment.schedule_id, Appointment.scheduled_time)
+        .join(DoctorSchedule, Appointment.schedule_id == DoctorSchedule.id)
+        .where(DoctorSchedule.doctor_id.in_(profile_ids))
+        .where(DoctorSchedule.is_active.is_(True))
+        .where(DoctorSchedule.end_time >= earliest)
+        .where(Appointment.status != AppointmentStatus.CANCELLED)
+    )
+    if latest is not None:
+        statement = statement.where(DoctorSchedule.start_time <= latest)
+    return statement
+
+
+def _group_availability(
+    profiles: Iterable[DoctorProfile],
+    schedules: Sequence[DoctorSchedule],
+    rules: Iterable[DoctorAvailabilityRule],
+    *,
+    earliest: datetime,
+    latest: Optional[datetime],
+) -> List[DoctorAvailabilityEntry]:
+    """Group schedules and rule occurrences per doctor.
+
+    ``schedules`` include inactive ones: they are not listed but still suppress
+    the rule occurrences they overlap.
+    """
+
+    schedules_by_doctor: Dict[int, List[DoctorSchedule]] = defaultdict(list)
+    for schedule in schedules:
+        if schedule.is_active:
+            schedules_by_doctor[schedule.doctor_id].append(schedule)
+    blocked = ScheduleWindows(
+        (schedule.doctor_id, schedule.start_time, schedule.end_time) for schedule in schedules
+    )
+
+    rules_by_doctor: Dict[int, List[DoctorAvailabilityRule]] = defaultdict(list)
+    for rule in rules:
+        rules_by_doctor[rule.doctor_id].append(rule)
+
+    until = expansion_end(earliest, latest)
+    availability: List[DoctorAvailabilityEntry] = []
+    for profile in profiles:
+        occurrences = list(
+            expand_rules(
+                rules_by_doctor.get(profile.id, ()),
+                earliest=earliest,
+                latest=until,
+                blocked=blocked,
+            )
+        )
+        if profile.id in schedules_by_doctor or occurrences:
+            availability.append((profile, schedules_by_doctor[profile.id], occurrences))
+    return availability
 
 
 class PatientService:
@@ -18,10 +241,10 @@ class PatientService:
         return self.session.get(PatientProfile, patient_id)
 
     def get_profile_by_user_id(self, user_id: int) -> Optional[PatientProfile]:
-        return (
-            self.session.query(PatientProfile)
-            .filter(PatientProfile.user_id == user_id)
-            .one_or_none()
+        return self.session.scalar(
+            select(PatientProfile)
+            .options(*loader_options_for(PatientProfile, patient_schema.PatientProfilePublic))
+            .where(PatientProfile.user_id == user_id)
         )
 
     def create_profile(self, profile_in: patient_schema.PatientProfileCreate) -> PatientProfile:
@@ -30,11 +253,9 @@ class PatientService:
             raise ValueError("User does not exist")
         if user.role not in {UserRole.PATIENT, UserRole.SUPERADMIN, UserRole.ADMIN}:
             raise ValueError("User must have patient-capable role")
-        existing = self.get_profile_by_user_id(profile_in.user_id)
-        if existing:
-            raise ValueError("Patient profile already exists for this user")
 
-        if user.role != UserRole.PATIENT:
+        role_changed = user.role != UserRole.PATIENT
+        if role_changed:
             user.role = UserRole.PATIENT
 
         profile = PatientProfile(
@@ -46,9 +267,17 @@ class PatientService:
             emergency_contact=profile_in.emergency_contact,
         )
         self.session.add(profile)
-        self.session.add(user)
-        self.session.commit()
-        self.session.refresh(profile)
+        try:
+            self.session.commit()
+        except IntegrityError as exc:
+            # ``patient_profiles.user_id`` is unique: the user already has a profile.
+            self.session.rollback()
+            raise ValueError("Patient profile already exists for this user") from exc
+        # Attach the loaded user without touching its one-to-one backref, so the
+        # response embeds it instead of loading it again.
+        set_committed_value(profile, "user", user)
+        if role_changed:
+            principal_cache.invalidate(user.id)
         return profile
 
     def update_profile(
@@ -66,7 +295,6 @@ class PatientService:
             profile.emergency_contact = profile_in.emergency_contact
         self.session.add(profile)
         self.session.commit()
-        self.session.refresh(profile)
         return profile
 
     # -- Discover doctors & availability -------------------------------------------
@@ -80,12 +308,51 @@ class PatientService:
             query = query.filter(DoctorProfile.specialization.ilike(f"%{specialization}%"))
         return query.order_by(DoctorProfile.specialization.asc(), DoctorProfile.id.asc()).all()
 
+    def list_doctor_availability(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+        from_replica: bool = True,
+    ) -> List[DoctorAvailabilityEntry]:
+        """Return active doctors with their active schedules and rule occurrences in the window.
+
+        Runs a fixed three queries (profiles with users, matching schedules, matching
+        availability rules) regardless of the number of doctors. Rule occurrences are
+        expanded only over the window, up to ``DEFAULT_EXPANSION_HORIZON`` when no
+        ``latest`` is given; doctors with neither schedules nor occurrences are omitted.
+        Pass ``from_replica=False`` when the result must reflect every committed
+        booking, e.g. when it is about to be cached.
+        """
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        window_start = earliest or datetime.utcnow()
+        with replica_reads(self.session) if from_replica else nullcontext(self.session):
+            profiles_statement = _available_profiles_statement(specialization)
+            profiles = self.session.scalars(
+                profiles_statement.order_by(DoctorProfile.specialization.asc(), DoctorProfile.id.asc())
+            ).all()
+            if not profiles:
+                return []
+
+            profile_ids = profiles_statement.with_only_columns(DoctorProfile.id).scalar_subquery()
+            schedules = self.session.scalars(
+                _availability_schedules_statement(profile_ids, earliest=earliest, latest=latest)
+            ).all()
+
+            rules = self.session.scalars(
+                _rules_statement(
+                    profile_ids,
+                    earliest=window_start,
+                    latest=expansion_end(window_start, latest),
+                )
+            ).all()
+
+            return _group_availability(profiles, schedules, rules, earliest=window_start, latest=latest)
+
     def get_doctor_profile_by_user_id(self, user_id: int) -> Optional[DoctorProfile]:
-        return (
-            self.session.query(DoctorProfile)
-            .filter(DoctorProfile.user_id == user_id)
-            .one_or_none()
-        )
+        return self.session.scalar(_doctor_profile_by_user_statement(user_id))
 
     def list_active_schedules(
         self,
@@ -94,20 +361,377 @@ class PatientService:
         earliest: Optional[datetime] = None,
         latest: Optional[datetime] = None,
     ) -> List[DoctorSchedule]:
-        query = (
-            self.session.query(DoctorSchedule)
-            .join(DoctorSchedule.doctor_profile)
-            .join(DoctorProfile.user)
-            .filter(DoctorSchedule.is_active.is_(True))
-            .filter(User.is_active.is_(True))
+        statement = _active_schedules_statement(doctor_profile_id, earliest=earliest, latest=latest)
+        with replica_reads(self.session):
+            return list(self.session.scalars(statement).all())
+
+    def list_rule_occurrences(
+        self,
+        *,
+        doctor_profile_id: int,
+        earliest: datetime,
+        latest: Optional[datetime] = None,
+    ) -> List[RuleOccurrence]:
+        """Bookable occurrences of the doctor's active rules in the window, in start order."""
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        until = expansion_end(earliest, latest)
+        with replica_reads(self.session):
+            rules = self.session.scalars(
+                _rules_statement([doctor_profile_id], earliest=earliest, latest=until)
+            ).all()
+            if not rules:
+                return []
+            blocked = ScheduleWindows(
+                self.session.execute(
+                    _blocking_windows_statement([doctor_profile_id], earliest=earliest, latest=until)
+                )
+            )
+        return list(expand_rules(rules, earliest=earliest, latest=until, blocked=blocked))
+
+    def _bookable_schedules(
+        self,
+        specialization: Optional[str],
+        *,
+        earliest: datetime,
+        latest: Optional[datetime],
+        page_size: int,
+        skip_doctors: Set[int],
+    ) -> Iterator[BookableOption]:
+        """Stream schedules with spare capacity in ``start_time`` order, a page at a time.
+
+        Each page is a keyset range scan on ``start_time`` that stops after
+        ``page_size`` rows; doctors in ``skip_doctors`` (read again for every
+        page) are left out of later pages.
+        """
+
+        # The doctor filter is a correlated EXISTS rather than ``doctor_id IN``: an
+        # IN list lets the planner drive the per-doctor window index and sort every
+        # future schedule, instead of walking the start_time index up to LIMIT.
+        listed = (
+            _available_profiles_statement(specialization)
+            .with_only_columns(DoctorProfile.id)
+            .where(DoctorProfile.id == DoctorSchedule.doctor_id)
+            .exists()
+        )
+        statement = (
+            select(DoctorSchedule)
+            .where(listed)
+            .where(DoctorSchedule.is_active)
+            .where(DoctorSchedule.start_time >= earliest - IN_PROGRESS_LOOKBACK)
+            .where(DoctorSchedule.end_time > earliest)
+            .where(DoctorSchedule.booked_count < DoctorSchedule.max_patients)
+            .order_by(DoctorSchedule.start_time.asc(), DoctorSchedule.id.asc())
+            .limit(page_size)
         )
-        if doctor_profile_id is not None:
-            query = query.filter(DoctorSchedule.doctor_id == doctor_profile_id)
-        if earliest is not None:
-            query = query.filter(DoctorSchedule.end_time >= earliest)
         if latest is not None:
-            query = query.filter(DoctorSchedule.start_time <= latest)
-        return query.order_by(DoctorSchedule.start_time.asc()).all()
+            statement = statement.where(DoctorSchedule.start_time <= latest)
+
+        after: Optional[Tuple[datetime, int]] = None
+        while True:
+            page_statement = statement
+            if after is not None:
+                page_statement = page_statement.where(
+                    tuple_(DoctorSchedule.start_time, DoctorSchedule.id) > tuple_(*after)
+                )
+            if skip_doctors:
+                page_statement = page_statement.where(DoctorSchedule.doctor_id.notin_(skip_doctors))
+            page = self.session.scalars(page_statement).all()
+            for schedule in page:
+                yield BookableOption.from_schedule(schedule, earliest=earliest)
+            if len(page) < page_size:
+                return
+            after = (page[-1].start_time, page[-1].id)
+
+    def find_earliest_available(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+        limit: int = 10,
+        per_doctor: int = 1,
+    ) -> List[Tuple[DoctorProfile, BookableOption]]:
+        """The ``limit`` earliest bookable windows, at most ``per_doctor`` per doctor.
+
+        Schedules with spare capacity are read as one ``start_time``-ordered
+        stream and heap-merged with the lazily expanded rule occurrences, so the
+        search stops as soon as ``limit`` options are found instead of loading
+        every schedule.
+        """
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        window_start = earliest or datetime.utcnow()
+        until = expansion_end(window_start, latest)
+        with replica_reads(self.session):
+            profile_ids = (
+                _available_profiles_statement(specialization)
+                .with_only_columns(DoctorProfile.id)
+                .scalar_subquery()
+            )
+            rules = self.session.scalars(
+                _rules_statement(profile_ids, earliest=window_start, latest=until)
+            ).all()
+            blocked = ScheduleWindows()
+            if rules:
+                blocked = ScheduleWindows(
+                    self.session.execute(
+                        _blocking_windows_statement(
+                            {rule.doctor_id for rule in rules}, earliest=window_start, latest=until
+                        )
+                    )
+                )
+
+            full_doctors: Set[int] = set()
+            options = heapq.merge(
+                self._bookable_schedules(
+                    specialization,
+                    earliest=window_start,
+                    latest=latest,
+                    page_size=max(limit * per_doctor, 25),
+                    skip_doctors=full_doctors,
+                ),
+                (
+                    BookableOption.from_occurrence(occurrence, earliest=window_start)
+                    for occurrence in expand_rules(
+                        rules, earliest=window_start, latest=until, blocked=blocked
+                    )
+                ),
+                key=lambda option: option.start_time,
+            )
+
+            picked: List[BookableOption] = []
+            per_doctor_count: Counter = Counter()
+            for option in options:
+                if option.doctor_id in full_doctors:
+                    continue
+                picked.append(option)
+                per_doctor_count[option.doctor_id] += 1
+                if per_doctor_count[option.doctor_id] >= per_doctor:
+                    full_doctors.add(option.doctor_id)
+                if len(picked) >= limit:
+                    break
+            if not picked:
+                return []
+
+            profiles = {
+                profile.id: profile
+                for profile in self.session.scalars(
+                    _available_profiles_statement(None).where(
+                        DoctorProfile.id.in_({option.doctor_id for option in picked})
+                    )
+                )
+            }
+        # A doctor deactivated since the stream read is left out rather than failing.
+        return [(profiles[option.doctor_id], option) for option in picked if option.doctor_id in profiles]
+
+    def list_free_slots(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+        slot_length: timedelta = timedelta(minutes=30),
+        per_doctor: int = 20,
+    ) -> List[Tuple[DoctorProfile, List[FreeSlot]]]:
+        """Free fixed-length slots per doctor, computed by :mod:`app.services.slot_engine`.
+
+        Four queries in total: profiles, schedule columns, rules and the
+        non-cancelled bookings of those schedules.
+        """
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        window_start = earliest or datetime.utcnow()
+        with replica_reads(self.session):
+            profiles_statement = _available_profiles_statement(specialization)
+            profiles = self.session.scalars(
+                profiles_statement.order_by(DoctorProfile.specialization.asc(), DoctorProfile.id.asc())
+            ).all()
+            if not profiles:
+                return []
+            profile_ids = profiles_statement.with_only_columns(DoctorProfile.id).scalar_subquery()
+            windows = self.session.execute(
+                _slot_windows_statement(profile_ids, earliest=window_start, latest=latest)
+            ).all()
+            rules = self.session.scalars(
+                _rules_statement(
+                    profile_ids,
+                    earliest=window_start,
+                    latest=expansion_end(window_start, latest),
+                )
+            ).all()
+            bookings = self.session.execute(
+                _slot_bookings_statement(profile_ids, earliest=window_start, latest=latest)
+            ).all()
+
+        availability = _group_availability(profiles, windows, rules, earliest=window_start, latest=latest)
+        return compute_free_slots(
+            availability,
+            bookings,
+            slot_length=slot_length,
+            earliest=window_start,
+            latest=latest,
+            per_doctor=per_doctor,
+        )
+
+
+class AsyncPatientService:
+    """Doctor discovery reads of ``PatientService`` for async handlers."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_doctor_profile_by_user_id(self, user_id: int) -> Optional[DoctorProfile]:
+        return await self.session.scalar(_doctor_profile_by_user_statement(user_id))
+
+    async def list_doctor_availability(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+    ) -> List[DoctorAvailabilityEntry]:
+        """Async variant of :meth:`PatientService.list_doctor_availability`."""
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        window_start = earliest or datetime.utcnow()
+        profiles_statement = _available_profiles_statement(specialization)
+        profiles = (
+            await self.session.scalars(
+                profiles_statement.order_by(DoctorProfile.specialization.asc(), DoctorProfile.id.asc())
+            )
+        ).all()
+        if not profiles:
+            return []
+
+        profile_ids = profiles_statement.with_only_columns(DoctorProfile.id).scalar_subquery()
+        schedules = (
+            await self.session.scalars(
+                _availability_schedules_statement(profile_ids, earliest=earliest, latest=latest)
+            )
+        ).all()
+
+        rules = (
+            await self.session.scalars(
+                _rules_statement(
+                    profile_ids,
+                    earliest=window_start,
+                    latest=expansion_end(window_start, latest),
+                )
+            )
+        ).all()
+
+        return _group_availability(profiles, schedules, rules, earliest=window_start, latest=latest)
+
+    async def list_active_schedules(
+        self,
+        *,
+        doctor_profile_id: Optional[int] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+    ) -> List[DoctorSchedule]:
+        statement = _active_schedules_statement(doctor_profile_id, earliest=earliest, latest=latest)
+        return list((await self.session.scalars(statement)).all())
+
+    async def find_earliest_available(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+        limit: int = 10,
+        per_doctor: int = 1,
+    ) -> List[Tuple[DoctorProfile, BookableOption]]:
+        """Async variant of :meth:`PatientService.find_earliest_available`.
+
+        The search pulls schedule pages from inside a heap merge, which cannot
+        await, so the sync implementation runs on this session's connection.
+        """
+
+        return await self.session.run_sync(
+            lambda session: PatientService(session).find_earliest_available(
+                specialization=specialization,
+                earliest=earliest,
+                latest=latest,
+                limit=limit,
+                per_doctor=per_doctor,
+            )
+        )
+
+    async def list_free_slots(
+        self,
+        *,
+        specialization: Optional[str] = None,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None,
+        slot_length: timedelta = timedelta(minutes=30),
+        per_doctor: int = 20,
+    ) -> List[Tuple[DoctorProfile, List[FreeSlot]]]:
+        """Async variant of :meth:`PatientService.list_free_slots`."""
+
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        window_start = earliest or datetime.utcnow()
+        profiles_statement = _available_profiles_statement(specialization)
+        profiles = (
+            await self.session.scalars(
+                profiles_statement.order_by(DoctorProfile.specialization.asc(), DoctorProfile.id.asc())
+            )
+        ).all()
+        if not profiles:
+            return []
+        profile_ids = profiles_statement.with_only_columns(DoctorProfile.id).scalar_subquery()
+        windows = (
+            await self.session.execute(
+                _slot_windows_statement(profile_ids, earliest=window_start, latest=latest)
+            )
+        ).all()
+        rules = (
+            await self.session.scalars(
+                _rules_statement(
+                    profile_ids,
+                    earliest=window_start,
+                    latest=expansion_end(window_start, latest),
+                )
+            )
+        ).all()
+        bookings = (
+            await self.session.execute(
+                _slot_bookings_statement(profile_ids, earliest=window_start, latest=latest)
+            )
+        ).all()
+
+        availability = _group_availability(profiles, windows, rules, earliest=window_start, latest=latest)
+        return compute_free_slots(
+            availability,
+            bookings,
+            slot_length=slot_length,
+            earliest=window_start,
+            latest=latest,
+            per_doctor=per_doctor,
+        )
+
+    async def list_rule_occurrences(
+        self,
+        *,
+        doctor_profile_id: int,
+        earliest: datetime,
+        latest: Optional[datetime] = None,
+    ) -> List[RuleOccurrence]:
+        earliest, latest = as_naive_utc(earliest), as_naive_utc(latest)
+        until = expansion_end(earliest, latest)
+        rules = (
+            await self.session.scalars(
+                _rules_statement([doctor_profile_id], earliest=earliest, latest=until)
+            )
+        ).all()
+        if not rules:
+            return []
+        blocked = ScheduleWindows(
+            await self.session.execute(
+                _blocking_windows_statement([doctor_profile_id], earliest=earliest, latest=until)
+            )
+        )
+        return list(expand_rules(rules, earliest=earliest, latest=until, blocked=blocked))
 
 
 def ensure_patient_user(user: User) -> None:
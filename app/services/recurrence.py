@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import accumulate
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models import DoctorAvailabilityRule
+
+# How far ahead occurrences are expanded when a caller gives no ``latest``.
+DEFAULT_EXPANSION_HORIZON = timedelta(days=28)
+
+
+
+@dataclass(frozen=True)
+class RuleOccurrence:
+    rule_id: int
+    doctor_id: int
+    start_time: datetime
+    end_time: datetime
+    max_patients: int
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to the naive UTC the database columns store."""
+
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def expansion_end(earliest: datetime, latest: Optional[datetime]) -> datetime:
+    return latest if latest is not None else earliest + DEFAULT_EXPANSION_HORIZON
+
+
+def blocking_windows_start(earliest: datetime) -> datetime:
+    """Lower bound on the end of any schedule that can overlap an expanded occurrence.
+
+    Expansion starts on ``earliest``'s day, so an occurrence in progress at
+    ``earliest`` can overlap schedules that ended before it.
+    """
+
+    return datetime.combine(earliest.date(), time.min)
+
+
+class ScheduleWindows:
+    """Concrete schedule windows per doctor, to suppress overlapping rule occurrences.
+
+    A rule occurrence overlapping any ``DoctorSchedule`` of the doctor, active or
+    not and including the one materialized from it, is not bookable: the service
+    overlap check and the Postgres exclusion constraint would reject its schedule.
+    """
+
+    def __init__(self, windows: Iterable[Tuple[int, datetime, datetime]] = ()) -> None:
+        spans: Dict[int, List[Tuple[datetime, datetime]]] = defaultdict(list)
+        for doctor_id, start_time, end_time in windows:
+            spans[doctor_id].append((start_time, end_time))
+        self._starts: Dict[int, List[datetime]] = {}
+        self._max_ends: Dict[int, List[datetime]] = {}
+        for doctor_id, doctor_spans in spans.items():
+            doctor_spans.sort()
+            self._starts[doctor_id] = [start_time for start_time, _ in doctor_spans]
+            self._max_ends[doctor_id] = list(accumulate((end_time for _, end_time in doctor_spans), max))
+
+    def overlaps(self, doctor_id: int, start_time: datetime, end_time: datetime) -> bool:
+        """Whether a window of the doctor overlaps the half-open ``[start_time, end_time)``."""
+
+        starts = self._starts.get(doctor_id)
+        if not starts:
+            return False
+        index = bisect_left(starts, end_time) - 1
+        return index >= 0 and self._max_ends[doctor_id][index] > start_time
+
+
+def _applies_on(rule: DoctorAvailabilityRule, day: date, excluded: Collection[date]) -> bool:
+    if day < rule.valid_from or (rule.valid_until is not None and day > rule.valid_until):
+        return False
+    return bool(rule.weekday_mask & (1 << day.weekday())) and day not in excluded
+
+
+def _occurrence_on(rule: DoctorAvailabilityRule, day: date) -> RuleOccurrence:
+    return RuleOccurrence(
+        rule_id=rule.id,
+        doctor_id=rule.doctor_id,
+        start_time=datetime.combine(day, rule.start_time),
+        end_time=datetime.combine(day, rule.end_time),
+        max_patients=rule.max_patients,
+    )
+
+
+def expand_rule(
+    rule: DoctorAvailabilityRule,
+    *,
+    earliest: datetime,
+    latest: datetime,
+    blocked: Optional[ScheduleWindows] = None,
+) -> Iterator[RuleOccurrence]:
+    """Yield the rule's occurrences overlapping ``[earliest, latest]`` in start order.
+
+    Occurrences overlapping a window in ``blocked`` are skipped; that covers days
+    already materialized into a ``DoctorSchedule``, so they are not listed twice.
+    """
+
+    excluded = set(rule.excluded)
+    day = max(earliest.date(), rule.valid_from)
+    last = latest.date() if rule.valid_until is None else min(latest.date(), rule.valid_until)
+    while day <= last:
+        if _applies_on(rule, day, excluded):
+            occurrence = _occurrence_on(rule, day)
+            if (
+                occurrence.end_time >= earliest
+                and occurrence.start_time <= latest
+                and not (
+                    blocked is not None
+                    and blocked.overlaps(rule.doctor_id, occurrence.start_time, occurrence.end_time)
+                )
+            ):
+                yield occurrence
+        day += timedelta(days=1)
+
+
+def expand_rules(
+    rules: Iterable[DoctorAvailabilityRule],
+    *,
+    earliest: datetime,
+    latest: datetime,
+    blocked: Optional[ScheduleWindows] = None,
+) -> Iterator[RuleOccurrence]:
+    """Lazily merge the occurrences of several rules into one start-ordered stream."""
+
+    return heapq.merge(
+        *(
+            expand_rule(rule, earliest=earliest, latest=latest, blocked=blocked)
+            for rule in rules
+        ),
+        key=lambda occurrence: occurrence.start_time,
+    )
+
+
+def occurrence_at(rule: DoctorAvailabilityRule, when: datetime) -> Optional[RuleOccurrence]:
+    """Return the occurrence of ``rule`` that contains ``when``, if there is one."""
+
+    if not rule.is_active or not _applies_on(rule, when.date(), set(rule.excluded)):
+        return None
+    occurrence = _occurrence_on(rule, when.date())
+    if not occurrence.start_time <= when <= occurrence.end_time:
+        return None
+    return occurrence
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models import DoctorProfile
+from app.services.recurrence import RuleOccurrence, as_naive_utc
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class FreeSlot:
+    start_time: datetime
+    end_time: datetime
+    schedule_id: Optional[int] = None
+    rule_id: Optional[int] = None
+
+
+def _epoch_seconds(value: datetime) -> int:
+    return (as_naive_utc(value) - _EPOCH) // timedelta(seconds=1)
+
+
+def _seconds(values: Iterable[datetime]) -> np.ndarray:
+    return np.fromiter((_epoch_seconds(value) for value in values), dtype=np.int64)
+
+
+def free_slot_indices(
+    *,
+    groups: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    open_windows: np.ndarray,
+    booked_windows: np.ndarray,
+    booked_times: np.ndarray,
+    slot_seconds: int,
+    earliest: int,
+    latest: Optional[int],
+    per_group: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute free fixed-length slots for many availability windows at once.
+
+    Windows are described column-wise: ``groups`` (e.g. the doctor), ``starts``
+    and ``ends`` in epoch seconds, and ``open_windows`` (False when the window
+    has no capacity left). Slots are aligned on each window's start. A booking
+    at time ``t`` in window ``w`` (``booked_windows``/``booked_times``) occupies
+    ``[t, t + slot_seconds)`` and blocks every slot it overlaps. Only slots
+    within ``[earliest, latest]`` are considered and at most ``per_group`` of
+    the earliest free slots are kept for each group.
+
+    Returns ``(window_index, slot_start)`` arrays ordered by group, then start.
+    """
+
+    window_count = len(starts)
+    if window_count == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    # Slots per window: skip the ones starting before ``earliest`` and stop at
+    # ``latest``. A window only needs ``per_group`` free slots, and each booking
+    # blocks at most two aligned slots, so longer windows are cut short.
+    first = np.maximum(-((starts - earliest) // slot_seconds), 0)
+    last = (ends - starts) // slot_seconds
+    if latest is not None:
+        last = np.minimum(last, (latest - starts) // slot_seconds)
+    bookings_per_window = np.bincount(booked_windows, minlength=window_count)
+    counts = np.clip(last - first, 0, per_group + 2 * bookings_per_window)
+    counts[~open_windows] = 0
+
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    window_index = np.repeat(np.arange(window_count), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    slot_starts = starts[window_index] + (first[window_index] + offsets) * slot_seconds
+
+    if len(booked_times):
+        # Encode (window, time) as one sortable integer so a single searchsorted
+        # counts the bookings of the same window overlapping each slot.
+        base = min(int(starts.min()), int(booked_times.min())) - slot_seconds
+        span = max(int(ends.max()), int(booked_times.max())) + 2 * slot_seconds - base
+        booked_keys = np.sort(booked_windows.astype(np.int64) * span + (booked_times - base))
+        slot_keys = window_index.astype(np.int64) * span + (slot_starts - base)
+        overlapping = np.searchsorted(booked_keys, slot_keys + slot_seconds, side="left") - np.searchsorted(
+            booked_keys, slot_keys - slot_seconds, side="right"
+        )
+        free = overlapping == 0
+        window_index = window_index[free]
+        slot_starts = slot_starts[free]
+
+    slot_groups = groups[window_index]
+    order = np.lexsort((slot_starts, slot_groups))
+    window_index, slot_starts, slot_groups = window_index[order], slot_starts[order], slot_groups[order]
+    rank = np.arange(len(slot_groups)) - np.searchsorted(slot_groups, slot_groups, side="left")
+    keep = rank < per_group
+    return window_index[keep], slot_starts[keep]
+
+
+def compute_free_slots(
+    availability: Sequence[Tuple[DoctorProfile, Sequence, Sequence[RuleOccurrence]]],
+    bookings: Iterable[Tuple[int, datetime]],
+    *,
+    slot_length: timedelta,
+    earliest: datetime,
+    latest: Optional[datetime] = None,
+    per_doctor: int = 20,
+) -> List[Tuple[DoctorProfile, List[FreeSlot]]]:
+    """Free slots per doctor for ``(profile, schedules, occurrences)`` availability entries.
+
+    ``schedules`` need ``id``, ``start_time``, ``end_time``, ``max_patients`` and
+    ``booked_count`` attributes; ``bookings`` are ``(schedule_id, scheduled_time)``
+    pairs of non-cancelled appointments. Rule occurrences have no bookings yet.
+    Doctors without a free slot are omitted.
+    """
+
+    groups: List[int] = []
+    starts: List[datetime] = []
+    ends: List[datetime] = []
+    open_windows: List[bool] = []
+    sources: List[Tuple[Optional[int], Optional[int]]] = []
+    window_by_schedule: Dict[int, int] = {}
+    for group, (_, schedules, occurrences) in enumerate(availability):
+        for schedule in schedules:
+            window_by_schedule[schedule.id] = len(starts)
+            groups.append(group)
+            starts.append(schedule.start_time)
+            ends.append(schedule.end_time)
+            open_windows.append(schedule.booked_count < schedule.max_patients)
+            sources.append((schedule.id, None))
+        for occurrence in occurrences:
+            groups.append(group)
+            starts.append(occurrence.start_time)
+            ends.append(occurrence.end_time)
+            open_windows.append(True)
+            sources.append((None, occurrence.rule_id))
+
+    booked_windows: List[int] = []
+    booked_times: List[datetime] = []
+    for schedule_id, scheduled_time in bookings:
+        window = window_by_schedule.get(schedule_id)
+        if window is not None:
+            booked_windows.append(window)
+            booked_times.append(scheduled_time)
+
+    slot_seconds = int(slot_length.total_seconds())
+    window_index, slot_starts = free_slot_indices(
+        groups=np.asarray(groups, dtype=np.int64),
+        starts=_seconds(starts),
+        ends=_seconds(ends),
+        open_windows=np.asarray(open_windows, dtype=bool),
+        booked_windows=np.asarray(booked_windows, dtype=np.int64),
+        booked_times=_seconds(booked_times),
+        slot_seconds=slot_seconds,
+        earliest=_epoch_seconds(earliest),
+        latest=None if latest is None else _epoch_seconds(latest),
+        per_group=per_doctor,
+    )
+
+    slots_by_group: Dict[int, List[FreeSlot]] = {}
+    for window, start in zip(window_index.tolist(), slot_starts.tolist()):
+        start_time = _EPOCH + timedelta(seconds=start)
+        schedule_id, rule_id = sources[window]
+        slots_by_group.setdefault(groups[window], []).append(
+            FreeSlot(
+                start_time=start_time,
+                end_time=start_time + slot_length,
+                schedule_id=schedule_id,
+                rule_id=rule_id,
+            )
+        )
+    return [
+        (availability[group][0], slots_by_group[group])
+        for group in range(len(availability))
+        if group in slots_by_group
+    ]
@@ -1,44 +1,83 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from app.core import security
-from app.models.user import User
+from app.core.principal_cache import principal_cache
+from app.models.user import User, UserRole
 from app.schemas import user as user_schema
+from app.services.availability_cache import publish_availability_changed
+from app.services.event_bus import EventBus
 
 
 class UserService:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, event_bus: Optional[EventBus] = None) -> None:
         self.session = session
+        self.event_bus = event_bus
 
-    def create_user(self, user_in: user_schema.UserCreate) -> User:
+    def _insert_user(self, user_in: user_schema.UserCreate, hashed_password: str) -> User:
         user = User(
             email=user_in.email,
             full_name=user_in.full_name,
             role=user_in.role,
-            hashed_password=security.hash_password(user_in.password),
+            hashed_password=hashed_password,
         )
         self.session.add(user)
         self.session.commit()
-        self.session.refresh(user)
         return user
 
+    def create_user(self, user_in: user_schema.UserCreate) -> User:
+        return self._insert_user(user_in, security.password_hasher.hash(user_in.password))
+
+    async def create_user_async(self, user_in: user_schema.UserCreate) -> User:
+        """:meth:`create_user` awaiting the hash instead of holding a thread on it."""
+
+        hashed_password = await security.password_hasher.hash_async(user_in.password)
+        return await asyncio.to_thread(self._insert_user, user_in, hashed_password)
+
     def get_by_email(self, email: str) -> Optional[User]:
         return self.session.query(User).filter(User.email == email).one_or_none()
 
     def get(self, user_id: int) -> Optional[User]:
         return self.session.get(User, user_id)
 
-    def update(self, user: User, user_in: user_schema.UserUpdate) -> User:
+    def _apply_update(
+        self, user: User, user_in: user_schema.UserUpdate, hashed_password: Optional[str]
+    ) -> User:
+        credentials_changed = activation_changed = False
         if user_in.full_name is not None:
             user.full_name = user_in.full_name
-        if user_in.password:
-            user.hashed_password = security.hash_password(user_in.password)
+        if hashed_password is not None:
+            user.hashed_password = hashed_password
+            credentials_changed = True
         if user_in.is_active is not None:
+            activation_changed = user.is_active != user_in.is_active
+            credentials_changed = credentials_changed or activation_changed
             user.is_active = user_in.is_active
         self.session.add(user)
         self.session.commit()
-        self.session.refresh(user)
+        if credentials_changed:
+            principal_cache.invalidate(user.id)
+        if activation_changed and user.role == UserRole.DOCTOR and user.doctor_profile is not None:
+            # Availability listings only include doctors with an active account.
+            publish_availability_changed(
+                self.event_bus,
+                doctor_id=user.doctor_profile.id,
+                specializations=[user.doctor_profile.specialization],
+            )
         return user
+
+    def update(self, user: User, user_in: user_schema.UserUpdate) -> User:
+        hashed_password = security.password_hasher.hash(user_in.password) if user_in.password else None
+        return self._apply_update(user, user_in, hashed_password)
+
+    async def update_async(self, user: User, user_in: user_schema.UserUpdate) -> User:
+        """:meth:`update` awaiting the hash instead of holding a thread on it."""
+
+        hashed_password = None
+        if user_in.password:
+            hashed_password = await security.password_hasher.hash_async(user_in.password)
+        return await asyncio.to_thread(self._apply_update, user, user_in, hashed_password)
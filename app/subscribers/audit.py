@@ -1,37 +1,209 @@
 from __future__ import annotations
 
-from typing import Callable
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.audit import AuditLog
 from app.schemas.events import DomainEvent
 from app.services.event_bus import EventBus
 
+logger = logging.getLogger(__name__)
+
 SessionFactory = Callable[[], Session]
 
 
 EVENTS_TO_AUDIT = {"appointment.created", "appointment.updated", "lab_result.created"}
-_REGISTERED = False
+_WRITER: Optional["BufferedAuditWriter"] = None
 
 
-def register_audit_subscriber(event_bus: EventBus, session_factory: SessionFactory) -> None:
-    global _REGISTERED
-    if _REGISTERED:
-        return
+class BufferedAuditWriter:
+    """Collect audit rows in memory and persist them with one multi-row INSERT.
+
+    A flush happens when ``max_batch_size`` rows are buffered, every
+    ``flush_interval`` seconds from a background thread, and on ``stop``. Rows
+    from a failed flush are put back in the buffer. Automatic flushes then wait
+    an exponentially growing delay, up to ``max_retry_delay``, so a database
+    outage does not turn every ``add`` into a failing write on the publisher's
+    thread. At most ``max_buffered`` rows are kept; beyond that the oldest rows
+    are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffered: int = 10_000,
+        max_retry_delay: float = 30.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max(max_buffered, max_batch_size)
+        self.max_retry_delay = max_retry_delay
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, float] = {
+            "flushes": 0,
+            "failed_flushes": 0,
+            "dropped_rows": 0,
+            "rows_written": 0,
+            "last_flush_size": 0,
+            "max_flush_size": 0,
+            "last_flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+        }
+
+    def add(self, event: DomainEvent) -> None:
+        row = {
+            "event_name": event.name,
+            "payload": event.payload,
+            "created_at": event.occurred_at,
+        }
+        with self._buffer_lock:
+            self._buffer.append(row)
+            self._trim()
+            should_flush = len(self._buffer) >= self.max_batch_size and self._flush_due()
+        if should_flush:
+            self.flush()
+
+    def _trim(self) -> None:
+        """Drop the oldest rows above ``max_buffered``; call with the buffer lock held."""
+
+        excess = len(self._buffer) - self.max_buffered
+        if excess > 0:
+            del self._buffer[:excess]
+            self._stats["dropped_rows"] += excess
+            logger.warning("Audit buffer full, dropped the %s oldest rows", excess)
+
+    def _flush_due(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def flush(self) -> int:
+        """Write every buffered row in a single transaction and return the row count.
+
+        Explicit calls always try to write; only the automatic flushes honour the
+        retry delay after a failure.
+        """
+
+        with self._flush_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            started = time.perf_counter()
+            session = self.session_factory()
+            try:
+                session.execute(insert(AuditLog), rows)
+                session.commit()
+            except Exception:
+                session.rollback()
+                with self._buffer_lock:
+                    self._buffer[:0] = rows
+                    self._trim()
+                    self._stats["failed_flushes"] += 1
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, self.flush_interval), self.max_retry_delay
+                    )
+                    self._retry_at = time.monotonic() + self._retry_delay
+                logger.exception(
+                    "Failed to flush %s audit rows, retrying in %.1fs", len(rows), self._retry_delay
+                )
+                return 0
+            finally:
+                session.close()
+
+            elapsed = time.perf_counter() - started
+            with self._buffer_lock:
+                self._retry_delay = 0.0
+                self._retry_at = 0.0
+                self._stats["flushes"] += 1
+                self._stats["rows_written"] += len(rows)
+                self._stats["last_flush_size"] = len(rows)
+                self._stats["max_flush_size"] = max(self._stats["max_flush_size"], len(rows))
+                self._stats["last_flush_seconds"] = elapsed
+                self._stats["max_flush_seconds"] = max(self._stats["max_flush_seconds"], elapsed)
+                self._stats["total_flush_seconds"] += elapsed
+            return len(rows)
 
-    def _handler(event: DomainEvent) -> None:
-        session = session_factory()
-        try:
-            audit_log = AuditLog(event_name=event.name, payload=event.payload)
-            session.add(audit_log)
-            session.commit()
-        except Exception:  # pragma: no cover - defensive logging without failing request
-            session.rollback()
-        finally:
-            session.close()
+    def stats(self) -> Dict[str, float]:
+        with self._buffer_lock:
+            snapshot = dict(self._stats)
+            snapshot["buffered"] = len(self._buffer)
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            if self._flush_due():
+                self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the periodic flush thread and write out whatever is still buffered."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+
+def register_audit_subscriber(
+    event_bus: EventBus,
+    session_factory: SessionFactory,
+    *,
+    max_batch_size: int = 500,
+    flush_interval: float = 1.0,
+    max_buffered: int = 10_000,
+    max_retry_delay: float = 30.0,
+) -> BufferedAuditWriter:
+    global _WRITER
+    if _WRITER is not None:
+        return _WRITER
+
+    writer = BufferedAuditWriter(
+        session_factory,
+        max_batch_size=max_batch_size,
+        flush_interval=flush_interval,
+        max_buffered=max_buffered,
+        max_retry_delay=max_retry_delay,
+    )
 
     for event_name in EVENTS_TO_AUDIT:
-        event_bus.subscribe(event_name, _handler)
+        event_bus.subscribe(event_name, writer.add)
 
-    _REGISTERED = True
+    writer.start()
+    _WRITER = writer
+    return writer
+
+
+def shutdown_audit_subscriber(event_bus: EventBus) -> None:
+    """Unsubscribe the audit writer and flush its buffer."""
+
+    global _WRITER
+    if _WRITER is None:
+        return
+
+    for event_name in EVENTS_TO_AUDIT:
+        event_bus.unsubscribe(event_name, _WRITER.add)
+    _WRITER.stop()
+    _WRITER = None
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from celery.utils.log import get_task_logger
+from sqlalchemy import select, tuple_, update
 
 from app.db.session import SessionLocal
 from app.models.appointment import Appointment, AppointmentStatus
@@ -11,59 +13,209 @@ from app.tasks.celery_app import celery_app
 
 logger = get_task_logger(__name__)
 
+TASK_NAME = "schedule_appointment"
+
+
+def _mark_failed(task_record_id: int, error_message: str) -> None:
+    """Record a failed run, unless another delivery has already succeeded.
+
+    The failed transaction was rolled back, so the record is back to its
+    pre-claim status; only a SUCCEEDED record is left alone.
+    """
 
-@celery_app.task(name="app.tasks.appointment_tasks.schedule_appointment_task")
-def schedule_appointment_task(appointment_id: int) -> None:
     session = SessionLocal()
-    task_record: BackgroundTaskRecord | None = None
     try:
-        task_record = (
-            session.query(BackgroundTaskRecord)
-            .filter(
-                BackgroundTaskRecord.appointment_id == appointment_id,
-                BackgroundTaskRecord.task_name == "schedule_appointment",
+        session.execute(
+            update(BackgroundTaskRecord)
+            .where(BackgroundTaskRecord.id == task_record_id)
+            .where(BackgroundTaskRecord.status != BackgroundTaskStatus.SUCCEEDED)
+            .values(
+                status=BackgroundTaskStatus.FAILED,
+                error_message=error_message[:255],
+                updated_at=datetime.utcnow(),
             )
-            .order_by(BackgroundTaskRecord.created_at.desc())
-            .first()
         )
+        session.commit()
+    finally:
+        session.close()
 
-        if task_record:
-            task_record.status = BackgroundTaskStatus.RUNNING
-            task_record.updated_at = datetime.utcnow()
-            session.add(task_record)
-            session.commit()
 
-        appointment = session.get(Appointment, appointment_id)
-        if appointment is None:
-            if task_record:
-                task_record.status = BackgroundTaskStatus.FAILED
-                task_record.error_message = "Appointment not found"
-                task_record.updated_at = datetime.utcnow()
-                session.add(task_record)
-                session.commit()
-            logger.warning("Appointment %s not found", appointment_id)
+def _confirm_appointment(task_record_id: int, idempotency_key: Optional[str]) -> None:
+    """Run one confirmation, claiming its task record with a compare-and-set.
+
+    The record moves from QUEUED to RUNNING only if the message carries the
+    record's current idempotency key. Redelivered or stale messages match no row
+    and return without touching the appointment. The claim, the confirmation and
+    the final status are committed together, so a crashed worker leaves the
+    record QUEUED for the next delivery.
+    """
+
+    now = datetime.utcnow()
+    session = SessionLocal()
+    try:
+        claimed = session.execute(
+            update(BackgroundTaskRecord)
+            .where(BackgroundTaskRecord.id == task_record_id)
+            .where(BackgroundTaskRecord.idempotency_key == idempotency_key)
+            .where(BackgroundTaskRecord.status == BackgroundTaskStatus.QUEUED)
+            .values(status=BackgroundTaskStatus.RUNNING, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            session.rollback()
+            logger.info("Task record %s already claimed; skipping duplicate delivery", task_record_id)
             return
 
-        appointment.status = AppointmentStatus.CONFIRMED
-        appointment.updated_at = datetime.utcnow()
-        session.add(appointment)
+        task_record = session.get(BackgroundTaskRecord, task_record_id)
+        appointment = (
+            session.get(Appointment, task_record.appointment_id)
+            if task_record.appointment_id is not None
+            else None
+        )
+        if appointment is None:
+            task_record.status = BackgroundTaskStatus.FAILED
+            task_record.error_message = "Appointment not found"
+            task_record.updated_at = now
+            session.commit()
+            logger.warning("Appointment for task record %s not found", task_record_id)
+            return
 
-        if task_record:
-            task_record.status = BackgroundTaskStatus.SUCCEEDED
-            task_record.updated_at = datetime.utcnow()
-            session.add(task_record)
+        # Only pending bookings are confirmed; a cancellation that raced ahead of
+        # the worker has already released its schedule seat.
+        if appointment.status == AppointmentStatus.PENDING:
+            appointment.status = AppointmentStatus.CONFIRMED
+            appointment.updated_at = now
 
+        task_record.status = BackgroundTaskStatus.SUCCEEDED
+        task_record.updated_at = now
         session.commit()
-        logger.info("Appointment %s confirmed", appointment_id)
+        logger.info("Appointment %s confirmed", appointment.id)
     except Exception as exc:  # pragma: no cover - defensive logging
         session.rollback()
-        if task_record:
-            task_record.status = BackgroundTaskStatus.FAILED
-            task_record.error_message = str(exc)
-            task_record.updated_at = datetime.utcnow()
-            session.add(task_record)
-            session.commit()
-        logger.exception("Failed to process appointment %s", appointment_id)
+        _mark_failed(task_record_id, str(exc))
+        logger.exception("Failed to process task record %s", task_record_id)
         raise
     finally:
         session.close()
+
+
+def _latest_task_record_id(appointment_id: int) -> Optional[tuple[int, Optional[str]]]:
+    """Look up the record for messages enqueued before record ids were sent."""
+
+    session = SessionLocal()
+    try:
+        row = session.execute(
+            select(BackgroundTaskRecord.id, BackgroundTaskRecord.idempotency_key)
+            .where(BackgroundTaskRecord.appointment_id == appointment_id)
+            .where(BackgroundTaskRecord.task_name == TASK_NAME)
+            .order_by(BackgroundTaskRecord.created_at.desc())
+            .limit(1)
+        ).first()
+        return None if row is None else (row.id, row.idempotency_key)
+    finally:
+        session.close()
+
+
+def _confirm_appointments_in_bulk(tasks: List[Dict[str, Any]]) -> None:
+    """Claim, confirm and settle a batch of task records in one transaction."""
+
+    now = datetime.utcnow()
+    session = SessionLocal()
+    try:
+        claimed = session.execute(
+            update(BackgroundTaskRecord)
+            .where(
+                tuple_(BackgroundTaskRecord.id, BackgroundTaskRecord.idempotency_key).in_(
+                    [(task["task_record_id"], task["idempotency_key"]) for task in tasks]
+                )
+            )
+            .where(BackgroundTaskRecord.status == BackgroundTaskStatus.QUEUED)
+            .values(status=BackgroundTaskStatus.RUNNING, updated_at=now)
+            .returning(BackgroundTaskRecord.id, BackgroundTaskRecord.appointment_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not claimed:
+            session.rollback()
+            return
+
+        appointment_ids = {row.appointment_id for row in claimed if row.appointment_id is not None}
+        found = set(session.scalars(select(Appointment.id).where(Appointment.id.in_(appointment_ids))))
+        succeeded = [row.id for row in claimed if row.appointment_id in found]
+        failed = [row.id for row in claimed if row.appointment_id not in found]
+
+        if found:
+            session.execute(
+                update(Appointment)
+                .where(Appointment.id.in_(found))
+                .where(Appointment.status == AppointmentStatus.PENDING)
+                .values(status=AppointmentStatus.CONFIRMED, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        if succeeded:
+            session.execute(
+                update(BackgroundTaskRecord)
+                .where(BackgroundTaskRecord.id.in_(succeeded))
+                .values(status=BackgroundTaskStatus.SUCCEEDED, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        if failed:
+            session.execute(
+                update(BackgroundTaskRecord)
+                .where(BackgroundTaskRecord.id.in_(failed))
+                .values(
+                    status=BackgroundTaskStatus.FAILED,
+                    error_message="Appointment not found",
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            logger.warning("Appointments for task records %s not found", failed)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    logger.info("Confirmed %s appointments in bulk", len(succeeded))
+
+
+@celery_app.task(name="app.tasks.appointment_tasks.schedule_appointment_task")
+def schedule_appointment_task(
+    appointment_id: int,
+    task_record_id: Optional[int] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    if task_record_id is None:
+        record = _latest_task_record_id(appointment_id)
+        if record is None:
+            logger.warning("No task record for appointment %s", appointment_id)
+            return
+        task_record_id, idempotency_key = record
+    _confirm_appointment(task_record_id, idempotency_key)
+
+
+@celery_app.task(name="app.tasks.appointment_tasks.confirm_appointments_batch_task")
+def confirm_appointments_batch_task(tasks: List[Dict[str, Any]]) -> None:
+    """Confirm a batch of ``schedule_appointment`` payloads with bulk UPDATE statements.
+
+    When the bulk transaction fails, every task is retried on its own so one bad
+    row cannot hold back the rest of the batch.
+    """
+
+    tasks = list({task["task_record_id"]: task for task in tasks}.values())
+    if not tasks:
+        return
+    try:
+        _confirm_appointments_in_bulk(tasks)
+        return
+    except Exception:
+        logger.exception("Bulk confirmation of %s appointments failed; retrying one by one", len(tasks))
+
+    failures = 0
+    for task in tasks:
+        try:
+            _confirm_appointment(task["task_record_id"], task["idempotency_key"])
+        except Exception:
+            failures += 1
+    if failures:
+        logger.error("%s of %s appointments in the batch failed to confirm", failures, len(tasks))
@@ -12,3 +12,10 @@ celery_app = Celery(
 
 celery_app.conf.task_routes = {"app.tasks.appointment_tasks.*": {"queue": "appointments"}}
 celery_app.conf.beat_schedule = {}
+# Publishing happens on the outbox relay thread, which retries with backoff, so
+# a slow or restarting broker should fail fast instead of blocking it.
+celery_app.conf.broker_transport_options = {
+    "socket_timeout": settings.celery_publish_timeout_seconds,
+    "socket_connect_timeout": settings.celery_publish_timeout_seconds,
+}
+celery_app.conf.task_publish_retry = False
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import abc
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+from celery import Celery, Task
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskExecutor(abc.ABC):
+    """Runs Celery task functions; subclasses decide where the work happens."""
+
+    backend = "base"
+
+    @abc.abstractmethod
+    def submit(self, task: Task, *args: Any) -> None:
+        """Run ``task`` with ``args``, or hand it to whatever runs it."""
+
+    @abc.abstractmethod
+    def queue_depth(self) -> Optional[int]:
+        """Number of submitted tasks not yet finished, or ``None`` if unknown."""
+
+    def shutdown(self, wait: bool = True) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "queue_depth": self.queue_depth()}
+
+
+class CeleryTaskExecutor(TaskExecutor):
+    """Publish tasks to the Celery broker for the worker processes."""
+
+    backend = "celery"
+
+    def __init__(self, app: Celery, queues: Sequence[str] = ("appointments",)) -> None:
+        self.app = app
+        self.queues = tuple(queues)
+
+    def submit(self, task: Task, *args: Any) -> None:
+        task.delay(*args)
+
+    def queue_depth(self) -> Optional[int]:
+        try:
+            with self.app.connection_for_read() as connection:
+                channel = connection.default_channel
+                return sum(
+                    channel.queue_declare(queue=queue, passive=True).message_count
+                    for queue in self.queues
+                )
+        except Exception:
+            logger.debug("Could not read broker queue depth", exc_info=True)
+            return None
+
+
+class ThreadPoolTaskExecutor(TaskExecutor):
+    """Run tasks on a local thread pool inside the current process."""
+
+    backend = "thread"
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-executor")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        exception = future.exception()
+        if exception is not None:
+            logger.error("Background task failed", exc_info=exception)
+
+    def submit(self, task: Task, *args: Any) -> None:
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._executor.submit(task, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._done)
+
+    def queue_depth(self) -> Optional[int]:
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+class InlineTaskExecutor(TaskExecutor):
+    """Run tasks synchronously on the submitting thread."""
+
+    backend = "inline"
+
+    def submit(self, task: Task, *args: Any) -> None:
+        task(*args)
+
+    def queue_depth(self) -> Optional[int]:
+        return 0
+
+
+def build_task_executor(settings: Settings) -> TaskExecutor:
+    backend = settings.task_executor_backend
+    if backend == "celery":
+        from app.tasks.celery_app import celery_app
+
+        return CeleryTaskExecutor(celery_app)
+    if backend == "thread":
+        return ThreadPoolTaskExecutor(max_workers=settings.task_executor_workers)
+    if backend == "inline":
+        return InlineTaskExecutor()
+    raise ValueError(f"Unknown task executor backend: {backend!r}")
+
+
+task_executor = build_task_executor(get_settings())
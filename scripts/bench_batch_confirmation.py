@@ -0,0 +1,190 @@
+"""Measure appointment confirmation throughput, one task per booking vs batches.
+
+Seeds pending appointments with queued ``schedule_appointment`` task records,
+then confirms them once through the per-item task path and once through
+``confirm_appointments_batch_task`` in chunks of ``--batch-size``, reporting
+confirmations per second and statements per confirmation for each.
+
+    python scripts/bench_batch_confirmation.py --appointments 2000 --batch-size 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _configure(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ENABLE_BACKGROUND_WORKERS"] = "false"
+    os.environ["ENABLE_EVENT_SUBSCRIBERS"] = "false"
+
+
+def _reset() -> None:
+    from app.db.base import Base
+    from app.db.session import engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _seed(count: int) -> list:
+    """Insert ``count`` pending appointments and return their task payloads."""
+
+    from sqlalchemy import insert, select
+
+    from app.db.session import SessionLocal
+    from app.models import (
+        Appointment,
+        AppointmentStatus,
+        BackgroundTaskRecord,
+        BackgroundTaskStatus,
+        DoctorProfile,
+        DoctorSchedule,
+        User,
+        UserRole,
+    )
+
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    with SessionLocal() as session:
+        doctor = User(email="doctor@example.com", full_name="Doctor", role=UserRole.DOCTOR, hashed_password="x")
+        session.add(doctor)
+        session.flush()
+        profile = DoctorProfile(user_id=doctor.id, specialization="Cardiology")
+        session.add(profile)
+        session.flush()
+        schedule = DoctorSchedule(
+            doctor_id=profile.id,
+            start_time=start,
+            end_time=start + timedelta(hours=8),
+            max_patients=count,
+            booked_count=count,
+        )
+        session.add(schedule)
+        session.flush()
+
+        session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"patient{index}@example.com",
+                    "full_name": f"Patient {index}",
+                    "role": UserRole.PATIENT,
+                    "hashed_password": "x",
+                }
+                for index in range(count)
+            ],
+        )
+        patient_ids = session.scalars(select(User.id).where(User.role == UserRole.PATIENT).order_by(User.id)).all()
+        session.execute(
+            insert(Appointment),
+            [
+                {
+                    "patient_id": patient_id,
+                    "doctor_id": doctor.id,
+                    "schedule_id": schedule.id,
+                    "scheduled_time": start,
+                    "reason": "Benchmark",
+                    "status": AppointmentStatus.PENDING,
+                }
+                for patient_id in patient_ids
+            ],
+        )
+        appointment_ids = session.scalars(select(Appointment.id).order_by(Appointment.id)).all()
+        session.execute(
+            insert(BackgroundTaskRecord),
+            [
+                {
+                    "task_name": "schedule_appointment",
+                    "status": BackgroundTaskStatus.QUEUED,
+                    "appointment_id": appointment_id,
+                    "idempotency_key": uuid.uuid4().hex,
+                }
+                for appointment_id in appointment_ids
+            ],
+        )
+        session.commit()
+        rows = session.execute(
+            select(
+                BackgroundTaskRecord.appointment_id,
+                BackgroundTaskRecord.id,
+                BackgroundTaskRecord.idempotency_key,
+            ).order_by(BackgroundTaskRecord.id)
+        ).all()
+    return [
+        {"appointment_id": row.appointment_id, "task_record_id": row.id, "idempotency_key": row.idempotency_key}
+        for row in rows
+    ]
+
+
+def _confirmed() -> int:
+    from sqlalchemy import func, select
+
+    from app.db.session import SessionLocal
+    from app.models import Appointment, AppointmentStatus
+
+    with SessionLocal() as session:
+        return session.scalar(
+            select(func.count()).select_from(Appointment).where(Appointment.status == AppointmentStatus.CONFIRMED)
+        )
+
+
+def _measure(label: str, run, count: int) -> None:
+    from sqlalchemy import event
+
+    from app.db.session import engine
+
+    statements = 0
+
+    def _count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    _reset()
+    payloads = _seed(count)
+    event.listen(engine, "before_cursor_execute", _count)
+    started = time.perf_counter()
+    try:
+        run(payloads)
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", _count)
+    confirmed = _confirmed()
+    print(
+        f"{label}: {confirmed}/{count} confirmed in {elapsed:.2f}s "
+        f"({confirmed / elapsed:.0f}/s, {statements / count:.2f} statements each)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=1_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='bench-confirmation-')}/bench.db"
+    _configure(database_url)
+
+    from app.tasks.appointment_tasks import confirm_appointments_batch_task, schedule_appointment_task
+
+    def one_by_one(payloads: list) -> None:
+        for payload in payloads:
+            schedule_appointment_task(**payload)
+
+    def batched(payloads: list) -> None:
+        for offset in range(0, len(payloads), args.batch_size):
+            confirm_appointments_batch_task(payloads[offset : offset + args.batch_size])
+
+    _measure("one task per booking", one_by_one, args.appointments)
+    _measure(f"batches of {args.batch_size}", batched, args.appointments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Compare blocking and awaited password checks under a login burst.
+
+Fires a burst of concurrent logins at an in-process ASGI app while probing a
+cheap sync route, once with a sync handler that blocks a threadpool thread on
+``AuthService.authenticate`` and once with an async handler awaiting
+``AuthService.authenticate_async``. Reports login throughput and the probe's
+latency, which is what other requests see while logins are in flight.
+
+    python scripts/bench_password_hashing.py --logins 200 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _configure(workers: int, max_pending: int) -> None:
+    data_dir = tempfile.mkdtemp(prefix="bench-password-hashing-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{data_dir}/bench.db"
+    os.environ["PASSWORD_HASH_WORKERS"] = str(workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(max_pending)
+    os.environ["ENABLE_BACKGROUND_WORKERS"] = "false"
+    os.environ["ENABLE_EVENT_SUBSCRIBERS"] = "false"
+
+
+def _build_app():
+    from fastapi import FastAPI, HTTPException
+
+    from app.core.config import get_settings
+    from app.core.security import PasswordHashingBusyError
+    from app.db.session import SessionLocal
+    from app.schemas.auth import LoginRequest
+    from app.services.auth_service import AuthService
+
+    settings = get_settings()
+    app = FastAPI()
+
+    @app.post("/sync-login")
+    def sync_login(credentials: LoginRequest) -> dict:
+        with SessionLocal() as session:
+            try:
+                user = AuthService(session, settings).authenticate(credentials.email, credentials.password)
+            except PasswordHashingBusyError as exc:
+                raise HTTPException(status_code=503) from exc
+        if user is None:
+            raise HTTPException(status_code=401)
+        return {"id": user.id}
+
+    @app.post("/async-login")
+    async def async_login(credentials: LoginRequest) -> dict:
+        with SessionLocal() as session:
+            try:
+                user = await AuthService(session, settings).authenticate_async(credentials.email, credentials.password)
+            except PasswordHashingBusyError as exc:
+                raise HTTPException(status_code=503) from exc
+        if user is None:
+            raise HTTPException(status_code=401)
+        return {"id": user.id}
+
+    @app.get("/ping")
+    def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+def _seed(password: str) -> str:
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models import User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    email = "bench@example.com"
+    with SessionLocal() as session:
+        session.add(
+            User(
+                email=email,
+                full_name="Bench User",
+                role=UserRole.PATIENT,
+                hashed_password=hash_password(password),
+                is_active=True,
+            )
+        )
+        session.commit()
+    return email
+
+
+async def _run(app, path: str, email: str, password: str, logins: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        done = asyncio.Event()
+        probes: list[float] = []
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/ping")
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        async def login() -> int:
+            response = await client.post(path, json={"email": email, "password": password})
+            return response.status_code
+
+        probing = asyncio.create_task(probe())
+        started = time.perf_counter()
+        codes = await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probing
+
+    probes.sort()
+    return {
+        "elapsed": elapsed,
+        "ok": codes.count(200),
+        "busy": codes.count(503),
+        "probe_p50_ms": statistics.median(probes) * 1000 if probes else 0.0,
+        "probe_max_ms": probes[-1] * 1000 if probes else 0.0,
+        "probes": len(probes),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100, help="concurrent logins per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="bcrypt processes")
+    parser.add_argument("--max-pending", type=int, default=1_000, help="PASSWORD_HASH_MAX_PENDING")
+    args = parser.parse_args()
+
+    _configure(args.workers, args.max_pending)
+    password = "bench-password"
+    email = _seed(password)
+    app = _build_app()
+
+    from app.core.security import password_hasher
+
+    try:
+        for label, path in (("sync handler ", "/sync-login"), ("async handler", "/async-login")):
+            result = asyncio.run(_run(app, path, email, password, args.logins))
+            print(
+                f"{label}: {result['ok']} ok / {result['busy']} busy in {result['elapsed']:.2f}s "
+                f"({result['ok'] / result['elapsed']:.1f} logins/s); "
+                f"/ping p50 {result['probe_p50_ms']:.1f} ms, max {result['probe_max_ms']:.1f} ms "
+                f"over {result['probes']} probes"
+            )
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
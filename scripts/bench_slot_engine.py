@@ -0,0 +1,136 @@
+"""Compare the NumPy slot engine with a per-slot Python loop.
+
+Builds random availability windows and bookings for ``--doctors`` doctors,
+runs ``free_slot_indices`` and a straightforward loop over every candidate
+slot on the same input, checks that both return the same slots and reports
+the median time of each.
+
+    python scripts/bench_slot_engine.py --doctors 500 --windows 20 --bookings 6
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.slot_engine import free_slot_indices  # noqa: E402
+
+DAY = 24 * 3600
+
+
+def _inputs(doctors: int, windows: int, bookings: int, slot_seconds: int, seed: int) -> dict:
+    """Random windows of 2-8 hours over four weeks, with bookings on slot boundaries."""
+
+    rng = np.random.default_rng(seed)
+    count = doctors * windows
+    groups = np.repeat(np.arange(doctors), windows).astype(np.int64)
+    starts = rng.integers(0, 28, count) * DAY + rng.integers(7, 12, count) * 3600
+    ends = starts + rng.integers(2, 9, count) * 3600
+    open_windows = rng.random(count) > 0.1
+    booked_windows = rng.integers(0, count, count * bookings // windows).astype(np.int64)
+    slots_in_window = (ends[booked_windows] - starts[booked_windows]) // slot_seconds
+    booked_times = starts[booked_windows] + rng.integers(0, slots_in_window) * slot_seconds
+    return {
+        "groups": groups,
+        "starts": starts.astype(np.int64),
+        "ends": ends.astype(np.int64),
+        "open_windows": open_windows,
+        "booked_windows": booked_windows,
+        "booked_times": booked_times.astype(np.int64),
+    }
+
+
+def python_free_slots(
+    *,
+    groups: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    open_windows: np.ndarray,
+    booked_windows: np.ndarray,
+    booked_times: np.ndarray,
+    slot_seconds: int,
+    earliest: int,
+    latest: Optional[int],
+    per_group: int,
+) -> Tuple[List[int], List[int]]:
+    """The same computation as ``free_slot_indices``, one candidate slot at a time."""
+
+    bookings: dict = {}
+    for window, booked in zip(booked_windows.tolist(), booked_times.tolist()):
+        bookings.setdefault(window, []).append(booked)
+
+    candidates = []
+    for window, (group, start, end, is_open) in enumerate(
+        zip(groups.tolist(), starts.tolist(), ends.tolist(), open_windows.tolist())
+    ):
+        if not is_open:
+            continue
+        slot = start
+        while slot + slot_seconds <= end:
+            in_range = slot >= earliest and (latest is None or slot + slot_seconds <= latest)
+            if in_range and all(abs(slot - booked) >= slot_seconds for booked in bookings.get(window, ())):
+                candidates.append((group, slot, window))
+            slot += slot_seconds
+
+    candidates.sort(key=lambda candidate: (candidate[0], candidate[1]))
+    kept: dict = {}
+    window_index, slot_starts = [], []
+    for group, slot, window in candidates:
+        if kept.get(group, 0) < per_group:
+            kept[group] = kept.get(group, 0) + 1
+            window_index.append(window)
+            slot_starts.append(slot)
+    return window_index, slot_starts
+
+
+def _median_seconds(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doctors", type=int, default=200)
+    parser.add_argument("--windows", type=int, default=20, help="windows per doctor")
+    parser.add_argument("--bookings", type=int, default=6, help="bookings per doctor")
+    parser.add_argument("--slot-minutes", type=int, default=30)
+    parser.add_argument("--per-doctor", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    slot_seconds = args.slot_minutes * 60
+    options = dict(
+        _inputs(args.doctors, args.windows, args.bookings, slot_seconds, args.seed),
+        slot_seconds=slot_seconds,
+        earliest=2 * DAY,
+        latest=None,
+        per_group=args.per_doctor,
+    )
+
+    window_index, slot_starts = free_slot_indices(**options)
+    expected_index, expected_starts = python_free_slots(**options)
+    if window_index.tolist() != expected_index or slot_starts.tolist() != expected_starts:
+        sys.exit("NumPy engine and Python loop disagree")
+
+    numpy_seconds = _median_seconds(lambda: free_slot_indices(**options), args.repeat)
+    python_seconds = _median_seconds(lambda: python_free_slots(**options), args.repeat)
+    print(
+        f"{args.doctors} doctors x {args.windows} windows, {len(slot_starts)} free slots returned\n"
+        f"numpy engine: {numpy_seconds * 1000:.1f} ms\n"
+        f"python loop:  {python_seconds * 1000:.1f} ms ({python_seconds / numpy_seconds:.0f}x slower)"
+    )
+
+
+if __name__ == "__main__":
+    main()
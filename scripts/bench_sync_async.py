@@ -0,0 +1,150 @@
+"""Compare the sync and async service stacks under concurrent doctor discovery.
+
+Seeds ``--doctors`` doctors with schedules, then fires ``--requests``
+concurrent availability listings at an in-process ASGI app, once through a
+sync handler running ``PatientService`` on Starlette's threadpool and once
+through an async handler awaiting ``AsyncPatientService``. Both services
+build the same statements, so the difference is the execution model alone.
+Reports throughput and latency percentiles for each.
+
+    python scripts/bench_sync_async.py --doctors 200 --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _configure(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["USE_ASYNC_STACK"] = "true"
+    os.environ["ENABLE_BACKGROUND_WORKERS"] = "false"
+    os.environ["ENABLE_EVENT_SUBSCRIBERS"] = "false"
+
+
+def _seed(doctors: int, schedules: int) -> None:
+    from sqlalchemy import insert, select
+
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models import DoctorProfile, DoctorSchedule, User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    with SessionLocal() as session:
+        session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"doctor{index}@example.com",
+                    "full_name": f"Doctor {index}",
+                    "role": UserRole.DOCTOR,
+                    "hashed_password": "x",
+                }
+                for index in range(doctors)
+            ],
+        )
+        user_ids = session.scalars(select(User.id).order_by(User.id)).all()
+        session.execute(
+            insert(DoctorProfile),
+            [{"user_id": user_id, "specialization": ("Cardiology", "Dermatology")[user_id % 2]} for user_id in user_ids],
+        )
+        profile_ids = session.scalars(select(DoctorProfile.id).order_by(DoctorProfile.id)).all()
+        session.execute(
+            insert(DoctorSchedule),
+            [
+                {
+                    "doctor_id": profile_id,
+                    "start_time": start + timedelta(days=day),
+                    "end_time": start + timedelta(days=day, hours=4),
+                    "max_patients": 8,
+                }
+                for profile_id in profile_ids
+                for day in range(schedules)
+            ],
+        )
+        session.commit()
+
+
+def _build_app():
+    from fastapi import FastAPI
+
+    from app.db.async_session import AsyncSessionLocal
+    from app.db.session import SessionLocal
+    from app.services.patient_service import AsyncPatientService, PatientService
+
+    app = FastAPI()
+
+    @app.get("/sync-availability")
+    def sync_availability(specialization: str) -> dict:
+        with SessionLocal() as session:
+            entries = PatientService(session).list_doctor_availability(specialization=specialization)
+        return {"doctors": len(entries)}
+
+    @app.get("/async-availability")
+    async def async_availability(specialization: str) -> dict:
+        async with AsyncSessionLocal() as session:
+            entries = await AsyncPatientService(session).list_doctor_availability(specialization=specialization)
+        return {"doctors": len(entries)}
+
+    return app
+
+
+async def _run(app, path: str, requests: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def fetch(index: int) -> float:
+            started = time.perf_counter()
+            response = await client.get(path, params={"specialization": ("Cardio", "Derma")[index % 2]})
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = sorted(await asyncio.gather(*(fetch(index) for index in range(requests))))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed": elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doctors", type=int, default=100)
+    parser.add_argument("--schedules", type=int, default=5, help="schedules per doctor")
+    parser.add_argument("--requests", type=int, default=200, help="concurrent listings per run")
+    parser.add_argument("--database-url", help="sync URL; defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='bench-sync-async-')}/bench.db"
+    _configure(database_url)
+    _seed(args.doctors, args.schedules)
+    app = _build_app()
+
+    from app.db.async_session import async_engine
+
+    for label, path in (("sync service ", "/sync-availability"), ("async service", "/async-availability")):
+        result = asyncio.run(_run(app, path, args.requests))
+        print(
+            f"{label}: {args.requests} listings in {result['elapsed']:.2f}s "
+            f"({args.requests / result['elapsed']:.1f}/s); "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+    asyncio.run(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+# Settings and engines are built at import time, so the test database has to be
+# configured before anything from ``app`` is imported.
+_DATA_DIR = tempfile.mkdtemp(prefix="health-seeker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATA_DIR}/app.db"
+os.environ["ENABLE_BACKGROUND_WORKERS"] = "false"
+os.environ["ENABLE_OUTBOX_RELAY"] = "false"
+os.environ["ENABLE_EVENT_SUBSCRIBERS"] = "false"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+from typing import Any, Iterator
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.principal_cache import principal_cache
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+
+
+@pytest.fixture(autouse=True)
+def database() -> Iterator[None]:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    yield
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client() -> Iterator[Any]:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.config import get_settings
+from app.db.session import engine
+from app.models import DoctorProfile, DoctorSchedule, User, UserRole
+
+
+class StatementRecorder:
+    """Collect the SQL statements an engine executes while attached."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+
+    def __call__(self, conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def matching(self, prefix: str) -> List[str]:
+        return [statement for statement in self.statements if statement.lstrip().upper().startswith(prefix)]
+
+
+@contextmanager
+def count_queries(target: Engine = engine) -> Iterator[StatementRecorder]:
+    recorder = StatementRecorder()
+    event.listen(target, "before_cursor_execute", recorder)
+    try:
+        yield recorder
+    finally:
+        event.remove(target, "before_cursor_execute", recorder)
+
+
+def make_user(session: Session, email: str, role: UserRole = UserRole.PATIENT) -> User:
+    user = User(email=email, full_name=email, role=role, hashed_password="not-a-hash")
+    session.add(user)
+    session.commit()
+    return user
+
+
+def make_doctor(session: Session, email: str, specialization: str = "Cardiology") -> DoctorProfile:
+    user = make_user(session, email, UserRole.DOCTOR)
+    profile = DoctorProfile(user_id=user.id, specialization=specialization)
+    session.add(profile)
+    session.commit()
+    return profile
+
+
+def make_schedule(
+    session: Session,
+    profile: DoctorProfile,
+    *,
+    starts_in: timedelta = timedelta(days=1),
+    length: timedelta = timedelta(hours=2),
+    max_patients: int = 1,
+) -> DoctorSchedule:
+    start = datetime.utcnow().replace(microsecond=0) + starts_in
+    schedule = DoctorSchedule(
+        doctor_id=profile.id, start_time=start, end_time=start + length, max_patients=max_patients
+    )
+    session.add(schedule)
+    session.commit()
+    return schedule
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    settings = get_settings()
+    token = security.create_access_token(
+        user.id, secret_key=settings.jwt_secret_key, algorithm=settings.jwt_algorithm
+    )
+    return {"Authorization": f"Bearer {token}"}
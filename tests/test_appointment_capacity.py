@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models import Appointment, AppointmentStatus, DoctorSchedule
+from app.services.appointment_service import STATUS_CONFLICT_MESSAGE, AppointmentService
+from app.services.event_bus import EventBus
+from tests.helpers import make_doctor, make_schedule, make_user
+
+
+def _service(session) -> AppointmentService:
+    return AppointmentService(session, EventBus(), get_settings())
+
+
+def _book(session, schedule: DoctorSchedule, email: str) -> Appointment:
+    patient = make_user(session, email)
+    return _service(session).create_appointment(
+        patient_id=patient.id,
+        doctor_id=None,
+        schedule_id=schedule.id,
+        scheduled_time=schedule.start_time,
+        reason="Check-up",
+    )
+
+
+def _booked_count(schedule: DoctorSchedule) -> int:
+    with SessionLocal() as session:
+        return session.get(DoctorSchedule, schedule.id).booked_count
+
+
+def _change_status(appointment_id: int, status: AppointmentStatus) -> None:
+    with SessionLocal() as session:
+        _service(session).update_status(session.get(Appointment, appointment_id), status)
+
+
+def test_booking_a_full_schedule_is_rejected(session):
+    schedule = make_schedule(session, make_doctor(session, "doctor@example.com"), max_patients=1)
+    _book(session, schedule, "first@example.com")
+
+    with pytest.raises(ValueError, match="fully booked"):
+        _book(session, schedule, "second@example.com")
+    assert _booked_count(schedule) == 1
+
+
+def test_cancelling_releases_the_seat(session):
+    schedule = make_schedule(session, make_doctor(session, "doctor@example.com"), max_patients=1)
+    appointment = _book(session, schedule, "first@example.com")
+
+    _change_status(appointment.id, AppointmentStatus.CANCELLED)
+
+    assert _booked_count(schedule) == 0
+    session.expire_all()
+    _book(session, schedule, "second@example.com")
+    assert _booked_count(schedule) == 1
+
+
+def test_concurrent_cancels_release_the_seat_once(session):
+    schedule = make_schedule(session, make_doctor(session, "doctor@example.com"), max_patients=2)
+    appointment = _book(session, schedule, "first@example.com")
+    _book(session, schedule, "second@example.com")
+
+    # Both requests load the appointment while it is still pending.
+    with SessionLocal() as first, SessionLocal() as second:
+        loaded_first = first.get(Appointment, appointment.id)
+        loaded_second = second.get(Appointment, appointment.id)
+        first.commit()
+        second.commit()
+
+        _service(first).update_status(loaded_first, AppointmentStatus.CANCELLED)
+        with pytest.raises(ValueError, match=STATUS_CONFLICT_MESSAGE):
+            _service(second).update_status(loaded_second, AppointmentStatus.CANCELLED)
+
+    assert _booked_count(schedule) == 1
+
+
+def test_concurrent_reinstates_claim_the_seat_once(session):
+    schedule = make_schedule(session, make_doctor(session, "doctor@example.com"), max_patients=2)
+    appointment = _book(session, schedule, "first@example.com")
+    _change_status(appointment.id, AppointmentStatus.CANCELLED)
+
+    with SessionLocal() as first, SessionLocal() as second:
+        loaded_first = first.get(Appointment, appointment.id)
+        loaded_second = second.get(Appointment, appointment.id)
+        first.commit()
+        second.commit()
+
+        _service(first).update_status(loaded_first, AppointmentStatus.PENDING)
+        with pytest.raises(ValueError, match=STATUS_CONFLICT_MESSAGE):
+            _service(second).update_status(loaded_second, AppointmentStatus.PENDING)
+
+    assert _booked_count(schedule) == 1
+    with SessionLocal() as session:
+        assert session.get(Appointment, appointment.id).status == AppointmentStatus.PENDING
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models import Appointment, AppointmentStatus, BackgroundTaskRecord, BackgroundTaskStatus
+from app.services.appointment_service import AppointmentService
+from app.services.event_bus import EventBus
+from app.tasks import appointment_tasks
+from app.tasks.appointment_tasks import (
+    TASK_NAME,
+    _confirm_appointment,
+    _mark_failed,
+    confirm_appointments_batch_task,
+)
+from tests.helpers import count_queries, make_doctor, make_schedule, make_user
+
+
+def _task_record(session, status: BackgroundTaskStatus) -> BackgroundTaskRecord:
+    stale = datetime.utcnow() - timedelta(hours=1)
+    record = BackgroundTaskRecord(
+        task_name=TASK_NAME,
+        status=status,
+        idempotency_key=uuid.uuid4().hex,
+        created_at=stale,
+        updated_at=stale,
+    )
+    session.add(record)
+    session.commit()
+    return record
+
+
+def _reload_record(task_record_id: int) -> BackgroundTaskRecord:
+    with SessionLocal() as session:
+        return session.get(BackgroundTaskRecord, task_record_id)
+
+
+def _reload(record: BackgroundTaskRecord) -> BackgroundTaskRecord:
+    return _reload_record(record.id)
+
+
+def test_mark_failed_leaves_succeeded_records_alone(session):
+    succeeded = _task_record(session, BackgroundTaskStatus.SUCCEEDED)
+    queued = _task_record(session, BackgroundTaskStatus.QUEUED)
+
+    _mark_failed(succeeded.id, "late failure from a duplicate delivery")
+    _mark_failed(queued.id, "broker lost the connection")
+
+    assert _reload(succeeded).status == BackgroundTaskStatus.SUCCEEDED
+    assert _reload(succeeded).error_message is None
+    assert _reload(queued).status == BackgroundTaskStatus.FAILED
+    assert _reload(queued).error_message == "broker lost the connection"
+
+
+def test_missing_appointment_fails_the_record_and_bumps_updated_at(session):
+    record = _task_record(session, BackgroundTaskStatus.QUEUED)
+
+    _confirm_appointment(record.id, record.idempotency_key)
+
+    failed = _reload(record)
+    assert failed.status == BackgroundTaskStatus.FAILED
+    assert failed.error_message == "Appointment not found"
+    assert failed.updated_at > record.updated_at
+
+
+def _book(session, count: int) -> list[dict]:
+    """Book ``count`` appointments and return their confirmation payloads."""
+
+    profile = make_doctor(session, "doctor@example.com")
+    schedule = make_schedule(session, profile, max_patients=count)
+    service = AppointmentService(session, EventBus(), get_settings())
+    payloads = []
+    for index in range(count):
+        patient = make_user(session, f"patient{index}@example.com")
+        appointment = service.create_appointment(
+            patient_id=patient.id,
+            doctor_id=None,
+            schedule_id=schedule.id,
+            scheduled_time=schedule.start_time,
+            reason="Check-up",
+        )
+        [task] = appointment.tasks
+        payloads.append(
+            {
+                "appointment_id": appointment.id,
+                "task_record_id": task.id,
+                "idempotency_key": task.idempotency_key,
+            }
+        )
+    return payloads
+
+
+def _statuses(payloads: list[dict]) -> list[tuple[AppointmentStatus, BackgroundTaskStatus]]:
+    with SessionLocal() as session:
+        return [
+            (
+                session.get(Appointment, payload["appointment_id"]).status,
+                session.get(BackgroundTaskRecord, payload["task_record_id"]).status,
+            )
+            for payload in payloads
+        ]
+
+
+def test_batch_confirmation_fails_only_the_record_without_an_appointment(session):
+    payloads = _book(session, 3)
+    session.delete(session.get(Appointment, payloads[1]["appointment_id"]))
+    session.commit()
+    orphan = payloads.pop(1)
+
+    with count_queries() as recorder:
+        confirm_appointments_batch_task(payloads + [orphan])
+
+    assert _statuses(payloads) == [(AppointmentStatus.CONFIRMED, BackgroundTaskStatus.SUCCEEDED)] * 2
+    assert _reload_record(orphan["task_record_id"]).status == BackgroundTaskStatus.FAILED
+    # Claim, appointment lookup and the three settling UPDATEs, whatever the batch size.
+    assert recorder.count == 5
+
+
+def test_a_failing_item_does_not_hold_back_the_rest_of_the_batch(session, monkeypatch):
+    payloads = _book(session, 4)
+    poisoned = payloads[1]["task_record_id"]
+    confirm_one = appointment_tasks._confirm_appointment
+
+    def failing_bulk(tasks):
+        raise ConnectionError("lost the connection mid-batch")
+
+    def confirm_or_fail(task_record_id, idempotency_key):
+        if task_record_id == poisoned:
+            raise RuntimeError("cannot confirm this one")
+        confirm_one(task_record_id, idempotency_key)
+
+    monkeypatch.setattr(appointment_tasks, "_confirm_appointments_in_bulk", failing_bulk)
+    monkeypatch.setattr(appointment_tasks, "_confirm_appointment", confirm_or_fail)
+
+    confirm_appointments_batch_task(payloads)
+
+    statuses = _statuses(payloads)
+    assert statuses.pop(1) == (AppointmentStatus.PENDING, BackgroundTaskStatus.QUEUED)
+    assert statuses == [(AppointmentStatus.CONFIRMED, BackgroundTaskStatus.SUCCEEDED)] * 3
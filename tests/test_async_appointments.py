@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.db.async_session import build_async_engine
+from app.models import AppointmentStatus
+from app.models.outbox import OutboxMessage
+from app.schemas.appointment import AppointmentPublic
+from app.services.appointment_service import AppointmentService, AsyncAppointmentService
+from app.services.event_bus import EventBus
+from tests.helpers import count_queries, make_doctor, make_schedule, make_user
+
+T = TypeVar("T")
+
+
+def _run(scenario: Callable[[AsyncSession], Awaitable[T]]) -> tuple[T, int]:
+    """Run ``scenario`` on a fresh async session; returns its result and query count."""
+
+    async def run() -> tuple[T, int]:
+        engine = build_async_engine(get_settings())
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                with count_queries(engine.sync_engine) as recorder:
+                    return await scenario(session), recorder.count
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _booking(session, max_patients: int = 2) -> dict:
+    schedule = make_schedule(session, make_doctor(session, "doctor@example.com"), max_patients=max_patients)
+    patient = make_user(session, "patient@example.com")
+    return {
+        "patient_id": patient.id,
+        "doctor_id": None,
+        "schedule_id": schedule.id,
+        "scheduled_time": schedule.start_time,
+        "reason": "Check-up",
+    }
+
+
+def _outbox(session) -> list[tuple[str, str]]:
+    session.expire_all()
+    messages = session.scalars(select(OutboxMessage).order_by(OutboxMessage.id))
+    return [(message.kind.value, message.name) for message in messages]
+
+
+@pytest.mark.parametrize("workers", [True, False])
+def test_both_stacks_stage_the_same_booking_messages(session, workers):
+    settings = Settings(enable_background_workers=workers)
+    booking = _booking(session)
+
+    AppointmentService(session, EventBus(), settings).create_appointment(**booking)
+    sync_messages = _outbox(session)
+    session.query(OutboxMessage).delete()
+    session.commit()
+
+    second = {**booking, "patient_id": make_user(session, "second@example.com").id}
+    _run(lambda async_session: AsyncAppointmentService(async_session, EventBus(), settings).create_appointment(**second))
+
+    expected = [("event", "appointment.created")]
+    if workers:
+        expected.insert(0, ("task", "schedule_appointment"))
+    assert sync_messages == expected
+    assert _outbox(session) == expected
+
+
+def test_async_updates_return_the_loaded_appointment_without_reloading(session):
+    booking = _booking(session)
+    appointment_id = AppointmentService(session, EventBus(), get_settings()).create_appointment(**booking).id
+
+    async def update(async_session: AsyncSession) -> tuple[AppointmentPublic, AppointmentPublic]:
+        service = AsyncAppointmentService(async_session, EventBus(), get_settings())
+        appointment = await service.get(appointment_id)
+        confirmed = await service.update_status(appointment, AppointmentStatus.CONFIRMED)
+        status_result = AppointmentPublic.model_validate(confirmed)
+        noted = await service.update_details(
+            confirmed, scheduled_time=None, notes="Bring results", diagnosis=None, prescription=None
+        )
+        return status_result, AppointmentPublic.model_validate(noted)
+
+    (after_status, after_details), queries = _run(update)
+
+    # Load, the conditional status UPDATE and the details UPDATE; serializing lazy-loads nothing.
+    assert queries == 3
+    assert after_status.status == AppointmentStatus.CONFIRMED
+    assert after_details.notes == "Bring results" and after_details.status == AppointmentStatus.CONFIRMED
+    fresh = AppointmentService(session, EventBus(), get_settings()).get(appointment_id)
+    session.refresh(fresh)
+    assert AppointmentPublic.model_validate(fresh) == after_details
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models.audit import AuditLog
+from app.schemas.events import DomainEvent
+from app.subscribers.audit import BufferedAuditWriter
+
+
+class FlakySessionFactory:
+    """Session factory whose sessions fail to write while ``down`` is set."""
+
+    def __init__(self) -> None:
+        self.down = True
+        self.attempts = 0
+
+    def __call__(self):
+        session = SessionLocal()
+        if self.down:
+            def failing_execute(*args, **kwargs):
+                self.attempts += 1
+                raise ConnectionError("database unavailable")
+
+            session.execute = failing_execute
+        return session
+
+
+def _event(index: int) -> DomainEvent:
+    return DomainEvent(name="appointment.created", payload={"index": index}, occurred_at=datetime.utcnow())
+
+
+def test_failed_flushes_back_off_and_the_buffer_is_capped():
+    factory = FlakySessionFactory()
+    writer = BufferedAuditWriter(
+        factory, max_batch_size=10, flush_interval=60.0, max_buffered=50, max_retry_delay=60.0
+    )
+
+    for index in range(500):
+        writer.add(_event(index))
+
+    stats = writer.stats()
+    # One automatic flush failed; later adds wait for the retry delay instead of
+    # hitting the database again on the publisher's thread.
+    assert factory.attempts == 1
+    assert stats["buffered"] == 50
+    assert stats["dropped_rows"] == 450
+
+    factory.down = False
+    assert writer.flush() == 50
+    with SessionLocal() as session:
+        payloads = session.scalars(select(AuditLog.payload).order_by(AuditLog.id)).all()
+    assert [payload["index"] for payload in payloads] == list(range(450, 500))
+
+
+def test_successful_flush_resets_the_backoff():
+    factory = FlakySessionFactory()
+    writer = BufferedAuditWriter(factory, max_batch_size=2, flush_interval=60.0)
+
+    writer.add(_event(0))
+    writer.add(_event(1))
+    assert writer.stats()["failed_flushes"] == 1
+
+    factory.down = False
+    writer.flush()
+    writer.add(_event(2))
+    writer.add(_event(3))
+
+    with SessionLocal() as session:
+        assert session.scalar(select(func.count()).select_from(AuditLog)) == 4
+    assert writer.stats()["buffered"] == 0
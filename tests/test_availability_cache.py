@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from app.core.config import Settings
+from app.schemas.user import UserUpdate
+from app.services.availability_cache import (
+    AvailabilityCache,
+    LRUAvailabilityBackend,
+    RedisAvailabilityBackend,
+    build_availability_cache,
+)
+from app.services.event_bus import EventBus
+from app.services.user_service import UserService
+from tests.helpers import make_doctor
+
+EARLIEST = datetime(2030, 1, 1)
+
+
+class _Loader:
+    """Counts database loads; the listing itself does not matter here."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, window_start: datetime) -> list:
+        self.calls += 1
+        return []
+
+
+def _list(cache: AvailabilityCache, loader: _Loader, specialization: str | None = "cardio") -> None:
+    cache.get_or_load(specialization=specialization, earliest=EARLIEST, latest=None, load=loader)
+
+
+def _redis_cache(server: fakeredis.FakeServer) -> AvailabilityCache:
+    return AvailabilityCache(RedisAvailabilityBackend(fakeredis.FakeStrictRedis(server=server)))
+
+
+def test_redis_invalidation_in_one_process_reaches_the_others():
+    server = fakeredis.FakeServer()
+    first, second = _redis_cache(server), _redis_cache(server)
+    loader = _Loader()
+
+    _list(first, loader)
+    _list(second, loader)
+    _list(first, loader, specialization="derm")
+    assert loader.calls == 2
+
+    second.invalidate(["Cardiology"])
+    _list(first, loader)
+    _list(first, loader, specialization="derm")
+
+    assert loader.calls == 3
+    assert first.stats()["hits"] == 1 and second.stats()["invalidations"] == 1
+
+
+def test_redis_versions_reset_when_full_without_reusing_old_versions():
+    backend = RedisAvailabilityBackend(fakeredis.FakeStrictRedis(), max_filters=2)
+    first, second = backend.version("cardio"), backend.version("derm")
+
+    third = backend.version("neuro")
+
+    assert backend.stats()["filters"] == 1
+    assert backend.version("cardio") > third > second > first
+    assert backend.bump(lambda filter_key: True) == 2
+    assert backend.version("neuro") > third
+
+
+class _InterleavedBackend(RedisAvailabilityBackend):
+    """Lets another process assign and bump versions between WATCH and MULTI once."""
+
+    def __init__(self, client, other: RedisAvailabilityBackend) -> None:
+        super().__init__(client, max_filters=2)
+        self.other = other
+        self.attempts = 0
+
+    def _assign_version(self, pipeline, filter_key: str) -> int:
+        self.attempts += 1
+        if self.attempts == 1:
+            self.other.version("derm")
+            self.other.bump(lambda key: key == "derm")
+        return super()._assign_version(pipeline, filter_key)
+
+
+def test_concurrent_redis_version_changes_retry_the_assignment():
+    server = fakeredis.FakeServer()
+    other = RedisAvailabilityBackend(fakeredis.FakeStrictRedis(server=server), max_filters=2)
+    backend = _InterleavedBackend(fakeredis.FakeStrictRedis(server=server), other)
+
+    version = backend.version("cardio")
+
+    assert backend.attempts == 2
+    assert version > other.version("derm")
+    assert backend.version("cardio") == version
+
+
+def test_unreachable_redis_falls_back_to_the_database():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    cache = _redis_cache(server)
+    loader = _Loader()
+
+    _list(cache, loader)
+    _list(cache, loader)
+    cache.invalidate(["Cardiology"])
+
+    assert loader.calls == 2
+    # Two failed lookups, which skip the store, and the failed invalidation.
+    assert cache.stats()["errors"] == 3
+
+
+def test_memory_backend_requires_a_single_api_process():
+    single = build_availability_cache(Settings(availability_cache_backend="memory"))
+    assert isinstance(single.backend, LRUAvailabilityBackend)
+
+    with pytest.raises(ValueError, match="WEB_CONCURRENCY=4"):
+        build_availability_cache(Settings(availability_cache_backend="memory", web_concurrency=4))
+    assert build_availability_cache(Settings(availability_cache_backend="redis", web_concurrency=4)) is not None
+
+
+def test_deactivating_a_doctor_drops_their_cached_listings(session):
+    profile = make_doctor(session, "doctor@example.com")
+    event_bus = EventBus()
+    cache = _redis_cache(fakeredis.FakeServer())
+    cache.register(event_bus)
+    loader = _Loader()
+    users = UserService(session, event_bus)
+
+    _list(cache, loader)
+    users.update(profile.user, UserUpdate(full_name="Renamed"))
+    _list(cache, loader)
+    assert loader.calls == 1
+
+    users.update(profile.user, UserUpdate(is_active=False))
+    _list(cache, loader)
+    users.update(profile.user, UserUpdate(is_active=False))
+    _list(cache, loader)
+
+    assert loader.calls == 2
+    cache.unregister(event_bus)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.core.config import get_settings
+from app.models import DoctorAvailabilityRule, DoctorSchedule
+from app.services.appointment_service import OCCURRENCE_CONFLICT_MESSAGE, AppointmentService
+from app.services.event_bus import EventBus
+from app.services.patient_service import PatientService
+from tests.helpers import make_doctor, make_user
+
+
+def _tomorrow_at(hour: int) -> datetime:
+    return datetime.combine(date.today() + timedelta(days=1), time(hour))
+
+
+@pytest.fixture
+def doctor_with_overlap(session):
+    """A daily 9:00-12:00 rule and an inactive concrete schedule tomorrow at 11:00-13:00."""
+
+    profile = make_doctor(session, "doctor@example.com")
+    rule = DoctorAvailabilityRule(
+        doctor_id=profile.id,
+        weekday_mask=0b1111111,
+        start_time=time(9),
+        end_time=time(12),
+        valid_from=date.today(),
+        max_patients=2,
+    )
+    session.add_all(
+        [
+            rule,
+            DoctorSchedule(
+                doctor_id=profile.id,
+                start_time=_tomorrow_at(11),
+                end_time=_tomorrow_at(13),
+                max_patients=1,
+                is_active=False,
+            ),
+        ]
+    )
+    session.commit()
+    return profile, rule
+
+
+def _window() -> tuple[datetime, datetime]:
+    earliest = datetime.combine(date.today() + timedelta(days=1), time.min)
+    return earliest, earliest + timedelta(days=2)
+
+
+def test_occurrences_overlapping_a_schedule_are_not_offered(session, doctor_with_overlap):
+    profile, _ = doctor_with_overlap
+    earliest, latest = _window()
+    service = PatientService(session)
+
+    occurrences = service.list_rule_occurrences(doctor_profile_id=profile.id, earliest=earliest, latest=latest)
+    [(_, schedules, listed)] = service.list_doctor_availability(earliest=earliest, latest=latest)
+    [(_, slots)] = service.list_free_slots(earliest=earliest, latest=latest)
+    [(_, option)] = service.find_earliest_available(earliest=earliest, latest=latest)
+
+    day_after = earliest.date() + timedelta(days=1)
+    assert [occurrence.start_time.date() for occurrence in occurrences] == [day_after]
+    assert listed == occurrences
+    assert schedules == []
+    assert {slot.start_time.date() for slot in slots} == {day_after}
+    assert option.start_time.date() == day_after
+
+
+def test_booking_an_overlapping_occurrence_is_rejected(session, doctor_with_overlap):
+    _, rule = doctor_with_overlap
+    patient = make_user(session, "patient@example.com")
+    service = AppointmentService(session, EventBus(), get_settings())
+
+    with pytest.raises(ValueError, match=OCCURRENCE_CONFLICT_MESSAGE):
+        service.create_appointment(
+            patient_id=patient.id,
+            doctor_id=None,
+            schedule_id=None,
+            rule_id=rule.id,
+            scheduled_time=_tomorrow_at(9),
+            reason="Check-up",
+        )
+    assert session.query(DoctorSchedule).count() == 1
+
+    appointment = service.create_appointment(
+        patient_id=patient.id,
+        doctor_id=None,
+        schedule_id=None,
+        rule_id=rule.id,
+        scheduled_time=_tomorrow_at(9) + timedelta(days=1),
+        reason="Check-up",
+    )
+    assert appointment.schedule.rule_id == rule.id
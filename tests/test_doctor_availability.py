@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.models import DoctorAvailabilityRule
+from app.schemas import doctor as doctor_schema
+from app.services.patient_service import PatientService
+from tests.helpers import count_queries, make_doctor, make_schedule
+
+
+def _seed_doctors(session, count: int) -> None:
+    for index in range(count):
+        profile = make_doctor(session, f"doctor{index}@example.com")
+        make_schedule(session, profile, starts_in=timedelta(days=1))
+        make_schedule(session, profile, starts_in=timedelta(days=2))
+        session.add(
+            DoctorAvailabilityRule(
+                doctor_id=profile.id,
+                weekday_mask=0b1111111,
+                start_time=time(9),
+                end_time=time(12),
+                valid_from=date.today(),
+                max_patients=2,
+            )
+        )
+    session.commit()
+
+
+def _serialize(availability) -> list[doctor_schema.DoctorAvailability]:
+    return [
+        doctor_schema.DoctorAvailability(
+            doctor=doctor_schema.DoctorProfilePublic.model_validate(profile),
+            schedules=[doctor_schema.DoctorSchedulePublic.model_validate(schedule) for schedule in schedules],
+            occurrences=[doctor_schema.AvailabilityOccurrence.model_validate(occurrence) for occurrence in occurrences],
+        )
+        for profile, schedules, occurrences in availability
+    ]
+
+
+def _listing_queries(earliest: datetime) -> tuple[int, int]:
+    with SessionLocal() as session, count_queries() as recorder:
+        listing = _serialize(
+            PatientService(session).list_doctor_availability(
+                earliest=earliest, latest=earliest + timedelta(days=7)
+            )
+        )
+    return recorder.count, len(listing)
+
+
+@pytest.mark.parametrize("doctors", [1, 5, 25])
+def test_availability_listing_runs_a_fixed_number_of_queries(session, doctors):
+    _seed_doctors(session, doctors)
+
+    queries, listed = _listing_queries(datetime.utcnow())
+
+    assert listed == doctors
+    # Profiles with their users, schedules and availability rules, whatever the
+    # number of doctors; serializing the result must not lazy load anything.
+    assert queries == 3
+
+
+def test_availability_listing_includes_schedules_and_occurrences(session):
+    _seed_doctors(session, 2)
+
+    with SessionLocal() as reader:
+        availability = PatientService(reader).list_doctor_availability(
+            earliest=datetime.utcnow(), latest=datetime.utcnow() + timedelta(days=3)
+        )
+
+    for _, schedules, occurrences in availability:
+        assert len(schedules) == 2
+        assert 2 <= len(occurrences) <= 4
+
+
+def _per_doctor_listing(service: PatientService, *, earliest: datetime, latest: datetime):
+    """The listing as the per-doctor endpoints build it: one profile at a time."""
+
+    availability = []
+    for profile in service.list_available_doctor_profiles():
+        schedules = service.list_active_schedules(doctor_profile_id=profile.id, earliest=earliest, latest=latest)
+        occurrences = service.list_rule_occurrences(doctor_profile_id=profile.id, earliest=earliest, latest=latest)
+        if schedules or occurrences:
+            availability.append((profile, schedules, occurrences))
+    return availability
+
+
+def test_availability_listing_matches_the_per_doctor_path(session):
+    _seed_doctors(session, 5)
+    inactive = make_doctor(session, "inactive@example.com", specialization="Dermatology")
+    make_schedule(session, inactive)
+    inactive.user.is_active = False
+    idle = make_doctor(session, "idle@example.com", specialization="Neurology")
+    make_schedule(session, idle, starts_in=timedelta(days=30))
+    session.commit()
+    earliest = datetime.utcnow()
+    latest = earliest + timedelta(days=3)
+
+    with SessionLocal() as reader:
+        service = PatientService(reader)
+        batched = _serialize(service.list_doctor_availability(earliest=earliest, latest=latest))
+        per_doctor = _serialize(_per_doctor_listing(service, earliest=earliest, latest=latest))
+
+    assert len(batched) == 5
+    assert batched == per_doctor
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.async_session import build_async_engine
+from app.db.session import SessionLocal
+from app.models import DoctorAvailabilityRule, DoctorSchedule, User
+from app.services.patient_service import AsyncPatientService, PatientService
+from tests.helpers import count_queries, make_doctor
+
+EARLIEST = datetime.combine(date.today() + timedelta(days=1), time.min)
+
+
+def _schedule(session, profile, hour: int, *, days: int = 0) -> DoctorSchedule:
+    start = EARLIEST + timedelta(days=days, hours=hour)
+    schedule = DoctorSchedule(doctor_id=profile.id, start_time=start, end_time=start + timedelta(hours=1))
+    session.add(schedule)
+    session.commit()
+    return schedule
+
+
+def _starts(options) -> list[tuple[int, datetime]]:
+    return [(profile.id, option.start_time) for profile, option in options]
+
+
+def test_schedules_and_rule_occurrences_are_merged_in_start_order(session):
+    first, second = make_doctor(session, "first@example.com"), make_doctor(session, "second@example.com")
+    _schedule(session, first, 14)
+    _schedule(session, second, 8)
+    session.add(
+        DoctorAvailabilityRule(
+            doctor_id=second.id,
+            weekday_mask=0b1111111,
+            start_time=time(11),
+            end_time=time(12),
+            valid_from=EARLIEST.date(),
+            max_patients=2,
+        )
+    )
+    session.commit()
+
+    options = PatientService(session).find_earliest_available(earliest=EARLIEST, limit=4, per_doctor=3)
+
+    assert _starts(options) == [
+        (second.id, EARLIEST + timedelta(hours=8)),
+        (second.id, EARLIEST + timedelta(hours=11)),
+        (first.id, EARLIEST + timedelta(hours=14)),
+        (second.id, EARLIEST + timedelta(days=1, hours=11)),
+    ]
+    assert options[1][1].rule_id is not None and options[0][1].schedule_id is not None
+
+
+def test_per_doctor_caps_the_options_of_each_doctor(session):
+    busy, other = make_doctor(session, "busy@example.com"), make_doctor(session, "other@example.com")
+    for hour in (8, 9, 10):
+        _schedule(session, busy, hour)
+    _schedule(session, other, 12)
+    service = PatientService(session)
+
+    assert _starts(service.find_earliest_available(earliest=EARLIEST, per_doctor=1)) == [
+        (busy.id, EARLIEST + timedelta(hours=8)),
+        (other.id, EARLIEST + timedelta(hours=12)),
+    ]
+    assert _starts(service.find_earliest_available(earliest=EARLIEST, per_doctor=2)) == [
+        (busy.id, EARLIEST + timedelta(hours=8)),
+        (busy.id, EARLIEST + timedelta(hours=9)),
+        (other.id, EARLIEST + timedelta(hours=12)),
+    ]
+
+
+def test_the_search_stops_after_limit_options(session):
+    profiles = [make_doctor(session, f"doctor{index}@example.com") for index in range(10)]
+    for day in range(10):
+        for profile in profiles:
+            _schedule(session, profile, 9, days=day)
+
+    with count_queries() as recorder:
+        options = PatientService(session).find_earliest_available(earliest=EARLIEST, limit=3)
+
+    assert len(options) == 3
+    assert {option.start_time for _, option in options} == {EARLIEST + timedelta(hours=9)}
+    # One page of the schedule stream covers the limit; the other 97 schedules are never read.
+    pages = [statement for statement in recorder.matching("SELECT") if "FROM doctor_schedules" in statement]
+    assert len(pages) == 1
+
+
+def test_doctors_deactivated_during_the_search_are_left_out(session, monkeypatch):
+    gone, staying = make_doctor(session, "gone@example.com"), make_doctor(session, "staying@example.com")
+    _schedule(session, gone, 8)
+    _schedule(session, staying, 9)
+    stream = PatientService._bookable_schedules
+
+    def deactivate_after_stream(self, *args, **kwargs):
+        yield from stream(self, *args, **kwargs)
+        with SessionLocal() as other:
+            other.get(User, gone.user_id).is_active = False
+            other.commit()
+
+    monkeypatch.setattr(PatientService, "_bookable_schedules", deactivate_after_stream)
+
+    options = PatientService(session).find_earliest_available(earliest=EARLIEST)
+
+    assert _starts(options) == [(staying.id, EARLIEST + timedelta(hours=9))]
+
+
+def test_async_service_matches_the_sync_service(session):
+    first, second = make_doctor(session, "first@example.com"), make_doctor(session, "second@example.com")
+    for hour in (8, 9):
+        _schedule(session, first, hour)
+    _schedule(session, second, 10)
+
+    async def search() -> list:
+        engine = build_async_engine(get_settings())
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as async_session:
+                return await AsyncPatientService(async_session).find_earliest_available(
+                    earliest=EARLIEST, per_doctor=2
+                )
+        finally:
+            await engine.dispose()
+
+    expected = PatientService(session).find_earliest_available(earliest=EARLIEST, per_doctor=2)
+    assert [option for _, option in asyncio.run(search())] == [option for _, option in expected]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from app.schemas.events import DomainEvent
+from app.services.event_bus import EventBus, OverflowPolicy
+
+EVENT = "appointment.created"
+
+
+class _Recorder:
+    """Records the events it receives and the threads they were delivered on."""
+
+    def __init__(self) -> None:
+        self.numbers: List[int] = []
+        self.threads: List[int] = []
+
+    def __call__(self, event: DomainEvent) -> None:
+        self.numbers.append(event.payload["number"])
+        self.threads.append(threading.get_ident())
+
+
+class _Gate:
+    """A handler that holds the dispatch worker until ``open`` is called."""
+
+    def __init__(self) -> None:
+        self.entered = threading.Event()
+        self.released = threading.Event()
+        self.threads: List[int] = []
+
+    def __call__(self, event: DomainEvent) -> None:
+        self.threads.append(threading.get_ident())
+        self.entered.set()
+        assert self.released.wait(5)
+
+    def open(self) -> None:
+        self.released.set()
+
+
+@pytest.fixture
+def started() -> Iterator[List[EventBus]]:
+    """Buses started by a test; shut down afterwards even if the test fails."""
+
+    buses: List[EventBus] = []
+    yield buses
+    for bus in buses:
+        for handlers in bus._subscribers.values():
+            for handler in handlers:
+                if isinstance(handler, _Gate):
+                    handler.open()
+        bus.shutdown(timeout=5)
+
+
+def _start(started: List[EventBus], **options) -> EventBus:
+    bus = EventBus(async_dispatch=True, **options)
+    bus.start()
+    started.append(bus)
+    return bus
+
+
+def _full_bus(started: List[EventBus], policy: OverflowPolicy, **options):
+    """A bus whose single worker is held by event 1 and whose one-slot queue holds event 2."""
+
+    bus = _start(started, max_queue_size=1, overflow_policy=policy, **options)
+    gate, recorder = _Gate(), _Recorder()
+    bus.subscribe(EVENT, gate)
+    bus.subscribe(EVENT, recorder)
+    bus.publish(EVENT, {"number": 1})
+    assert gate.entered.wait(5)
+    bus.publish(EVENT, {"number": 2})
+    return bus, gate, recorder
+
+
+def test_failing_handler_does_not_affect_the_publisher_or_other_handlers(started):
+    bus = _start(started)
+    recorder = _Recorder()
+
+    def fail(event: DomainEvent) -> None:
+        raise RuntimeError("handler bug")
+
+    bus.subscribe(EVENT, fail)
+    bus.subscribe(EVENT, recorder)
+    for number in range(3):
+        bus.publish(EVENT, {"number": number})
+    bus.flush()
+
+    assert recorder.numbers == [0, 1, 2]
+    assert bus.stats()["handler_errors"] == 3 and bus.stats()["dispatched"] == 3
+
+
+def test_drop_policy_discards_events_when_the_queue_is_full(started):
+    bus, gate, recorder = _full_bus(started, OverflowPolicy.DROP)
+
+    bus.publish(EVENT, {"number": 3})
+    gate.open()
+    bus.flush()
+
+    assert recorder.numbers == [1, 2]
+    assert bus.stats()["dropped"] == 1
+
+
+def test_inline_policy_delivers_on_the_publishing_thread_when_the_queue_is_full(started):
+    bus, gate, recorder = _full_bus(started, OverflowPolicy.INLINE)
+
+    overflow = threading.Thread(target=bus.publish, args=(EVENT, {"number": 3}))
+    overflow.start()
+    # The overflow event reaches the handlers on the publishing thread while the worker is still held.
+    deadline = time.monotonic() + 5
+    while overflow.ident not in gate.threads and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert overflow.ident in gate.threads
+    gate.open()
+    overflow.join(5)
+    bus.flush()
+
+    assert sorted(recorder.numbers) == [1, 2, 3]
+    assert recorder.threads[recorder.numbers.index(3)] == overflow.ident
+    assert bus.stats()["dropped"] == 0
+
+
+def test_block_policy_waits_for_space_then_drops_after_the_timeout(started):
+    bus, gate, recorder = _full_bus(started, OverflowPolicy.BLOCK, block_timeout=0.1)
+
+    started_at = time.perf_counter()
+    bus.publish(EVENT, {"number": 3})
+    assert time.perf_counter() - started_at >= 0.1
+    assert bus.stats()["dropped"] == 1
+
+    threading.Timer(0.05, gate.open).start()
+    bus.block_timeout = 5
+    bus.publish(EVENT, {"number": 4})
+    bus.flush()
+
+    assert recorder.numbers == [1, 2, 4]
+    assert bus.stats()["dropped"] == 1
+
+
+def test_shutdown_delivers_queued_events(started):
+    bus = _start(started, worker_count=2, batch_size=3)
+    recorder = _Recorder()
+
+    def slow(event: DomainEvent) -> None:
+        time.sleep(0.002)
+
+    bus.subscribe(EVENT, slow)
+    bus.subscribe(EVENT, recorder)
+    for number in range(50):
+        bus.publish(EVENT, {"number": number})
+    bus.shutdown(timeout=5)
+
+    assert sorted(recorder.numbers) == list(range(50))
+    assert bus.stats()["queued"] == 0
+
+    bus.publish(EVENT, {"number": 50})
+    assert recorder.numbers[-1] == 50 and recorder.threads[-1] == threading.get_ident()
+
+
+def test_inline_subscribers_run_before_publish_returns(started):
+    bus, gate, recorder = _full_bus(started, OverflowPolicy.DROP)
+    inline = _Recorder()
+    bus.subscribe(EVENT, inline, inline=True)
+
+    bus.publish(EVENT, {"number": 3})
+
+    # The workers are still held, yet the inline subscriber saw the event on this thread.
+    assert inline.numbers == [3] and inline.threads == [threading.get_ident()]
+    assert recorder.numbers == []
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+
+import pytest
+from sqlalchemy import insert, inspect, select
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import (
+    Appointment,
+    AppointmentStatus,
+    BackgroundTaskRecord,
+    BackgroundTaskStatus,
+    DoctorAvailabilityRule,
+    DoctorProfile,
+    DoctorSchedule,
+    LabResult,
+    User,
+    UserRole,
+)
+from app.services.appointment_service import AppointmentService, _patient_conflict_statement
+from app.services.background_task_service import BackgroundTaskService
+from app.services.doctor_service import _schedule_conflict_statement
+from app.services.event_bus import EventBus
+from app.services.lab_result_service import LabResultService
+from app.services.patient_service import (
+    PatientService,
+    _availability_schedules_statement,
+    _available_profiles_statement,
+    _blocking_windows_statement,
+    _rules_statement,
+)
+from app.tasks.appointment_tasks import _confirm_appointment, _latest_task_record_id
+from tests.helpers import count_queries
+
+EXPECTED_INDEXES = {
+    "appointments": {
+        "ix_appointments_patient_scheduled": ["patient_id", "scheduled_time", "id"],
+        "ix_appointments_doctor_scheduled": ["doctor_id", "scheduled_time", "id"],
+        "ix_appointments_schedule_id": ["schedule_id"],
+    },
+    "doctor_schedules": {
+        "ix_doctor_schedules_doctor_window": ["doctor_id", "start_time", "end_time"],
+        "ix_doctor_schedules_active_start": ["start_time"],
+    },
+    "lab_results": {
+        "ix_lab_results_patient_recorded": ["patient_id", "recorded_at", "id"],
+    },
+    "background_task_records": {
+        "ix_background_task_records_appointment_created": ["appointment_id", "created_at", "id"],
+    },
+}
+
+DOCTORS = 200
+SCHEDULES_PER_DOCTOR = 30
+PATIENTS = 1_000
+APPOINTMENTS_PER_PATIENT = 10
+LAB_RESULTS_PER_PATIENT = 10
+
+
+@pytest.mark.parametrize("table", sorted(EXPECTED_INDEXES))
+def test_composite_indexes_are_created(table):
+    indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes(table)}
+    for name, columns in EXPECTED_INDEXES[table].items():
+        assert indexes.get(name) == columns
+
+
+def _ids(session, column) -> list[int]:
+    return session.scalars(select(column).order_by(column)).all()
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """Thousands of rows per table, inserted in bulk and ANALYZEd so plans reflect real statistics.
+
+    Seeded once for the module; the tests only read, apart from claiming one task record.
+    """
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        return _seed(session)
+
+
+@pytest.fixture(autouse=True)
+def database(seeded):
+    """Replaces the per-test reset from conftest with the module's seeded database."""
+
+    yield
+
+
+def _seed(session) -> dict:
+    now = datetime.utcnow().replace(microsecond=0)
+    session.execute(
+        insert(User),
+        [
+            {"email": f"doctor{index}@example.com", "full_name": "Doctor", "role": UserRole.DOCTOR, "hashed_password": "x"}
+            for index in range(DOCTORS)
+        ]
+        + [
+            {"email": f"patient{index}@example.com", "full_name": "Patient", "role": UserRole.PATIENT, "hashed_password": "x"}
+            for index in range(PATIENTS)
+        ],
+    )
+    doctor_users = session.scalars(select(User.id).where(User.role == UserRole.DOCTOR).order_by(User.id)).all()
+    patients = session.scalars(select(User.id).where(User.role == UserRole.PATIENT).order_by(User.id)).all()
+    session.execute(
+        insert(DoctorProfile),
+        [{"user_id": user_id, "specialization": ("Cardiology", "Dermatology", "Neurology")[user_id % 3]} for user_id in doctor_users],
+    )
+    profiles = _ids(session, DoctorProfile.id)
+    session.execute(
+        insert(DoctorSchedule),
+        [
+            {
+                "doctor_id": profile_id,
+                "start_time": now + timedelta(days=day - 10, hours=8),
+                "end_time": now + timedelta(days=day - 10, hours=12),
+                "max_patients": 8,
+                "booked_count": min(day % 9, 8),
+                "is_active": day % 7 != 0,
+            }
+            for profile_id in profiles
+            for day in range(SCHEDULES_PER_DOCTOR)
+        ],
+    )
+    session.execute(
+        insert(DoctorAvailabilityRule),
+        [
+            {
+                "doctor_id": profile_id,
+                "weekday_mask": 0b0011111,
+                "start_time": start,
+                "end_time": start.replace(hour=start.hour + 2),
+                "valid_from": date.today() - timedelta(days=30),
+                "excluded_dates": [],
+                "max_patients": 4,
+            }
+            for profile_id in profiles
+            for start in (time(13), time(15), time(17))
+        ],
+    )
+    schedules = session.execute(select(DoctorSchedule.id, DoctorSchedule.doctor_id, DoctorSchedule.start_time)).all()
+    doctor_of_profile = dict(zip(profiles, doctor_users))
+    session.execute(
+        insert(Appointment),
+        [
+            {
+                "patient_id": patient_id,
+                "doctor_id": doctor_of_profile[schedule.doctor_id],
+                "schedule_id": schedule.id,
+                "scheduled_time": schedule.start_time + timedelta(minutes=index),
+                "reason": "check-up",
+                "status": AppointmentStatus.PENDING,
+            }
+            for position, patient_id in enumerate(patients)
+            for index in range(APPOINTMENTS_PER_PATIENT)
+            for schedule in (schedules[(position * APPOINTMENTS_PER_PATIENT + index) % len(schedules)],)
+        ],
+    )
+    appointments = _ids(session, Appointment.id)
+    session.execute(
+        insert(BackgroundTaskRecord),
+        [
+            {
+                "task_name": "schedule_appointment",
+                "status": BackgroundTaskStatus.QUEUED,
+                "appointment_id": appointment_id,
+                "idempotency_key": f"key-{appointment_id}",
+            }
+            for appointment_id in appointments
+        ],
+    )
+    session.execute(
+        insert(LabResult),
+        [
+            {
+                "patient_id": patient_id,
+                "test_name": "cbc",
+                "result_data": {},
+                "recorded_at": now - timedelta(days=index),
+            }
+            for patient_id in patients
+            for index in range(LAB_RESULTS_PER_PATIENT)
+        ],
+    )
+    session.commit()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    # Pooled connections keep the statistics they loaded when they were opened.
+    engine.dispose()
+    return {
+        "now": now,
+        "patient_id": patients[0],
+        "doctor_user_id": doctor_users[0],
+        "profile_id": profiles[0],
+        "appointment_id": appointments[0],
+    }
+
+
+def _plan(run: Callable[[], object], matches: Callable[[str], bool] = lambda sql: sql.startswith("SELECT")) -> str:
+    """EXPLAIN QUERY PLAN the first statement issued by ``run`` that ``matches``, as one string."""
+
+    with count_queries() as recorder:
+        run()
+    index = next(i for i, statement in enumerate(recorder.statements) if matches(statement.lstrip()))
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + recorder.statements[index], recorder.parameters[index]
+        ).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def _statement_plan(statement) -> str:
+    with SessionLocal() as session:
+        return _plan(lambda: session.execute(statement).all())
+
+
+def _appointment_service(session) -> AppointmentService:
+    return AppointmentService(session, EventBus(), get_settings())
+
+
+def _profile_ids():
+    return select(DoctorProfile.id).scalar_subquery()
+
+
+def test_patient_appointment_list_uses_its_index(seeded):
+    with SessionLocal() as session:
+        plan = _plan(lambda: _appointment_service(session).list_for_patient(seeded["patient_id"], limit=10))
+    assert "ix_appointments_patient_scheduled" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_doctor_appointment_list_uses_its_index(seeded):
+    with SessionLocal() as session:
+        plan = _plan(lambda: _appointment_service(session).list_for_doctor(seeded["doctor_user_id"], limit=10))
+    assert "ix_appointments_doctor_scheduled" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_task_list_uses_its_index(seeded):
+    with SessionLocal() as session:
+        plan = _plan(
+            lambda: BackgroundTaskService(session).list_for_appointment(seeded["appointment_id"], limit=10)
+        )
+    assert "ix_background_task_records_appointment_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_lab_results_by_patient_use_their_index(seeded):
+    with SessionLocal() as session:
+        plan = _plan(lambda: LabResultService(session, None).list_for_patient(seeded["patient_id"], limit=10))
+    assert "ix_lab_results_patient_recorded" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_schedule_overlap_check_uses_the_doctor_window_index(seeded):
+    start = seeded["now"] + timedelta(days=2)
+    plan = _statement_plan(
+        _schedule_conflict_statement(
+            doctor_profile_id=seeded["profile_id"], start_time=start, end_time=start + timedelta(hours=2)
+        )
+    )
+    assert "ix_doctor_schedules_doctor_window (doctor_id=?" in plan
+
+
+def test_patient_conflict_check_uses_the_patient_index(seeded):
+    plan = _statement_plan(_patient_conflict_statement(seeded["patient_id"], seeded["now"]))
+    assert "ix_appointments_patient_scheduled (patient_id=? AND scheduled_time=?)" in plan
+
+
+def test_availability_schedules_use_the_doctor_window_index(seeded):
+    now = seeded["now"]
+    plan = _statement_plan(
+        _availability_schedules_statement(_profile_ids(), earliest=now, latest=now + timedelta(days=7))
+    )
+    assert "ix_doctor_schedules_doctor_window (doctor_id=?" in plan
+    assert "SCAN doctor_schedules" not in plan
+
+
+def test_availability_rules_of_one_doctor_use_the_doctor_index(seeded):
+    now = seeded["now"]
+    plan = _statement_plan(_rules_statement([seeded["profile_id"]], earliest=now, latest=now + timedelta(days=7)))
+    assert "ix_doctor_availability_rules_doctor_id (doctor_id=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_availability_rules_of_a_listing_are_read_in_id_order(seeded):
+    # A listing's doctor filter matches a large share of the doctors, so SQLite
+    # reads the rules in id order, the statement's ORDER BY, instead of looking
+    # each doctor up and sorting the result.
+    now = seeded["now"]
+    profile_ids = _available_profiles_statement("cardio").with_only_columns(DoctorProfile.id).scalar_subquery()
+    plan = _statement_plan(_rules_statement(profile_ids, earliest=now, latest=now + timedelta(days=7)))
+    assert "TEMP B-TREE" not in plan
+
+
+def test_blocking_windows_use_the_doctor_window_index(seeded):
+    now = seeded["now"]
+    plan = _statement_plan(
+        _blocking_windows_statement({seeded["profile_id"]}, earliest=now, latest=now + timedelta(days=7))
+    )
+    assert "ix_doctor_schedules_doctor_window (doctor_id=?" in plan
+
+
+def test_bookable_schedule_scan_follows_the_start_time_index(seeded):
+    with SessionLocal() as session:
+        plan = _plan(
+            lambda: PatientService(session).find_earliest_available(limit=5),
+            lambda sql: sql.startswith("SELECT") and "booked_count <" in sql,
+        )
+    # The keyset page walks schedules in start_time order and stops at LIMIT,
+    # instead of sorting every matching schedule first.
+    assert "ix_doctor_schedules_active_start (start_time>?" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_task_record_claim_is_a_primary_key_lookup(seeded):
+    appointment_id = seeded["appointment_id"]
+    with SessionLocal() as session:
+        record = session.scalars(
+            select(BackgroundTaskRecord).where(BackgroundTaskRecord.appointment_id == appointment_id)
+        ).one()
+    plan = _plan(
+        lambda: _confirm_appointment(record.id, record.idempotency_key),
+        lambda sql: sql.startswith("UPDATE background_task_records"),
+    )
+    assert "USING INTEGER PRIMARY KEY (rowid=?)" in plan
+
+
+def test_legacy_task_record_lookup_uses_the_appointment_index(seeded):
+    plan = _plan(lambda: _latest_task_record_id(seeded["appointment_id"]))
+    # No dedicated index: the appointment's few records are found through this
+    # one and sorted by created_at.
+    assert "ix_background_task_records_appointment_created (appointment_id=?)" in plan
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from app.core.config import Settings
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxMessage, OutboxMessageKind
+from app.services.event_bus import EventBus
+from app.services.outbox_relay import CircuitBreaker, OutboxRelay
+
+TASK = "schedule_appointment"
+EVENT = "appointment.created"
+
+
+class _Broker:
+    """A task dispatcher that fails while ``down`` is set."""
+
+    def __init__(self, *, down: bool = True) -> None:
+        self.down = down
+        self.calls: List[Dict[str, Any]] = []
+
+    def __call__(self, payload: Dict[str, Any]) -> None:
+        self.calls.append(payload)
+        if self.down:
+            raise ConnectionError("broker unavailable")
+
+
+def _relay(broker: _Broker, event_bus: EventBus | None = None, **options) -> OutboxRelay:
+    settings = Settings()
+    options.setdefault("retry_base_delay", 0)
+    breaker = CircuitBreaker(
+        failure_threshold=settings.outbox_relay_breaker_threshold,
+        reset_timeout=options.pop("cooldown", settings.outbox_relay_breaker_cooldown_seconds),
+    )
+    return OutboxRelay(
+        SessionLocal,
+        event_bus or EventBus(),
+        task_dispatchers={TASK: broker},
+        breaker=breaker,
+        **options,
+    )
+
+
+def _stage(session, kind: OutboxMessageKind, count: int) -> None:
+    name = TASK if kind == OutboxMessageKind.TASK else EVENT
+    session.add_all(OutboxMessage(kind=kind, name=name, payload={"number": number}) for number in range(count))
+    session.commit()
+
+
+def _messages(kind: OutboxMessageKind) -> List[OutboxMessage]:
+    with SessionLocal() as session:
+        return list(session.query(OutboxMessage).filter(OutboxMessage.kind == kind).order_by(OutboxMessage.id))
+
+
+def test_breaker_opens_after_the_configured_number_of_failures(session):
+    threshold = Settings().outbox_relay_breaker_threshold
+    broker = _Broker()
+    relay = _relay(broker)
+    _stage(session, OutboxMessageKind.TASK, threshold + 2)
+
+    assert relay.relay_pending() == 0
+
+    assert len(broker.calls) == threshold
+    assert relay.breaker.state == "open"
+    stats = relay.stats()
+    assert (stats["failed"], stats["deferred_by_breaker"], stats["pending"]) == (threshold, 2, threshold + 2)
+
+
+def test_open_breaker_keeps_tasks_pending_and_still_relays_events(session):
+    broker = _Broker()
+    event_bus = EventBus()
+    received: List[int] = []
+    event_bus.subscribe(EVENT, lambda event: received.append(event.payload["number"]))
+    relay = _relay(broker, event_bus)
+    _stage(session, OutboxMessageKind.TASK, Settings().outbox_relay_breaker_threshold)
+    relay.relay_pending()
+    attempts = [message.attempts for message in _messages(OutboxMessageKind.TASK)]
+    calls = len(broker.calls)
+
+    _stage(session, OutboxMessageKind.EVENT, 3)
+    assert relay.relay_pending() == 3
+
+    assert received == [0, 1, 2]
+    assert len(broker.calls) == calls
+    tasks = _messages(OutboxMessageKind.TASK)
+    assert [message.attempts for message in tasks] == attempts
+    assert all(message.dispatched_at is None for message in tasks)
+
+
+def test_half_open_breaker_lets_one_trial_through(session):
+    broker = _Broker()
+    relay = _relay(broker, cooldown=0.05)
+    threshold = Settings().outbox_relay_breaker_threshold
+    _stage(session, OutboxMessageKind.TASK, threshold)
+    relay.relay_pending()
+    time.sleep(0.06)
+    assert relay.breaker.state == "half_open"
+
+    # A failed trial opens the circuit again after a single call.
+    calls = len(broker.calls)
+    relay.relay_pending()
+    assert len(broker.calls) == calls + 1
+    assert relay.breaker.state == "open"
+
+    time.sleep(0.06)
+    broker.down = False
+    assert relay.relay_pending() == threshold
+    assert relay.breaker.state == "closed"
+    assert relay.pending_count() == 0
+
+
+def test_retry_backoff_doubles_up_to_the_configured_maximum(session):
+    settings = Settings(outbox_relay_retry_base_seconds=1, outbox_relay_retry_max_seconds=8)
+    relay = _relay(
+        _Broker(),
+        retry_base_delay=settings.outbox_relay_retry_base_seconds,
+        retry_max_delay=settings.outbox_relay_retry_max_seconds,
+    )
+    relay.breaker.failure_threshold = 100
+    _stage(session, OutboxMessageKind.TASK, 1)
+
+    delays = []
+    for _ in range(6):
+        started = datetime.utcnow()
+        relay.relay_pending()
+        [message] = _messages(OutboxMessageKind.TASK)
+        delays.append(round((message.available_at - started).total_seconds()))
+        with SessionLocal() as other:
+            other.get(OutboxMessage, message.id).available_at = started - timedelta(seconds=1)
+            other.commit()
+
+    assert delays == [1, 2, 4, 8, 8, 8]
+    assert message.attempts == 6 and message.last_error == "broker unavailable"
+
+
+def test_application_relay_uses_the_breaker_settings():
+    from app.main import outbox_relay
+
+    settings = Settings()
+    assert outbox_relay.breaker.failure_threshold == settings.outbox_relay_breaker_threshold
+    assert outbox_relay.breaker.reset_timeout == settings.outbox_relay_breaker_cooldown_seconds
+    assert outbox_relay.retry_max_delay == settings.outbox_relay_retry_max_seconds
+
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.dependencies import NEXT_CURSOR_HEADER
+from app.models import Appointment
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from tests.helpers import auth_headers, make_user
+
+URL = "/api/v1/patients/me/appointments"
+SLOT = datetime(2031, 3, 1, 9, 0)
+
+
+@pytest.fixture
+def patient(session):
+    """A patient with 12 appointments sharing three ``scheduled_time`` values."""
+
+    patient = make_user(session, "patient@example.com")
+    session.add_all(
+        Appointment(patient_id=patient.id, scheduled_time=SLOT + timedelta(hours=index % 3), reason="Check-up")
+        for index in range(12)
+    )
+    session.commit()
+    return patient
+
+
+def _walk(client, patient, limit: int) -> list[list[dict]]:
+    pages, params = [], {"limit": limit}
+    while True:
+        response = client.get(URL, params=params, headers=auth_headers(patient))
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 12])
+def test_walking_every_page_returns_each_row_once_in_order(client, patient, limit):
+    pages = _walk(client, patient, limit)
+    rows = [row for page in pages for row in page]
+    everything = client.get(URL, params={"limit": 200}, headers=auth_headers(patient)).json()
+
+    assert [row["id"] for row in rows] == [row["id"] for row in everything]
+    assert len({row["id"] for row in rows}) == 12
+    keys = [(row["scheduled_time"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+    assert all(len(page) == limit for page in pages[:-1]) and 0 < len(pages[-1]) <= limit
+
+
+def test_last_page_has_no_next_cursor(client, patient):
+    first = client.get(URL, params={"limit": 11}, headers=auth_headers(patient))
+    last = client.get(
+        URL, params={"limit": 11, "cursor": first.headers[NEXT_CURSOR_HEADER]}, headers=auth_headers(patient)
+    )
+    exact = client.get(URL, params={"limit": 12}, headers=auth_headers(patient))
+
+    assert len(last.json()) == 1 and NEXT_CURSOR_HEADER not in last.headers
+    assert len(exact.json()) == 12 and NEXT_CURSOR_HEADER not in exact.headers
+
+
+def _b64(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor(SLOT, 7)[:-3],
+        _b64("{}"),
+        _b64("null"),
+        _b64(json.dumps(["yesterday", 7])),
+        _b64(json.dumps([SLOT.isoformat(), "seven"])),
+        _b64(json.dumps([SLOT.isoformat(), 7, 8])),
+    ],
+)
+def test_tampered_cursor_is_rejected(client, patient, cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+    response = client.get(URL, params={"cursor": cursor}, headers=auth_headers(patient))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core import security
+from app.core.security import PasswordHasher, PasswordHashingBusyError
+from app.models import UserRole
+from tests.helpers import auth_headers, make_user
+
+
+@pytest.fixture(scope="module")
+def pooled_hasher():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_async_hashing_does_not_block_the_event_loop(pooled_hasher):
+    async def scenario() -> tuple[bool, bool, int]:
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticking = asyncio.create_task(ticker())
+        hashed = await pooled_hasher.hash_async("s3cret-password")
+        matches = await pooled_hasher.verify_async("s3cret-password", hashed)
+        mismatches = await pooled_hasher.verify_async("wrong-password", hashed)
+        stop.set()
+        await ticking
+        return matches, mismatches, ticks
+
+    matches, mismatches, ticks = asyncio.run(scenario())
+
+    assert matches and not mismatches
+    # The loop kept running other coroutines while bcrypt ran in the pool.
+    assert ticks > 10
+
+
+def test_async_hashing_rejects_requests_beyond_max_pending(pooled_hasher):
+    async def scenario() -> list:
+        return await asyncio.gather(
+            pooled_hasher.hash_async("first-password"),
+            pooled_hasher.hash_async("second-password"),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert isinstance(first, str)
+    assert isinstance(second, PasswordHashingBusyError)
+
+
+def test_login_and_password_change_run_on_async_handlers(client, session):
+    admin = make_user(session, "admin@example.com", UserRole.SUPERADMIN)
+    response = client.post(
+        "/api/v1/users/",
+        json={"email": "new@example.com", "full_name": "New", "role": "patient", "password": "first-password"},
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 201, response.text
+    user_id = response.json()["id"]
+
+    login = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "first-password"})
+    assert login.status_code == 200, login.text
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = client.patch(f"/api/v1/users/{user_id}", json={"password": "second-password"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    stale = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "first-password"})
+    fresh = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "second-password"})
+    assert stale.status_code == 401
+    assert fresh.status_code == 200
+
+
+def test_login_answers_503_when_hashing_is_saturated(client, session, monkeypatch):
+    user = make_user(session, "busy@example.com")
+    user.hashed_password = security.hash_password("password123")
+    session.commit()
+
+    async def busy(*args):
+        raise PasswordHashingBusyError("Too many password hashing requests in flight")
+
+    monkeypatch.setattr(security.password_hasher, "verify_async", busy)
+    response = client.post("/api/v1/auth/login", json={"email": "busy@example.com", "password": "password123"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import principal_cache as principal_cache_module
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+from app.db.session import SessionLocal
+from app.models import User, UserRole
+from tests.helpers import auth_headers, count_queries, make_user
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(principal_cache_module, "time", clock)
+    return clock
+
+
+def _principal(user_id: int, role: UserRole = UserRole.PATIENT) -> Principal:
+    return Principal(id=user_id, role=role, is_active=True)
+
+
+def test_entries_are_served_until_they_expire(clock):
+    cache = PrincipalCache(ttl_seconds=30)
+
+    assert cache.get(1) is None
+    cache.set(_principal(1))
+    clock.now += 29
+    assert cache.get(1) == _principal(1)
+    clock.now += 1
+    assert cache.get(1) is None
+
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0, "invalidations": 0, "size": 0}
+
+
+def test_invalidation_and_size_bound(clock):
+    cache = PrincipalCache(ttl_seconds=30, max_size=2)
+    for user_id in (1, 2):
+        cache.set(_principal(user_id))
+    cache.get(1)
+    cache.set(_principal(3))
+
+    assert cache.get(2) is None
+    cache.invalidate(1)
+    cache.invalidate(1)
+    assert cache.get(1) is None and cache.get(3) == _principal(3)
+    assert cache.stats()["evictions"] == 1 and cache.stats()["invalidations"] == 1
+
+    disabled = PrincipalCache(max_size=0)
+    disabled.set(_principal(1))
+    assert disabled.get(1) is None
+
+
+def _user_lookups(recorder) -> int:
+    return sum("FROM users" in statement for statement in recorder.matching("SELECT"))
+
+
+def test_cached_principal_skips_the_user_lookup(client, session):
+    user = make_user(session, "patient@example.com")
+    headers = auth_headers(user)
+
+    with count_queries() as first:
+        assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 200
+    with count_queries() as second:
+        assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 200
+
+    assert _user_lookups(first) == 1 and _user_lookups(second) == 0
+
+
+def test_role_and_activity_changes_apply_at_once_in_this_process(client, session):
+    admin = make_user(session, "admin@example.com", UserRole.SUPERADMIN)
+    user = make_user(session, "patient@example.com")
+    admin_headers, headers = auth_headers(admin), auth_headers(user)
+    assert client.get("/api/v1/internal/outbox", headers=admin_headers).status_code == 200
+    assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 200
+
+    # Creating a patient profile turns the superadmin into a patient.
+    assert client.put("/api/v1/patients/me/profile", json={}, headers=admin_headers).status_code == 200
+    assert client.get("/api/v1/internal/outbox", headers=admin_headers).status_code == 403
+
+    other_admin = make_user(session, "second-admin@example.com", UserRole.SUPERADMIN)
+    client.patch(f"/api/v1/users/{user.id}", json={"is_active": False}, headers=auth_headers(other_admin))
+    assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 401
+
+
+def test_changes_made_elsewhere_apply_once_the_entry_expires(client, session, clock):
+    user = make_user(session, "patient@example.com")
+    headers = auth_headers(user)
+    assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 200
+
+    # Another API process deactivates the user; this process never hears about it.
+    with SessionLocal() as other:
+        other.get(User, user.id).is_active = False
+        other.commit()
+
+    assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 200
+    clock.now += principal_cache.ttl_seconds
+    assert client.get("/api/v1/patients/me/appointments", headers=headers).status_code == 401
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+from app.db.routing import ReplicaSet, RoutingSession, replica_reads
+from app.models import User, UserRole
+
+
+def _user(email: str) -> User:
+    return User(email=email, full_name=email, role=UserRole.PATIENT, hashed_password="not-a-hash")
+
+
+def _emails(engine: Engine) -> set[str]:
+    with engine.connect() as connection:
+        return set(connection.scalars(select(User.email)))
+
+
+@pytest.fixture
+def databases(tmp_path: Path) -> Iterator[Tuple[Engine, Engine]]:
+    """A primary and a replica in separate SQLite files, seeded with different rows."""
+
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, email in ((primary, "primary@example.com"), (replica, "replica@example.com")):
+        Base.metadata.create_all(bind=engine)
+        with RoutingSession(bind=engine) as session:
+            session.add(_user(email))
+            session.commit()
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _session(primary: Engine, replica: Engine) -> RoutingSession:
+    return RoutingSession(bind=primary, replicas=ReplicaSet([replica]), expire_on_commit=False)
+
+
+def test_reads_inside_replica_reads_go_to_the_replica(databases):
+    primary, replica = databases
+
+    with _session(primary, replica) as session:
+        with replica_reads(session):
+            inside = set(session.scalars(select(User.email)))
+        outside = set(session.scalars(select(User.email)))
+
+    assert inside == {"replica@example.com"}
+    assert outside == {"primary@example.com"}
+
+
+def test_writes_and_reads_after_them_go_to_the_primary(databases):
+    primary, replica = databases
+
+    with _session(primary, replica) as session:
+        with replica_reads(session):
+            assert set(session.scalars(select(User.email))) == {"replica@example.com"}
+            session.add(_user("new@example.com"))
+            session.commit()
+            after_write = set(session.scalars(select(User.email)))
+
+    assert _emails(primary) == {"primary@example.com", "new@example.com"}
+    assert _emails(replica) == {"replica@example.com"}
+    assert after_write == {"primary@example.com", "new@example.com"}
+
+
+def test_core_updates_pin_later_reads_to_the_primary(databases):
+    primary, replica = databases
+
+    with _session(primary, replica) as session:
+        session.execute(User.__table__.update().values(full_name="Renamed"))
+        session.commit()
+        with replica_reads(session):
+            names = set(session.scalars(select(User.full_name)))
+
+    assert names == {"Renamed"}
+
+
+def test_reads_fall_back_to_the_primary_without_a_healthy_replica(databases, tmp_path):
+    primary, _ = databases
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    with _session(primary, unreachable) as session, replica_reads(session):
+        emails = set(session.scalars(select(User.email)))
+
+    assert emails == {"primary@example.com"}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.db.session import session_metrics
+from tests.helpers import auth_headers, count_queries, make_doctor
+
+
+def _requests_without_checkout() -> float:
+    return session_metrics.snapshot()["requests_without_checkout"]
+
+
+def test_requests_rejected_before_any_query_never_check_out_a_connection(client, session):
+    doctor = make_doctor(session, "doctor@example.com").user
+    headers = auth_headers(doctor)
+    # Cache the doctor's principal so the role check needs no user lookup.
+    assert client.get(f"/api/v1/users/{doctor.id}", headers=headers).status_code == 200
+    before = _requests_without_checkout()
+
+    with count_queries() as recorder:
+        forbidden = client.get("/api/v1/patients/me/appointments", headers=headers)
+        unauthenticated = client.get("/api/v1/patients/me/appointments", headers={"Authorization": "Bearer nope"})
+
+    assert (forbidden.status_code, unauthenticated.status_code) == (403, 401)
+    assert recorder.count == 0
+    assert _requests_without_checkout() == before + 2
+
+
+def test_request_sessions_record_their_checkout(client, session):
+    doctor = make_doctor(session, "doctor@example.com").user
+    requests = session_metrics.snapshot()["requests"]
+    before = _requests_without_checkout()
+
+    assert client.get(f"/api/v1/users/{doctor.id}", headers=auth_headers(doctor)).status_code == 200
+
+    assert session_metrics.snapshot()["requests"] == requests + 1
+    assert _requests_without_checkout() == before
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models import DoctorSchedule
+from app.services.doctor_service import BATCH_OVERLAP_MESSAGE, SCHEDULE_OVERLAP_MESSAGE
+from tests.helpers import auth_headers, count_queries, make_doctor
+
+URL = "/api/v1/doctors/me/schedules/bulk"
+BASE = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(days=3)
+
+
+def _item(start_hour: float, hours: float = 1) -> dict:
+    start = BASE + timedelta(hours=start_hour)
+    return {
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=hours)).isoformat(),
+        "max_patients": 2,
+    }
+
+
+def _stored(profile_id: int) -> int:
+    with SessionLocal() as session:
+        return session.scalar(select(func.count()).where(DoctorSchedule.doctor_id == profile_id))
+
+
+def test_results_follow_request_order(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    items = [_item(5), _item(1), _item(3)]
+
+    response = client.post(URL, json={"items": items}, headers=auth_headers(profile.user))
+
+    body = response.json()
+    assert response.status_code == 200, body
+    assert (body["created"], body["rejected"]) == (3, 0)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert [result["status"] for result in body["results"]] == ["created"] * 3
+    assert [result["schedule"]["start_time"] for result in body["results"]] == [item["start_time"] for item in items]
+    assert _stored(profile.id) == 3
+
+
+def test_items_overlapping_each_other_are_rejected(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    # Sorted by start: 1-3 is accepted, 2-3 overlaps it, 3-4 touches its end and is accepted.
+    items = [_item(2), _item(3), _item(1, hours=2)]
+
+    body = client.post(URL, json={"items": items}, headers=auth_headers(profile.user)).json()
+
+    assert [result["status"] for result in body["results"]] == ["rejected", "created", "created"]
+    assert body["results"][0]["error"] == BATCH_OVERLAP_MESSAGE
+    assert body["results"][0]["schedule"] is None
+    assert (body["created"], body["rejected"]) == (2, 1)
+    assert _stored(profile.id) == 2
+
+
+def test_items_overlapping_stored_schedules_are_rejected(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    start = BASE + timedelta(hours=4)
+    session.add(DoctorSchedule(doctor_id=profile.id, start_time=start, end_time=start + timedelta(hours=2)))
+    session.commit()
+    items = [_item(3), _item(5), _item(6), _item(4.5, hours=0.5)]
+
+    body = client.post(URL, json={"items": items}, headers=auth_headers(profile.user)).json()
+
+    assert [result["status"] for result in body["results"]] == ["created", "rejected", "created", "rejected"]
+    assert {body["results"][1]["error"], body["results"][3]["error"]} == {SCHEDULE_OVERLAP_MESSAGE}
+    assert _stored(profile.id) == 3
+
+
+def test_bulk_create_runs_one_range_query_and_one_insert(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    start = BASE + timedelta(hours=10)
+    session.add(DoctorSchedule(doctor_id=profile.id, start_time=start, end_time=start + timedelta(hours=1)))
+    session.commit()
+    headers = auth_headers(profile.user)
+    client.get(f"/api/v1/users/{profile.user_id}", headers=headers)
+    items = [_item(hour) for hour in range(0, 200, 2)]
+
+    with count_queries() as recorder:
+        body = client.post(URL, json={"items": items}, headers=headers).json()
+
+    assert body["created"] == 99 and body["rejected"] == 1
+    # Doctor profile, the range query over the whole batch and one multi-row INSERT.
+    assert recorder.count == 3
+    range_queries = [statement for statement in recorder.matching("SELECT") if "FROM doctor_schedules" in statement]
+    assert len(range_queries) == 1
+    inserts = recorder.matching("INSERT")
+    assert len(inserts) == 1 and "INTO doctor_schedules" in inserts[0]
+
+
+def test_bulk_create_accepts_at_most_1000_items(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    headers = auth_headers(profile.user)
+    items = [_item(hour) for hour in range(1001)]
+
+    too_many = client.post(URL, json={"items": items}, headers=headers)
+    at_limit = client.post(URL, json={"items": items[:1000]}, headers=headers)
+
+    assert too_many.status_code == 422
+    assert at_limit.status_code == 200
+    assert at_limit.json()["created"] == 1000
+    assert _stored(profile.id) == 1000
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models import DoctorSchedule
+from app.models.doctor import SCHEDULE_OVERLAP_CONSTRAINT
+from app.schemas.doctor import DoctorScheduleCreate
+from app.services import doctor_service as doctor_service_module
+from app.services.doctor_service import AsyncDoctorService, DoctorService, SCHEDULE_OVERLAP_MESSAGE
+from tests.helpers import auth_headers, make_doctor
+
+URL = "/api/v1/doctors/me/schedules"
+BASE = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(days=3)
+
+
+def _window(start_hour: int, hours: int = 2) -> dict:
+    start = BASE + timedelta(hours=start_hour)
+    return {"start_time": start.isoformat(), "end_time": (start + timedelta(hours=hours)).isoformat()}
+
+
+def _violation(constraint: str) -> IntegrityError:
+    """An IntegrityError shaped like the one psycopg raises for a constraint violation."""
+
+    return IntegrityError(
+        "INSERT INTO doctor_schedules ...",
+        {},
+        Exception(f'conflicting key value violates exclusion constraint "{constraint}"'),
+    )
+
+
+@pytest.fixture
+def postgres_commit(monkeypatch, session):
+    """Skip the service pre-check as on Postgres and make the commit raise ``error``."""
+
+    monkeypatch.setattr(doctor_service_module, "_enforces_overlap_constraint", lambda bind: True)
+
+    def fail_with(error: IntegrityError) -> None:
+        def commit() -> None:
+            raise error
+
+        monkeypatch.setattr(session, "commit", commit)
+
+    return fail_with
+
+
+def test_exclusion_constraint_violation_maps_to_the_overlap_message(session, postgres_commit):
+    profile = make_doctor(session, "doctor@example.com")
+    postgres_commit(_violation(SCHEDULE_OVERLAP_CONSTRAINT))
+    schedule_in = DoctorScheduleCreate(**_window(1))
+
+    with pytest.raises(ValueError, match=SCHEDULE_OVERLAP_MESSAGE):
+        DoctorService(session).create_schedule(doctor_profile=profile, schedule_in=schedule_in)
+
+
+def test_other_integrity_errors_are_not_reported_as_overlaps(session, postgres_commit):
+    profile = make_doctor(session, "doctor@example.com")
+    postgres_commit(_violation("ck_doctor_schedule_max_patients_positive"))
+    schedule_in = DoctorScheduleCreate(**_window(1))
+
+    with pytest.raises(IntegrityError):
+        DoctorService(session).create_schedule(doctor_profile=profile, schedule_in=schedule_in)
+
+
+def test_async_commit_maps_the_overlap_violation_too():
+    class _Session:
+        rolled_back = False
+
+        async def commit(self) -> None:
+            raise _violation(SCHEDULE_OVERLAP_CONSTRAINT)
+
+        async def rollback(self) -> None:
+            self.rolled_back = True
+
+    session = _Session()
+    with pytest.raises(ValueError, match=SCHEDULE_OVERLAP_MESSAGE):
+        asyncio.run(AsyncDoctorService(session)._commit_schedule())  # type: ignore[arg-type]
+    assert session.rolled_back
+
+
+def test_creating_an_overlapping_schedule_is_rejected(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    headers = auth_headers(profile.user)
+    assert client.post(URL, json=_window(2), headers=headers).status_code == 201
+
+    overlapping = client.post(URL, json=_window(3), headers=headers)
+    adjacent = client.post(URL, json=_window(4), headers=headers)
+
+    assert overlapping.status_code == 400
+    assert overlapping.json()["detail"] == SCHEDULE_OVERLAP_MESSAGE
+    assert adjacent.status_code == 201
+    assert session.query(DoctorSchedule).count() == 2
+
+
+def test_moving_a_schedule_onto_another_is_rejected(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    headers = auth_headers(profile.user)
+    first = client.post(URL, json=_window(2), headers=headers).json()
+    second = client.post(URL, json=_window(6), headers=headers).json()
+
+    overlapping = client.patch(f"{URL}/{second['id']}", json=_window(3), headers=headers)
+    # A schedule never conflicts with its own previous window.
+    shifted = client.patch(f"{URL}/{first['id']}", json=_window(3), headers=headers)
+
+    assert overlapping.status_code == 400
+    assert overlapping.json()["detail"] == SCHEDULE_OVERLAP_MESSAGE
+    assert shifted.status_code == 200
+    assert shifted.json()["start_time"] == _window(3)["start_time"]
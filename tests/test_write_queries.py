@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect
+
+from app.core.config import get_settings
+from app.models import AppointmentStatus, User, UserRole
+from app.schemas.appointment import AppointmentPublic
+from app.schemas.doctor import DoctorProfileCreate, DoctorScheduleCreate, DoctorSchedulePublic
+from app.schemas.patient import PatientProfileCreate
+from app.services.appointment_service import AppointmentService
+from app.services.doctor_service import DoctorService
+from app.services.event_bus import EventBus
+from app.services.patient_service import PatientService
+from tests.helpers import auth_headers, count_queries, make_doctor, make_schedule, make_user
+
+
+def _request(client, user: User, method: str, url: str, payload: dict):
+    """Send one authenticated request and return it with the statements it ran.
+
+    The principal is cached first, so the count covers the write path only.
+    """
+
+    headers = auth_headers(user)
+    client.get(f"/api/v1/users/{user.id}", headers=headers)
+    with count_queries() as recorder:
+        response = client.request(method, url, json=payload, headers=headers)
+    assert response.status_code < 300, response.text
+    return response, recorder
+
+
+def _window(days: int = 1) -> tuple[str, str]:
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=days)
+    return start.isoformat(), (start + timedelta(hours=2)).isoformat()
+
+
+def test_create_schedule_queries(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    start, end = _window()
+
+    response, recorder = _request(
+        client,
+        profile.user,
+        "POST",
+        "/api/v1/doctors/me/schedules",
+        {"start_time": start, "end_time": end, "max_patients": 2},
+    )
+
+    assert response.json()["id"] and response.json()["created_at"]
+    # Doctor profile, overlap pre-check and INSERT ... RETURNING; no refresh.
+    assert recorder.count == 3
+
+
+def test_book_appointment_queries(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    schedule = make_schedule(session, profile, max_patients=2)
+    patient = make_user(session, "patient@example.com")
+
+    response, recorder = _request(
+        client,
+        patient,
+        "POST",
+        "/api/v1/appointments/",
+        {
+            "schedule_id": schedule.id,
+            "scheduled_time": schedule.start_time.isoformat(),
+            "reason": "Check-up",
+        },
+    )
+
+    body = response.json()
+    assert body["patient"]["email"] == "patient@example.com"
+    assert body["doctor"]["email"] == "doctor@example.com"
+    assert body["schedule"]["booked_count"] == 1
+    # Schedule joined with its doctor profile, patient conflict check, capacity
+    # claim, three INSERTs (appointment, task record, outbox event) and one reload
+    # of the appointment with the users and schedule the response embeds.
+    assert recorder.count == 7
+    assert len(recorder.matching("SELECT")) == 3
+
+
+def test_cancel_appointment_queries(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    schedule = make_schedule(session, profile)
+    patient = make_user(session, "patient@example.com")
+    appointment = AppointmentService(session, EventBus(), get_settings()).create_appointment(
+        patient_id=patient.id,
+        doctor_id=None,
+        schedule_id=schedule.id,
+        scheduled_time=schedule.start_time,
+        reason="Check-up",
+    )
+
+    response, recorder = _request(
+        client,
+        profile.user,
+        "PATCH",
+        f"/api/v1/appointments/{appointment.id}",
+        {"status": AppointmentStatus.CANCELLED.value},
+    )
+
+    assert response.json()["status"] == AppointmentStatus.CANCELLED.value
+    # Appointment with its relations, seat release, doctor lookup for the cache
+    # event and the status UPDATE.
+    assert recorder.count == 4
+
+
+def test_create_lab_result_queries(client, session):
+    admin = make_user(session, "admin@example.com", UserRole.SUPERADMIN)
+    patient = make_user(session, "patient@example.com")
+
+    response, recorder = _request(
+        client,
+        admin,
+        "POST",
+        "/api/v1/lab-results/",
+        {
+            "patient_id": patient.id,
+            "test_name": "CBC",
+            "result_data": {"hb": 13.5},
+            "recorded_at": datetime.utcnow().isoformat(),
+        },
+    )
+
+    assert response.json()["id"]
+    assert recorder.count == 1
+
+
+def test_committed_objects_serialize_without_lazy_loads(session):
+    profile = make_doctor(session, "doctor@example.com")
+    patient = make_user(session, "patient@example.com")
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    schedule = DoctorService(session).create_schedule(
+        doctor_profile=profile,
+        schedule_in=DoctorScheduleCreate(start_time=start, end_time=start + timedelta(hours=2), max_patients=2),
+    )
+    appointment = AppointmentService(session, EventBus(), get_settings()).create_appointment(
+        patient_id=patient.id,
+        doctor_id=None,
+        schedule_id=schedule.id,
+        scheduled_time=start,
+        reason="Check-up",
+    )
+
+    assert not inspect(schedule).expired_attributes
+    assert not inspect(appointment).expired_attributes
+    with count_queries() as recorder:
+        DoctorSchedulePublic.model_validate(schedule)
+        AppointmentPublic.model_validate(appointment)
+    assert recorder.statements == []
+
+
+
+def test_create_user_queries(client, session):
+    admin = make_user(session, "admin@example.com", UserRole.SUPERADMIN)
+
+    response, recorder = _request(
+        client,
+        admin,
+        "POST",
+        "/api/v1/users/",
+        {"email": "new@example.com", "full_name": "New User", "role": "patient", "password": "password123"},
+    )
+
+    assert response.json()["id"] and response.json()["created_at"]
+    # Email uniqueness check and INSERT ... RETURNING.
+    assert recorder.count == 2
+
+
+def test_update_user_queries(client, session):
+    user = make_user(session, "patient@example.com")
+
+    response, recorder = _request(client, user, "PATCH", f"/api/v1/users/{user.id}", {"full_name": "Renamed"})
+
+    assert response.json()["full_name"] == "Renamed"
+    # User lookup and the UPDATE.
+    assert recorder.count == 2
+
+
+@pytest.mark.parametrize(
+    ("role", "url", "create", "update"),
+    [
+        (UserRole.DOCTOR, "/api/v1/doctors/me/profile", {"specialization": "Cardiology"}, {"bio": "Heart doctor"}),
+        (UserRole.PATIENT, "/api/v1/patients/me/profile", {"blood_type": "A+"}, {"gender": "female"}),
+    ],
+)
+def test_profile_upsert_queries(client, session, role, url, create, update):
+    user = make_user(session, f"{role.value}@example.com", role)
+
+    created, create_recorder = _request(client, user, "PUT", url, create)
+    updated, update_recorder = _request(client, user, "PUT", url, update)
+
+    assert created.json()["user"]["email"] == updated.json()["user"]["email"] == user.email
+    assert created.json()["id"] == updated.json()["id"]
+    # Profile lookup, user lookup and INSERT ... RETURNING; the response reuses the loaded user.
+    assert create_recorder.count == 3
+    # Profile lookup joined with its user, and the UPDATE.
+    assert update_recorder.count == 2
+
+
+@pytest.mark.parametrize("service", [DoctorService, PatientService])
+def test_second_profile_is_rejected(session, service):
+    if service is DoctorService:
+        user = make_user(session, "doctor@example.com", UserRole.DOCTOR)
+        profile_in = DoctorProfileCreate(user_id=user.id, specialization="Cardiology")
+    else:
+        user = make_user(session, "patient@example.com")
+        profile_in = PatientProfileCreate(user_id=user.id)
+    service(session).create_profile(profile_in)
+
+    with pytest.raises(ValueError, match="profile already exists"):
+        service(session).create_profile(profile_in)
+
+
+def test_update_schedule_queries(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    schedule = make_schedule(session, profile, max_patients=2)
+
+    response, recorder = _request(
+        client, profile.user, "PATCH", f"/api/v1/doctors/me/schedules/{schedule.id}", {"max_patients": 4}
+    )
+
+    assert response.json()["max_patients"] == 4
+    # Doctor profile, schedule, overlap pre-check, specialization for the cache
+    # event and the UPDATE.
+    assert recorder.count == 5
+
+
+def test_update_appointment_details_queries(client, session):
+    profile = make_doctor(session, "doctor@example.com")
+    schedule = make_schedule(session, profile)
+    patient = make_user(session, "patient@example.com")
+    appointment = AppointmentService(session, EventBus(), get_settings()).create_appointment(
+        patient_id=patient.id,
+        doctor_id=None,
+        schedule_id=schedule.id,
+        scheduled_time=schedule.start_time,
+        reason="Check-up",
+    )
+
+    response, recorder = _request(
+        client, profile.user, "PATCH", f"/api/v1/appointments/{appointment.id}", {"notes": "Bring results"}
+    )
+
+    assert response.json()["notes"] == "Bring results"
+    assert response.json()["patient"]["email"] == "patient@example.com"
+    # Appointment with its relations and the UPDATE.
+    assert recorder.count == 2